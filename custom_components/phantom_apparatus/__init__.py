@@ -9,14 +9,34 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from homeassistant.const import Platform
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.loader import async_get_loaded_integration
 
-from .const import DOMAIN, LOGGER
+from .artwork import ArtworkProxy, async_remove_artwork_cache
+from .const import CONF_ARTWORK_CACHE_MB, DEFAULT_ARTWORK_CACHE_MB, DOMAIN, LOGGER
 from .coordinator import PhantomApparatusDataUpdateCoordinator
 from .data import PhantomApparatusData
+from .freshness import FreshnessArbiter
+from .lounge import LoungeClient
+from .metadata import MetadataCache, async_remove_metadata
+from .pipeline import PlayMediaPipeline
+from .prefetch import NextUpPrefetcher
+from .prewake import PreWakeScheduler, async_remove_prewake
+from .routing import CommandRouter
+from .scheduler import CommandScheduler
+from .search import REFRESH_INTERVAL, MediaSearchIndex
+from .seek import SeekCoalescer
+from .services import async_setup_services
+from .sessions import ViewingSessionLog, async_remove_sessions
+from .trace import TraceRecorder
+from .websocket_api import async_setup_websocket_api
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import PhantomApparatusConfigEntry
 
@@ -24,6 +44,15 @@ PLATFORMS: list[Platform] = [
     Platform.MEDIA_PLAYER,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the integration's domain services and websocket commands."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -38,21 +67,105 @@ async def async_setup_entry(
         config_entry=entry,
         # No update_interval needed - we use state change events
     )
+    scheduler = CommandScheduler(hass)
+    lounge = LoungeClient(hass, coordinator)
+    artwork = ArtworkProxy(
+        hass,
+        entry.entry_id,
+        _artwork_cache_bytes(coordinator.config),
+    )
+    prefetch = NextUpPrefetcher(hass, coordinator, artwork)
+    search = MediaSearchIndex(hass, coordinator, prefetch)
     entry.runtime_data = PhantomApparatusData(
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
-        config=entry.data,
+        config=coordinator.config,
+        sessions=ViewingSessionLog(hass, coordinator),
+        router=CommandRouter(),
+        artwork=artwork,
+        prefetch=prefetch,
+        search=search,
+        play_media=PlayMediaPipeline(hass, coordinator, search, scheduler),
+        trace=TraceRecorder(hass, coordinator, entry.entry_id),
+        prewake=PreWakeScheduler(hass, coordinator, scheduler),
+        seek=SeekCoalescer(hass, coordinator, scheduler, lounge),
+        scheduler=scheduler,
+        freshness=FreshnessArbiter(hass, coordinator),
+        metadata=MetadataCache(hass, coordinator),
+        lounge=lounge,
     )
-
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    runtime_data = entry.runtime_data
+    for shutdown in (
+        runtime_data.artwork.async_shutdown,
+        runtime_data.prefetch.async_shutdown,
+        runtime_data.trace.async_stop,
+        runtime_data.seek.async_shutdown,
+        runtime_data.scheduler.async_shutdown,
+        runtime_data.freshness.async_shutdown,
+        runtime_data.lounge.async_shutdown,
+        runtime_data.sessions.async_shutdown,
+        runtime_data.metadata.async_shutdown,
+        runtime_data.prewake.async_shutdown,
+    ):
+        entry.async_on_unload(shutdown)
+    # Registered here rather than in the background start, so an entry unloaded
+    # before that finishes still drops them. Being ahead of the player's own
+    # listener, added with the platform, the player renders their results.
+    for handle_update in (
+        runtime_data.seek.async_handle_update,
+        runtime_data.sessions.async_handle_update,
+        runtime_data.freshness.async_handle_update,
+        runtime_data.prefetch.async_handle_update,
+        runtime_data.metadata.async_handle_update,
+        runtime_data.prewake.async_handle_update,
+    ):
+        entry.async_on_unload(coordinator.async_add_listener(handle_update))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    # The entity starts out pending; the first snapshot and the stored data are
+    # loaded in the background so setup does not wait on the upstream entities.
+    entry.async_create_background_task(
+        hass,
+        _async_start_entry(entry),
+        name=f"{DOMAIN} start {entry.entry_id}",
+    )
+
+    def _async_refresh_search(_now: datetime) -> None:
+        entry.async_create_background_task(
+            hass,
+            search.async_refresh(),
+            name=f"{DOMAIN} search refresh {entry.entry_id}",
+        )
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, _async_refresh_search, REFRESH_INTERVAL)
+    )
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
 
+def _artwork_cache_bytes(config: dict) -> int:
+    """Return the configured artwork cache bound in bytes."""
+    return int(
+        config.get(CONF_ARTWORK_CACHE_MB, DEFAULT_ARTWORK_CACHE_MB) * 1024 * 1024
+    )
+
+
+async def _async_start_entry(entry: PhantomApparatusConfigEntry) -> None:
+    """Load stored data, then take the first snapshot and crawl the libraries."""
+    runtime_data = entry.runtime_data
+    await runtime_data.sessions.async_load()
+    await runtime_data.metadata.async_load()
+    await runtime_data.prewake.async_load()
+
+    await runtime_data.coordinator.async_start()
+    runtime_data.prewake.async_start()
+    runtime_data.lounge.async_apply_config()
+    await runtime_data.search.async_refresh()
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: PhantomApparatusConfigEntry,
@@ -61,9 +174,29 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
-async def async_reload_entry(
+async def async_remove_entry(
     hass: HomeAssistant,
     entry: PhantomApparatusConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Delete the entry's stored data and artwork cache."""
+    await async_remove_sessions(hass, entry.entry_id)
+    await async_remove_prewake(hass, entry.entry_id)
+    await async_remove_metadata(hass, entry.entry_id)
+    await async_remove_artwork_cache(hass, entry.entry_id)
+
+
+async def async_update_options(
+    hass: HomeAssistant,  # noqa: ARG001
+    entry: PhantomApparatusConfigEntry,
+) -> None:
+    """Apply updated options to the running entry without reloading it."""
+    entry.runtime_data.config = entry.runtime_data.coordinator.config
+    entry.runtime_data.artwork.max_bytes = _artwork_cache_bytes(
+        entry.runtime_data.config
+    )
+    await entry.runtime_data.coordinator.async_apply_config()
+    entry.runtime_data.prewake.async_apply_config()
+    entry.runtime_data.lounge.async_apply_config()
+    # A changed max age moves the expiry of the current app data
+    entry.runtime_data.freshness.async_handle_update()
+    entry.runtime_data.coordinator.async_update_listeners()
@@ -0,0 +1,222 @@
+"""Artwork resizing proxy with an on-disk cache for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import shutil
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from PIL import Image
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+
+JPEG_QUALITY = 80
+
+_MIME_TYPES = {".jpg": "image/jpeg", ".png": "image/png"}
+
+
+def _resize_image(data: bytes, size: int) -> tuple[bytes, str]:
+    """
+    Downsize and re-encode an image to fit in a size x size box.
+
+    Runs in a worker process. Images with transparency stay PNG, everything else
+    becomes JPEG.
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        image.thumbnail((size, size))
+        output = io.BytesIO()
+        if image.mode in {"RGBA", "LA"} or "transparency" in image.info:
+            image.save(output, "PNG", optimize=True)
+            return output.getvalue(), ".png"
+        image.convert("RGB").save(output, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        return output.getvalue(), ".jpg"
+
+
+def _cache_dir(hass: HomeAssistant, entry_id: str) -> Path:
+    """Return the artwork cache directory of a config entry."""
+    return Path(hass.config.path(DOMAIN, "artwork", entry_id))
+
+
+async def async_remove_artwork_cache(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the artwork cache of a removed config entry."""
+    await hass.async_add_executor_job(
+        partial(shutil.rmtree, _cache_dir(hass, entry_id), ignore_errors=True)
+    )
+
+
+@dataclass
+class ArtworkCacheStats:
+    """Counters for the artwork proxy."""
+
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+    source_bytes: int = 0
+    resize_seconds: float = 0
+
+
+class ArtworkProxy:
+    """
+    Resize artwork in a process pool and keep the results in a bounded disk cache.
+
+    Cache files are keyed by source URL and size. The in-memory index only holds
+    paths and sizes, in least-recently-used order, and is rebuilt from the cache
+    directory on load. Concurrent misses for the same key share one fetch and
+    resize.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, max_bytes: int) -> None:
+        """Initialize the proxy."""
+        self.hass = hass
+        self.max_bytes = max_bytes
+        self.stats = ArtworkCacheStats()
+        self._cache_dir = _cache_dir(hass, entry_id)
+        self._index: OrderedDict[str, tuple[Path, int]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[tuple[bytes | None, str | None]]] = {}
+        self._pool: ProcessPoolExecutor | None = None
+        self._loaded = False
+
+    async def _async_load(self) -> None:
+        """Index the existing cache directory."""
+        self._loaded = True
+        for path, size in await self.hass.async_add_executor_job(self._scan):
+            self._index[path.stem] = (path, size)
+            self.stats.bytes += size
+        self.stats.entries = len(self._index)
+
+    def _scan(self) -> list[tuple[Path, int]]:
+        """Return cached files, oldest first."""
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        files = [(path, path.stat()) for path in self._cache_dir.iterdir()]
+        files.sort(key=lambda item: item[1].st_mtime)
+        return [(path, stat.st_size) for path, stat in files]
+
+    async def async_get(
+        self,
+        url: str,
+        size: int,
+        fetch: Callable[[], Awaitable[tuple[bytes | None, str | None]]],
+    ) -> tuple[bytes | None, str | None]:
+        """Return artwork for url scaled to size, fetching and resizing on a miss."""
+        if not self._loaded:
+            await self._async_load()
+
+        key = hashlib.sha256(f"{url}|{size}".encode()).hexdigest()
+
+        if (cached := self._index.get(key)) is not None:
+            self._index.move_to_end(key)
+            path = cached[0]
+            try:
+                data = await self.hass.async_add_executor_job(path.read_bytes)
+            except OSError:
+                if key in self._index:
+                    self._async_forget(key)
+            else:
+                self.stats.hits += 1
+                return data, _MIME_TYPES.get(path.suffix)
+
+        if (task := self._inflight.get(key)) is None:
+            self.stats.misses += 1
+            task = self.hass.async_create_task(
+                self._async_resize(key, url, size, fetch), eager_start=False
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats.hits += 1
+        # A caller giving up must not cancel the resize others are waiting on
+        return await asyncio.shield(task)
+
+    async def _async_resize(
+        self,
+        key: str,
+        url: str,
+        size: int,
+        fetch: Callable[[], Awaitable[tuple[bytes | None, str | None]]],
+    ) -> tuple[bytes | None, str | None]:
+        """Fetch, resize and cache artwork for a missed key."""
+        source, content_type = await fetch()
+        if not source:
+            return source, content_type
+
+        if self._pool is None:
+            # Forking the multi-threaded HA process is unsafe; spawn a clean worker
+            self._pool = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        started = time.monotonic()
+        try:
+            data, suffix = await self.hass.loop.run_in_executor(
+                self._pool, _resize_image, source, size
+            )
+        except Exception:  # noqa: BLE001
+            # Anything Pillow cannot decode is passed through untouched
+            LOGGER.debug("Unable to resize artwork from %s", url, exc_info=True)
+            self.stats.errors += 1
+            return source, content_type
+        self.stats.resize_seconds += time.monotonic() - started
+        self.stats.source_bytes += len(source)
+
+        path = self._cache_dir / f"{key}{suffix}"
+        await self.hass.async_add_executor_job(self._write, path, data)
+        if key in self._index and (old := self._async_forget(key)) != path:
+            await self.hass.async_add_executor_job(self._unlink, [old])
+        self._index[key] = (path, len(data))
+        self.stats.bytes += len(data)
+        self.stats.entries = len(self._index)
+        await self._async_evict()
+        return data, _MIME_TYPES[suffix]
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Write a cache file."""
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def _async_forget(self, key: str) -> Path:
+        """Drop a key from the index and return its path."""
+        path, size = self._index.pop(key)
+        self.stats.bytes -= size
+        self.stats.entries = len(self._index)
+        return path
+
+    async def _async_evict(self) -> None:
+        """Remove least recently used files until the cache fits."""
+        stale: list[Path] = []
+        while self.stats.bytes > self.max_bytes and len(self._index) > 1:
+            stale.append(self._async_forget(next(iter(self._index))))
+            self.stats.evictions += 1
+        if stale:
+            await self.hass.async_add_executor_job(self._unlink, stale)
+
+    @staticmethod
+    def _unlink(paths: list[Path]) -> None:
+        """Delete cache files."""
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    async def async_shutdown(self) -> None:
+        """Stop the worker process."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await self.hass.async_add_executor_job(pool.shutdown)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache statistics, for diagnostics."""
+        return {"max_bytes": self.max_bytes, **asdict(self.stats)}
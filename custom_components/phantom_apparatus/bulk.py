@@ -0,0 +1,121 @@
+"""Concurrent commands across apparatus entries for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.auth.permissions.const import POLICY_CONTROL
+from homeassistant.components.media_player import DOMAIN as MEDIA_PLAYER_DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.exceptions import HomeAssistantError, Unauthorized, UnknownUser
+from homeassistant.helpers import entity_registry as er
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import Context, HomeAssistant
+
+    from .data import PhantomApparatusConfigEntry
+
+DEFAULT_BULK_TIMEOUT = 15
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+def entry_entity_id(hass: HomeAssistant, entry_id: str) -> str | None:
+    """Return the media player entity of a config entry."""
+    return next(
+        (
+            registry_entry.entity_id
+            for registry_entry in er.async_entries_for_config_entry(
+                er.async_get(hass), entry_id
+            )
+            if registry_entry.domain == MEDIA_PLAYER_DOMAIN
+        ),
+        None,
+    )
+
+
+async def _async_check_control(
+    hass: HomeAssistant, context: Context, entity_ids: list[str]
+) -> None:
+    """Raise Unauthorized unless the caller may control every entity."""
+    if not context.user_id:
+        return
+    user = await hass.auth.async_get_user(context.user_id)
+    if user is None:
+        raise UnknownUser(context=context)
+    for entity_id in entity_ids:
+        if not user.permissions.check_entity(entity_id, POLICY_CONTROL):
+            raise Unauthorized(
+                context=context, entity_id=entity_id, permission=POLICY_CONTROL
+            )
+
+
+async def async_bulk_command(  # noqa: PLR0913
+    hass: HomeAssistant,
+    entries: list[PhantomApparatusConfigEntry],
+    command: str,
+    data: dict[str, Any],
+    *,
+    context: Context,
+    timeout: float,  # noqa: ASYNC109
+    max_concurrency: int,
+) -> dict[str, Any]:
+    """
+    Send one media player command to several entries at once.
+
+    The caller must be allowed to control every entry's player, and each command
+    runs in the caller's context. At most max_concurrency commands are in flight,
+    and each gets its own timeout so one unresponsive TV cannot hold up the rest.
+    Failures are reported per entry rather than raised.
+    """
+    entity_ids = {
+        entry.entry_id: entry_entity_id(hass, entry.entry_id) for entry in entries
+    }
+    await _async_check_control(
+        hass, context, [entity_id for entity_id in entity_ids.values() if entity_id]
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+    started = time.monotonic()
+
+    async def _async_run(entry: PhantomApparatusConfigEntry) -> dict[str, Any]:
+        entity_id = entity_ids[entry.entry_id]
+        result: dict[str, Any] = {"entity_id": entity_id}
+        if entity_id is None:
+            return {**result, "result": "error", "error": "No media player entity"}
+
+        async with semaphore:
+            sent = time.monotonic()
+            try:
+                async with asyncio.timeout(timeout):
+                    await hass.services.async_call(
+                        MEDIA_PLAYER_DOMAIN,
+                        command,
+                        {ATTR_ENTITY_ID: entity_id, **data},
+                        blocking=True,
+                        context=context,
+                    )
+            except TimeoutError:
+                result.update(result="timeout")
+            except (HomeAssistantError, vol.Invalid) as err:
+                result.update(result="error", error=str(err))
+            else:
+                result.update(result="ok")
+            result["latency_ms"] = round(1000 * (time.monotonic() - sent), 1)
+        return result
+
+    results = await asyncio.gather(*(_async_run(entry) for entry in entries))
+    by_entry = {
+        entry.entry_id: result for entry, result in zip(entries, results, strict=True)
+    }
+    failed = sum(result["result"] != "ok" for result in results)
+    LOGGER.debug("Bulk %s on %s entries; %s failed", command, len(entries), failed)
+    return {
+        "results": by_entry,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "elapsed_ms": round(1000 * (time.monotonic() - started), 1),
+    }
@@ -2,13 +2,34 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 from homeassistant.util import slugify
 
-from .const import DOMAIN
+from .const import (
+    CONF_APP_MAX_AGE,
+    CONF_ARTWORK_CACHE_MB,
+    CONF_ARTWORK_PROXY,
+    CONF_ARTWORK_SIZE,
+    CONF_LOUNGE_SCREEN_ID,
+    CONF_LOUNGE_URL,
+    CONF_PREWAKE,
+    CONF_PREWAKE_LEAD_MINUTES,
+    CONF_PREWAKE_TRIGGERS,
+    DEFAULT_APP_MAX_AGE,
+    DEFAULT_ARTWORK_CACHE_MB,
+    DEFAULT_ARTWORK_SIZE,
+    DEFAULT_LOUNGE_URL,
+    DEFAULT_PREWAKE_LEAD_MINUTES,
+    DOMAIN,
+)
+
+ENTITY_KEYS = ["tv_entity", "jellyfin_entity", "ghosttube_entity"]
 
 
 class PhantomApparatusFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -16,6 +37,14 @@ class PhantomApparatusFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> PhantomApparatusOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return PhantomApparatusOptionsFlowHandler()
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
@@ -24,7 +53,7 @@ class PhantomApparatusFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         _errors = {}
         if user_input is not None:
             # Validate entity selections
-            for entity_key in ["tv_entity", "jellyfin_entity", "ghosttube_entity"]:
+            for entity_key in ENTITY_KEYS:
                 if (
                     entity_id := user_input.get(entity_key)
                 ) and not self.hass.states.get(entity_id):
@@ -84,3 +113,132 @@ class PhantomApparatusFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             errors=_errors,
         )
+
+
+class PhantomApparatusOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for The Phantom Apparatus."""
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options; changes are applied without reloading the entry."""
+        _errors = {}
+        if user_input is not None:
+            for entity_key in ENTITY_KEYS:
+                if (
+                    entity_id := user_input.get(entity_key)
+                ) and not self.hass.states.get(entity_id):
+                    _errors[entity_key] = "entity_not_found"
+
+            if not _errors:
+                return self.async_create_entry(data=user_input)
+
+        current: dict[str, Any] = {
+            **self.config_entry.data,
+            **self.config_entry.options,
+            **(user_input or {}),
+        }
+        schema: dict[vol.Marker, Any] = {
+            vol.Required(
+                entity_key,
+                default=current.get(entity_key),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="media_player",
+                ),
+            )
+            for entity_key in ENTITY_KEYS
+        }
+        schema.update(
+            {
+                vol.Required(
+                    CONF_ARTWORK_PROXY,
+                    default=current.get(CONF_ARTWORK_PROXY, False),
+                ): selector.BooleanSelector(),
+                vol.Required(
+                    CONF_ARTWORK_SIZE,
+                    default=current.get(CONF_ARTWORK_SIZE, DEFAULT_ARTWORK_SIZE),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=64,
+                        max=2048,
+                        step=32,
+                        unit_of_measurement="px",
+                        mode=selector.NumberSelectorMode.BOX,
+                    ),
+                ),
+                vol.Required(
+                    CONF_ARTWORK_CACHE_MB,
+                    default=current.get(
+                        CONF_ARTWORK_CACHE_MB, DEFAULT_ARTWORK_CACHE_MB
+                    ),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=1,
+                        max=1024,
+                        unit_of_measurement="MB",
+                        mode=selector.NumberSelectorMode.BOX,
+                    ),
+                ),
+                vol.Required(
+                    CONF_PREWAKE,
+                    default=current.get(CONF_PREWAKE, False),
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_PREWAKE_TRIGGERS,
+                    default=current.get(CONF_PREWAKE_TRIGGERS, []),
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(
+                        domain=[
+                            "binary_sensor",
+                            "device_tracker",
+                            "input_boolean",
+                            "person",
+                        ],
+                        multiple=True,
+                    ),
+                ),
+                vol.Required(
+                    CONF_PREWAKE_LEAD_MINUTES,
+                    default=current.get(
+                        CONF_PREWAKE_LEAD_MINUTES, DEFAULT_PREWAKE_LEAD_MINUTES
+                    ),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=1,
+                        max=30,
+                        unit_of_measurement="min",
+                        mode=selector.NumberSelectorMode.BOX,
+                    ),
+                ),
+                vol.Required(
+                    CONF_APP_MAX_AGE,
+                    default=current.get(CONF_APP_MAX_AGE, DEFAULT_APP_MAX_AGE),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=10,
+                        max=3600,
+                        unit_of_measurement="s",
+                        mode=selector.NumberSelectorMode.BOX,
+                    ),
+                ),
+                vol.Optional(
+                    CONF_LOUNGE_SCREEN_ID,
+                    default=current.get(CONF_LOUNGE_SCREEN_ID, ""),
+                ): selector.TextSelector(),
+                vol.Required(
+                    CONF_LOUNGE_URL,
+                    default=current.get(CONF_LOUNGE_URL, DEFAULT_LOUNGE_URL),
+                ): selector.TextSelector(
+                    selector.TextSelectorConfig(
+                        type=selector.TextSelectorType.URL,
+                    ),
+                ),
+            }
+        )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(schema),
+            errors=_errors,
+        )
@@ -7,6 +7,34 @@ LOGGER: Logger = getLogger(__package__)
 DOMAIN = "phantom_apparatus"
 ATTRIBUTION = "The Ghost of Don Don"
 
+CONF_ARTWORK_PROXY = "artwork_proxy"
+CONF_ARTWORK_SIZE = "artwork_size"
+CONF_ARTWORK_CACHE_MB = "artwork_cache_mb"
+CONF_PREWAKE = "prewake"
+CONF_PREWAKE_TRIGGERS = "prewake_triggers"
+CONF_PREWAKE_LEAD_MINUTES = "prewake_lead_minutes"
+CONF_APP_MAX_AGE = "app_max_age"
+CONF_LOUNGE_URL = "lounge_url"
+CONF_LOUNGE_SCREEN_ID = "lounge_screen_id"
+
+DEFAULT_ARTWORK_SIZE = 512
+DEFAULT_ARTWORK_CACHE_MB = 64
+DEFAULT_PREWAKE_LEAD_MINUTES = 5
+DEFAULT_APP_MAX_AGE = 120
+# YouTube's cloud relay, not a channel on the LAN: the app and Home Assistant
+# both talk to it, so lounge traffic goes through YouTube
+DEFAULT_LOUNGE_URL = "https://www.youtube.com/api/lounge"
+
+# Wake-on-LAN for the TV, which the TV entity itself cannot do while off
+WAKE_SERVICE_DOMAIN = "shell_command"
+WAKE_SERVICE = "wake_living_room_tv"
+
+# TV sources backed by an app entity, mapped to their coordinator data prefix
+APP_SOURCES = {
+    "Jellyfin": "jellyfin",
+    "GhostTube": "ghosttube",
+}
+
 JELLYFIN_IDLE_IMAGE_DATA_URI = (
     "data:image/svg+xml;base64,PD94bWwgdmVyc2lvbj0iMS4wIiBlbmNvZGluZz0iVVRGLTgiIHN0YW"
     "5kYWxvbmU9Im5vIj8+CjwhLS0gKioqKiogQkVHSU4gTElDRU5TRSBCTE9DSyAqKioqKgogIC0gUGFydC"
@@ -4,12 +4,19 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Awaitable, Callable, Coroutine
 from datetime import timedelta
 from logging import Logger
 from typing import TYPE_CHECKING, Any, TypedDict, Unpack
 
-from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, _DataT
@@ -49,69 +56,159 @@ class PhantomApparatusDataUpdateCoordinator(DataUpdateCoordinator):
             **kwargs,
         )
         self.config_entry = config_entry
-        self._unsub_state_changed = None
-
-    async def async_config_entry_first_refresh(self) -> None:
-        """Perform first refresh and set up state change listeners."""
-        await super().async_config_entry_first_refresh()
-
-        # Set up listeners for state changes
+        self._unsub_state_changed: Callable[[], None] | None = None
+        self._overlays: list[Callable[[dict[str, Any]], None]] = []
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """Return the entry configuration with options applied over data."""
+        return {**self.config_entry.data, **self.config_entry.options}
+
+    @property
+    def tracked_entity_ids(self) -> list[str]:
+        """Return the upstream entities this coordinator follows."""
+        config = self.config
         entities_to_track = [
-            self.config_entry.data.get("tv_entity"),
-            self.config_entry.data.get("jellyfin_entity"),
-            self.config_entry.data.get("ghosttube_entity"),
+            config.get("tv_entity"),
+            config.get("jellyfin_entity"),
+            config.get("ghosttube_entity"),
         ]
         # Filter out None values
-        entities_to_track = [e for e in entities_to_track if e]
+        return [e for e in entities_to_track if e]
+
+    async def async_start(self) -> None:
+        """
+        Take the first snapshot and start listening for state changes.
+
+        Runs as a background task after platform setup, so the entity is added in
+        a pending state and fills in as soon as this completes.
+        """
+        self._async_follow_entities()
 
-        if entities_to_track:
+    async def async_apply_config(self) -> None:
+        """Apply changed entry options in place, without a reload."""
+        self._async_follow_entities()
+
+    @callback
+    def _async_follow_entities(self) -> None:
+        """(Re)subscribe to the tracked entities and publish a fresh snapshot."""
+        if self._unsub_state_changed:
+            self._unsub_state_changed()
+            self._unsub_state_changed = None
+
+        if entities_to_track := self.tracked_entity_ids:
             self._unsub_state_changed = async_track_state_change_event(
                 self.hass,
                 entities_to_track,
                 self._handle_state_change,
             )
 
+        self.async_set_updated_data(self._get_current_data())
+
+    @callback
+    def async_add_overlay(
+        self, overlay: Callable[[dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        """
+        Merge data from another channel into every snapshot.
+
+        overlay updates the snapshot in place, after the entity states are read.
+        Returns a callable that removes it.
+        """
+        self._overlays.append(overlay)
+
+        @callback
+        def _remove() -> None:
+            self._overlays.remove(overlay)
+
+        return _remove
+
+    @callback
+    def async_publish(self) -> None:
+        """Take and publish a fresh snapshot, for channels that push updates."""
+        self.async_set_updated_data(self._get_current_data())
+
+    async def async_wait_for(
+        self,
+        predicate: Callable[[], bool],
+        timeout: float,  # noqa: ASYNC109
+    ) -> None:
+        """
+        Wait until predicate holds for a coordinator snapshot.
+
+        The predicate is checked immediately and then after every update, so callers
+        wait on real state rather than fixed sleeps. Raises TimeoutError.
+        """
+        if predicate():
+            return
+
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+
+        @callback
+        def _check() -> None:
+            if not future.done() and predicate():
+                future.set_result(None)
+
+        unsub = self.async_add_listener(_check)
+        try:
+            async with asyncio.timeout(timeout):
+                await future
+        finally:
+            unsub()
+
     @callback
     def _handle_state_change(self, event: Event[EventStateChangedData]) -> None:  # noqa: ARG002
         """Handle state changes of tracked entities."""
         # Request a refresh when any tracked entity changes
-        self.async_set_updated_data(self._get_current_data())
+        self.async_publish()
+
+    def _get_state(self, entity_id: str) -> State | None:
+        """Return the current state of a tracked entity."""
+        return self.hass.states.get(entity_id)
 
     def _get_current_data(self) -> dict[str, Any]:
         """Get current state data from entities."""
         data = {}
+        config = self.config
 
         # Get TV entity state
-        if (tv_entity_id := self.config_entry.data.get("tv_entity")) and (
-            tv_state := self.hass.states.get(tv_entity_id)
+        if (tv_entity_id := config.get("tv_entity")) and (
+            tv_state := self._get_state(tv_entity_id)
         ):
             data["tv_state"] = tv_state.state
             data["tv_attributes"] = dict(tv_state.attributes)
+            data["tv_last_updated"] = tv_state.last_updated
 
         # Get Jellyfin entity state
-        if (jellyfin_entity_id := self.config_entry.data.get("jellyfin_entity")) and (
-            jellyfin_state := self.hass.states.get(jellyfin_entity_id)
+        if (jellyfin_entity_id := config.get("jellyfin_entity")) and (
+            jellyfin_state := self._get_state(jellyfin_entity_id)
         ):
             data["jellyfin_state"] = jellyfin_state.state
             data["jellyfin_attributes"] = dict(jellyfin_state.attributes)
+            data["jellyfin_last_updated"] = jellyfin_state.last_updated
 
         # Get GhostTube entity state
-        if (ghosttube_entity_id := self.config_entry.data.get("ghosttube_entity")) and (
-            ghosttube_state := self.hass.states.get(ghosttube_entity_id)
+        if (ghosttube_entity_id := config.get("ghosttube_entity")) and (
+            ghosttube_state := self._get_state(ghosttube_entity_id)
         ):
             data["ghosttube_state"] = ghosttube_state.state
             data["ghosttube_attributes"] = dict(ghosttube_state.attributes)
+            data["ghosttube_last_updated"] = ghosttube_state.last_updated
+
+        for overlay in self._overlays:
+            overlay(data)
 
         return data
 
     async def _async_update_data(self) -> Any:
         """Update data from Home Assistant entities."""
-        # Just return current data - this is called on first load
-        # After that, updates come from state change events
+        # Just return current data - regular updates come from state change
+        # events, this only runs on explicit refresh requests
         return self._get_current_data()
 
     async def async_shutdown(self) -> None:
         """Clean up resources."""
         if self._unsub_state_changed:
             self._unsub_state_changed()
+            self._unsub_state_changed = None
         await super().async_shutdown()
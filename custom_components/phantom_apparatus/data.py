@@ -9,7 +9,20 @@ if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
 
+    from .artwork import ArtworkProxy
     from .coordinator import PhantomApparatusDataUpdateCoordinator
+    from .freshness import FreshnessArbiter
+    from .lounge import LoungeClient
+    from .metadata import MetadataCache
+    from .pipeline import PlayMediaPipeline
+    from .prefetch import NextUpPrefetcher
+    from .prewake import PreWakeScheduler
+    from .routing import CommandRouter
+    from .scheduler import CommandScheduler
+    from .search import MediaSearchIndex
+    from .seek import SeekCoalescer
+    from .sessions import ViewingSessionLog
+    from .trace import TraceRecorder
 
 
 type PhantomApparatusConfigEntry = ConfigEntry[PhantomApparatusData]
@@ -22,3 +35,16 @@ class PhantomApparatusData:
     coordinator: PhantomApparatusDataUpdateCoordinator
     integration: Integration
     config: dict
+    sessions: ViewingSessionLog
+    router: CommandRouter
+    artwork: ArtworkProxy
+    prefetch: NextUpPrefetcher
+    search: MediaSearchIndex
+    play_media: PlayMediaPipeline
+    trace: TraceRecorder
+    prewake: PreWakeScheduler
+    seek: SeekCoalescer
+    scheduler: CommandScheduler
+    freshness: FreshnessArbiter
+    metadata: MetadataCache
+    lounge: LoungeClient
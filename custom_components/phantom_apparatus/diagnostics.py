@@ -0,0 +1,40 @@
+"""Diagnostics support for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import CONF_LOUNGE_SCREEN_ID
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import PhantomApparatusConfigEntry
+
+# The screen ID is enough to pair with and control the app
+TO_REDACT = {CONF_LOUNGE_SCREEN_ID}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001
+    entry: PhantomApparatusConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime_data = entry.runtime_data
+    return {
+        "config": async_redact_data(runtime_data.coordinator.config, TO_REDACT),
+        "snapshot": runtime_data.coordinator.data,
+        "routing": runtime_data.router.as_dict(),
+        "artwork": runtime_data.artwork.as_dict(),
+        "prefetch": runtime_data.prefetch.as_dict(),
+        "search": runtime_data.search.as_dict(),
+        "play_media": runtime_data.play_media.as_dict(),
+        "prewake": runtime_data.prewake.as_dict(),
+        "seek": runtime_data.seek.as_dict(),
+        "commands": runtime_data.scheduler.as_dict(),
+        "freshness": runtime_data.freshness.as_dict(),
+        "metadata": runtime_data.metadata.as_dict(),
+        "lounge": runtime_data.lounge.as_dict(),
+    }
@@ -0,0 +1,166 @@
+"""Freshness arbitration between the TV and app entities for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import APP_SOURCES, CONF_APP_MAX_AGE, DEFAULT_APP_MAX_AGE, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .coordinator import PhantomApparatusDataUpdateCoordinator
+
+
+@dataclass
+class FreshnessStats:
+    """Counters for arbitration decisions."""
+
+    source_changes: int = 0
+    expired: int = 0
+    reevaluations: int = 0
+
+
+def _as_datetime(value: Any) -> datetime | None:
+    """Return a timestamp attribute as a datetime."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return dt_util.parse_datetime(value)
+    return None
+
+
+class FreshnessArbiter:
+    """
+    Decide whether the foreground app's entity can be trusted.
+
+    App entities are polled and often lag the TV, which pushes foreground-app
+    changes as they happen. An app's last report is its entity's last_updated, or
+    its position timestamp if that is newer. App data stays trusted if the app
+    reported after the TV last switched to it, and otherwise only within the
+    configured max age. Playing data also expires once the position, extrapolated
+    from its last update, passes the media's duration; many apps report nothing
+    while playing steadily, so age alone never expires it. Stale app data is
+    ignored, and the entity is re-evaluated once at the moment the data expires
+    rather than on the next poll.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the arbiter."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.stats = FreshnessStats()
+        self._source: str | None = None
+        self._switched_at: datetime | None = None
+        self._stale: str | None = None
+        self._unsub_expiry: CALLBACK_TYPE | None = None
+
+    @property
+    def max_age(self) -> timedelta:
+        """Return how long app data is trusted without a newer report."""
+        return timedelta(
+            seconds=int(
+                self.coordinator.config.get(CONF_APP_MAX_AGE, DEFAULT_APP_MAX_AGE)
+            )
+        )
+
+    @callback
+    def is_fresh(self, app: str) -> bool:
+        """Return whether app's coordinator data is fresh enough to trust."""
+        expires_at = self._expires_at(app)
+        return expires_at is None or dt_util.utcnow() < expires_at
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Schedule re-evaluation for when the foreground app's data expires."""
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+
+        self._async_observe_source()
+        data = self.coordinator.data or {}
+        app = APP_SOURCES.get(data.get("tv_attributes", {}).get("source"))
+        if app is None or data.get("tv_state") == "off":
+            return
+        expires_at = self._expires_at(app)
+        if expires_at is None or expires_at > dt_util.utcnow():
+            self._stale = None
+            if expires_at is not None:
+                self._unsub_expiry = async_track_point_in_utc_time(
+                    self.hass, self._async_expire, expires_at
+                )
+        elif self._stale != app:
+            self._stale = app
+            self.stats.expired += 1
+
+    @callback
+    def _async_expire(self, _now: datetime) -> None:
+        """Rewrite the entity now that the foreground app's data went stale."""
+        self._unsub_expiry = None
+        self.stats.reevaluations += 1
+        LOGGER.debug("Foreground app data expired; re-evaluating")
+        self.coordinator.async_update_listeners()
+
+    @callback
+    def _async_observe_source(self) -> None:
+        """Note when the TV last pushed a foreground-app change."""
+        data = self.coordinator.data or {}
+        source = data.get("tv_attributes", {}).get("source")
+        if source == self._source:
+            return
+        if self._source is not None:
+            self.stats.source_changes += 1
+            self._switched_at = data.get("tv_last_updated") or dt_util.utcnow()
+        self._source = source
+        self._stale = None
+
+    def _expires_at(self, app: str) -> datetime | None:
+        """Return when app's data stops being trusted; None if it never does."""
+        self._async_observe_source()
+        data = self.coordinator.data or {}
+        reported_at = data.get(f"{app}_last_updated")
+        if reported_at is None:
+            return None
+        attributes = data.get(f"{app}_attributes", {})
+        position_at = _as_datetime(attributes.get("media_position_updated_at"))
+        if position_at is not None:
+            reported_at = max(reported_at, position_at)
+
+        expiries: list[datetime] = []
+        if self._switched_at is not None and reported_at < self._switched_at:
+            expiries.append(reported_at + self.max_age)
+        position = attributes.get("media_position")
+        duration = attributes.get("media_duration")
+        if (
+            data.get(f"{app}_state") == "playing"
+            and position_at is not None
+            and position is not None
+            and duration
+        ):
+            expiries.append(position_at + timedelta(seconds=duration - position))
+        return min(expiries, default=None)
+
+    async def async_shutdown(self) -> None:
+        """Cancel the pending re-evaluation."""
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return arbitration statistics, for diagnostics."""
+        return {
+            **asdict(self.stats),
+            "source": self._source,
+            "switched_at": self._switched_at,
+            "stale": self._stale,
+        }
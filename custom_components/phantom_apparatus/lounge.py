@@ -0,0 +1,454 @@
+"""YouTube lounge channel to the GhostTube app for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import json
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_LOUNGE_SCREEN_ID,
+    CONF_LOUNGE_URL,
+    DEFAULT_LOUNGE_URL,
+    DOMAIN,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .coordinator import PhantomApparatusDataUpdateCoordinator
+
+APP = "ghosttube"
+
+# Seconds without so much as a keep-alive before the long poll is restarted
+READ_TIMEOUT = 90
+COMMAND_TIMEOUT = 10
+# Reconnect backoff; the last delay repeats
+RECONNECT_DELAYS = (1, 2, 5, 15, 30, 60)
+# Seconds a session must stay up before the backoff starts over
+STABLE_CONNECTION = 60
+
+# Lounge player states; anything else is idle
+LOUNGE_STATES = {
+    "1": "playing",
+    "2": "paused",
+    "3": "playing",
+}
+
+# Media player service -> (lounge command, {service field: lounge argument})
+LOUNGE_COMMANDS: dict[str, tuple[str, dict[str, str]]] = {
+    "media_play": ("play", {}),
+    "media_pause": ("pause", {}),
+    "media_stop": ("stopVideo", {}),
+    "media_next_track": ("next", {}),
+    "media_previous_track": ("previous", {}),
+    "media_seek": ("seekTo", {"seek_position": "newTime"}),
+}
+
+# App attributes that describe one item, dropped when the lounge has moved on
+_ITEM_ATTRIBUTES = (
+    "media_title",
+    "media_series_title",
+    "media_artist",
+    "media_album_name",
+    "media_channel",
+    "entity_picture",
+)
+
+
+class LoungeSessionError(HomeAssistantError):
+    """The lounge session expired or was refused."""
+
+
+@dataclass
+class LoungeStats:
+    """Counters for the lounge channel."""
+
+    connects: int = 0
+    disconnects: int = 0
+    events: int = 0
+    commands: int = 0
+    command_errors: int = 0
+
+
+def _as_float(value: Any) -> float | None:
+    """Return a lounge number, sent as a string, as a float."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _iter_chunks(buffer: str) -> Iterator[tuple[list[Any], int]]:
+    """
+    Yield complete length-prefixed chunks from a bind response.
+
+    Each chunk is a line with the payload length in characters, then a JSON array
+    of [event id, [name, *args]] pairs. Also yields how much of buffer was used.
+    """
+    offset = 0
+    while (newline := buffer.find("\n", offset)) != -1:
+        try:
+            length = int(buffer[offset:newline])
+        except ValueError as err:
+            msg = f"Malformed lounge chunk header: {buffer[offset:newline]!r}"
+            raise LoungeSessionError(msg) from err
+        end = newline + 1 + length
+        if end > len(buffer):
+            return
+        try:
+            events = json.loads(buffer[newline + 1 : end])
+        except ValueError as err:
+            msg = f"Malformed lounge chunk: {buffer[newline + 1 : end]!r}"
+            raise LoungeSessionError(msg) from err
+        yield events, end
+        offset = end
+
+
+class LoungeClient:
+    """
+    Follow and control the GhostTube app over the YouTube lounge protocol.
+
+    Pairs with the app's screen ID, binds a session and keeps a long poll open, so
+    the app pushes now-playing, position and queue changes as they happen instead
+    of waiting for the GhostTube entity to be polled. While connected, its data is
+    laid over the GhostTube entity's in every coordinator snapshot and transport
+    commands can be sent to the app without going through the entity. Both sides
+    reach each other through the lounge server, by default YouTube's cloud relay,
+    so this needs internet access even though the TV is on the LAN. Malformed
+    responses end the session like any other failure, and it is rebound.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the client."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.stats = LoungeStats()
+        self._device_id = str(uuid.uuid4())
+        self._task: asyncio.Task[None] | None = None
+        self._unsub_overlay: CALLBACK_TYPE | None = None
+        self._config: tuple[str, str] | None = None
+        self._connected = False
+        self._token: str | None = None
+        self._sid: str | None = None
+        self._gsessionid: str | None = None
+        self._aid = 0
+        self._rid = 0
+        self._ofs = 0
+        self._failures = 0
+        self._now_playing: dict[str, Any] = {}
+        self._queue: list[str] = []
+        self._updated_at: datetime | None = None
+        self._position_updated_at: datetime | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return whether a lounge session is bound."""
+        return self._connected
+
+    @callback
+    def handles(self, entity_id: str | None) -> bool:
+        """Return whether commands for entity_id can go over the lounge."""
+        return self._connected and entity_id == self.coordinator.config.get(
+            f"{APP}_entity"
+        )
+
+    @callback
+    def async_apply_config(self) -> None:
+        """Connect, reconnect or disconnect to match the entry options."""
+        config = self.coordinator.config
+        screen_id = (config.get(CONF_LOUNGE_SCREEN_ID) or "").strip()
+        wanted = (
+            ((config.get(CONF_LOUNGE_URL) or DEFAULT_LOUNGE_URL).rstrip("/"), screen_id)
+            if screen_id
+            else None
+        )
+        if wanted == self._config:
+            return
+        self._async_stop()
+        self._config = wanted
+        if wanted is None:
+            return
+        if self._unsub_overlay is None:
+            self._unsub_overlay = self.coordinator.async_add_overlay(self._overlay)
+        self._task = self.coordinator.config_entry.async_create_background_task(
+            self.hass, self._async_run(), name=f"{DOMAIN} lounge"
+        )
+
+    @callback
+    def _async_stop(self) -> None:
+        """Drop the session and stop following the app."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._unsub_overlay is not None:
+            self._unsub_overlay()
+            self._unsub_overlay = None
+        was_connected = self._connected
+        self._connected = False
+        self._reset_session()
+        self._now_playing = {}
+        self._queue = []
+        self._position_updated_at = None
+        if was_connected:
+            self.coordinator.async_publish()
+
+    def _reset_session(self) -> None:
+        """Forget the bound session."""
+        self._token = self._sid = self._gsessionid = None
+        self._aid = 0
+        self._rid = 0
+        self._ofs = 0
+
+    async def _async_run(self) -> None:
+        """
+        Pair, bind and long-poll, reconnecting with backoff.
+
+        A bind that succeeds does not reset the backoff on its own, or a session
+        dropped right after binding would be retried every second; only one that
+        stays up for STABLE_CONNECTION does.
+        """
+        self._failures = 0
+        while True:
+            bound_at: float | None = None
+            try:
+                await self._async_bind()
+                bound_at = time.monotonic()
+                while True:
+                    await self._async_poll()
+            except (aiohttp.ClientError, TimeoutError, LoungeSessionError) as err:
+                LOGGER.debug("Lounge connection lost: %s", err)
+            if (
+                bound_at is not None
+                and time.monotonic() - bound_at >= STABLE_CONNECTION
+            ):
+                self._failures = 0
+            if self._connected:
+                self._connected = False
+                self.stats.disconnects += 1
+                self.coordinator.async_publish()
+            self._reset_session()
+            delay = RECONNECT_DELAYS[min(self._failures, len(RECONNECT_DELAYS) - 1)]
+            self._failures += 1
+            await asyncio.sleep(delay)
+
+    def _params(self, **extra: Any) -> dict[str, str]:
+        """Return the query parameters every bind request carries."""
+        params = {
+            "device": "REMOTE_CONTROL",
+            "id": self._device_id,
+            "name": "Home Assistant",
+            "app": "phantom-apparatus",
+            "mdx-version": "3",
+            "loungeIdToken": self._token or "",
+            "VER": "8",
+            "v": "2",
+            "CVER": "1",
+            "zx": uuid.uuid4().hex[:12],
+        }
+        if self._sid is not None:
+            params["SID"] = self._sid
+        if self._gsessionid is not None:
+            params["gsessionid"] = self._gsessionid
+        params.update({key: str(value) for key, value in extra.items()})
+        return params
+
+    async def _async_bind(self) -> None:
+        """Exchange the screen ID for a lounge token and open a session."""
+        assert self._config is not None  # noqa: S101
+        base_url, screen_id = self._config
+        session = async_get_clientsession(self.hass)
+        timeout = aiohttp.ClientTimeout(total=COMMAND_TIMEOUT)
+
+        async with session.post(
+            f"{base_url}/pairing/get_lounge_token_batch",
+            data={"screen_ids": screen_id},
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            try:
+                screens = (await response.json(content_type=None))["screens"]
+                token = screens[0]["loungeToken"] if screens else None
+            except (KeyError, TypeError, ValueError) as err:
+                msg = "Malformed lounge token response"
+                raise LoungeSessionError(msg) from err
+        if not token:
+            msg = f"No lounge token for screen {screen_id}"
+            raise LoungeSessionError(msg)
+        self._token = token
+
+        self._rid += 1
+        async with session.post(
+            f"{base_url}/bc/bind",
+            params=self._params(RID=self._rid, t=1),
+            data={"count": "0"},
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            self._handle_chunks(await response.text())
+        if self._sid is None or self._gsessionid is None:
+            msg = "Lounge bind returned no session"
+            raise LoungeSessionError(msg)
+
+        self._connected = True
+        self.stats.connects += 1
+        LOGGER.debug("Lounge session bound for screen %s", screen_id)
+        self.coordinator.async_publish()
+
+    async def _async_poll(self) -> None:
+        """Hold one long poll open and handle events as they stream in."""
+        assert self._config is not None  # noqa: S101
+        base_url, _ = self._config
+        session = async_get_clientsession(self.hass)
+        async with session.get(
+            f"{base_url}/bc/bind",
+            params=self._params(RID="rpc", TYPE="xmlhttp", CI=0, AID=self._aid),
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=READ_TIMEOUT),
+        ) as response:
+            if response.status in {400, 404, 410}:
+                msg = f"Lounge session expired ({response.status})"
+                raise LoungeSessionError(msg)
+            response.raise_for_status()
+            # Chunks can split multi-byte characters
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            buffer = ""
+            async for data in response.content.iter_any():
+                buffer += decoder.decode(data)
+                buffer = buffer[self._handle_chunks(buffer) :]
+
+    def _handle_chunks(self, buffer: str) -> int:
+        """Handle every complete chunk in buffer; return how much was used."""
+        used = 0
+        changed = False
+        for events, end in _iter_chunks(buffer):
+            used = end
+            try:
+                for event_id, (name, *args) in events:
+                    self._aid = max(self._aid, int(event_id))
+                    self.stats.events += 1
+                    changed |= self._handle_event(name, args[0] if args else None)
+            except (TypeError, ValueError) as err:
+                msg = f"Malformed lounge events: {events!r}"
+                raise LoungeSessionError(msg) from err
+        if changed:
+            self._updated_at = dt_util.utcnow()
+            self.coordinator.async_publish()
+        return used
+
+    def _handle_event(self, name: str, payload: Any) -> bool:
+        """Apply one lounge event; return whether now-playing changed."""
+        if name == "c":
+            self._sid = payload
+        elif name == "S":
+            self._gsessionid = payload
+        elif name in {"nowPlaying", "onStateChange"} and isinstance(payload, dict):
+            now_playing = {**self._now_playing, **payload}
+            if name == "nowPlaying" and not payload.get("videoId"):
+                now_playing = {}
+                self._position_updated_at = None
+            elif "currentTime" in payload:
+                self._position_updated_at = dt_util.utcnow()
+            self._now_playing = now_playing
+            return True
+        elif name in {"nowPlayingPlaylist", "playlistModified"} and isinstance(
+            payload, dict
+        ):
+            if (video_ids := payload.get("videoIds")) is not None:
+                self._queue = [
+                    video_id for video_id in video_ids.split(",") if video_id
+                ]
+                return True
+        elif name == "loungeScreenDisconnected":
+            msg = "Lounge screen disconnected"
+            raise LoungeSessionError(msg)
+        return False
+
+    @callback
+    def _overlay(self, data: dict[str, Any]) -> None:
+        """Lay pushed now-playing data over the GhostTube entity's."""
+        if not self._connected:
+            return
+        data[f"{APP}_queue"] = list(self._queue)
+        if not (video_id := self._now_playing.get("videoId")):
+            return
+
+        attributes = dict(data.get(f"{APP}_attributes", {}))
+        if attributes.get("media_content_id") != video_id:
+            # The entity still describes the previous item
+            for key in _ITEM_ATTRIBUTES:
+                attributes.pop(key, None)
+        attributes["media_content_id"] = video_id
+        if (position := _as_float(self._now_playing.get("currentTime"))) is not None:
+            attributes["media_position"] = position
+            attributes["media_position_updated_at"] = self._position_updated_at
+        if (duration := _as_float(self._now_playing.get("duration"))) is not None:
+            attributes["media_duration"] = duration
+        data[f"{APP}_attributes"] = attributes
+        data[f"{APP}_state"] = LOUNGE_STATES.get(
+            str(self._now_playing.get("state")), "idle"
+        )
+        if self._updated_at is not None:
+            data[f"{APP}_last_updated"] = max(
+                data.get(f"{APP}_last_updated") or self._updated_at, self._updated_at
+            )
+
+    async def async_command(self, service: str, data: dict[str, Any]) -> None:
+        """Send a transport command straight to the app."""
+        if not self._connected or self._config is None:
+            msg = "Lounge channel is not connected"
+            raise HomeAssistantError(msg)
+        command, arguments = LOUNGE_COMMANDS[service]
+        form = {"count": "1", "ofs": str(self._ofs), "req0__sc": command}
+        for field, argument in arguments.items():
+            form[f"req0_{argument}"] = str(data[field])
+        self._ofs += 1
+        self._rid += 1
+
+        base_url, _ = self._config
+        started = time.monotonic()
+        self.stats.commands += 1
+        try:
+            async with async_get_clientsession(self.hass).post(
+                f"{base_url}/bc/bind",
+                params=self._params(RID=self._rid),
+                data=form,
+                timeout=aiohttp.ClientTimeout(total=COMMAND_TIMEOUT),
+            ) as response:
+                response.raise_for_status()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            self.stats.command_errors += 1
+            msg = f"Lounge {command} failed: {err}"
+            raise HomeAssistantError(msg) from err
+        LOGGER.debug("Lounge %s sent in %.3fs", command, time.monotonic() - started)
+
+    async def async_shutdown(self) -> None:
+        """Close the lounge session."""
+        self._async_stop()
+        self._config = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return lounge statistics, for diagnostics."""
+        return {
+            **asdict(self.stats),
+            "connected": self._connected,
+            "now_playing": self._now_playing.get("videoId"),
+            "queue": len(self._queue),
+        }
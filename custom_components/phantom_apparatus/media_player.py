@@ -5,9 +5,15 @@ from __future__ import annotations
 import base64
 import logging
 import re
+import time
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
+import voluptuous as vol
 from homeassistant.components.media_player import (
+    ATTR_MEDIA_CONTENT_ID,
+    ATTR_MEDIA_CONTENT_TYPE,
+    ATTR_MEDIA_DURATION,
     BrowseMedia,
     MediaPlayerDeviceClass,
     MediaPlayerEntity,
@@ -18,19 +24,45 @@ from homeassistant.components.media_player.const import (
     MediaType,
 )
 from homeassistant.components.media_player.errors import BrowseError
-from homeassistant.core import HomeAssistant, callback
-
-from .const import GHOSTTUBE_IDLE_IMAGE_DATA_URI, JELLYFIN_IDLE_IMAGE_DATA_URI
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_platform
+
+from .const import (
+    APP_SOURCES,
+    CONF_ARTWORK_PROXY,
+    CONF_ARTWORK_SIZE,
+    DEFAULT_ARTWORK_SIZE,
+    GHOSTTUBE_IDLE_IMAGE_DATA_URI,
+    JELLYFIN_IDLE_IMAGE_DATA_URI,
+    WAKE_SERVICE,
+    WAKE_SERVICE_DOMAIN,
+)
 from .entity import PhantomApparatusEntity
+from .lounge import LOUNGE_COMMANDS
+from .routing import (
+    CONFIRM_TIMEOUT,
+    IDEMPOTENT_COMMANDS,
+    TARGET_APP,
+    TARGET_LOUNGE,
+    TARGET_TV,
+)
+from .search import SERVICE_SEARCH
+from .sequence import RUN_SEQUENCE_SCHEMA, SERVICE_RUN_SEQUENCE, async_run_sequence
 
 _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
-    from homeassistant.config_entries import ConfigEntry
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import PhantomApparatusDataUpdateCoordinator
-    from .data import PhantomApparatusConfigEntry
+    from .data import PhantomApparatusConfigEntry, PhantomApparatusData
 
 
 async def async_setup_entry(
@@ -42,6 +74,26 @@ async def async_setup_entry(
     coordinator = entry.runtime_data.coordinator
     async_add_entities([PhantomApparatusMediaPlayer(coordinator, entry)])
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_RUN_SEQUENCE,
+        RUN_SEQUENCE_SCHEMA,
+        "async_run_sequence",
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    platform.async_register_entity_service(
+        SERVICE_SEARCH,
+        {
+            vol.Required("query"): cv.string,
+            vol.Optional("limit", default=10): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=100)
+            ),
+            vol.Optional("source"): cv.string,
+        },
+        "async_search",
+        supports_response=SupportsResponse.ONLY,
+    )
+
 
 class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
     """Media player implementation for The Phantom Apparatus."""
@@ -49,18 +101,24 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
     _attr_device_class = MediaPlayerDeviceClass.TV
     _attr_has_entity_name = True
     _attr_name = None
+    # Position and artwork are already excluded by MediaPlayerEntity; per-item
+    # details are kept in the viewing-session log instead of recorder history.
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_MEDIA_CONTENT_ID,
+            ATTR_MEDIA_CONTENT_TYPE,
+            ATTR_MEDIA_DURATION,
+        }
+    )
 
     def __init__(
         self,
         coordinator: PhantomApparatusDataUpdateCoordinator,
-        entry: ConfigEntry,
+        entry: PhantomApparatusConfigEntry,
     ) -> None:
         """Initialize the media player."""
         super().__init__(coordinator, "media_player")
         self._entry = entry
-        self._tv_entity_id = entry.data.get("tv_entity")
-        self._jellyfin_entity_id = entry.data.get("jellyfin_entity")
-        self._ghosttube_entity_id = entry.data.get("ghosttube_entity")
         _LOGGER.debug(
             "Initialized PhantomApparatusMediaPlayer: entry_id=%s tv_entity=%s "
             "jellyfin_entity=%s ghosttube_entity=%s",
@@ -70,6 +128,27 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
             self._ghosttube_entity_id,
         )
 
+    @property
+    def _runtime_data(self) -> PhantomApparatusData:
+        """Return the entry's runtime components."""
+        return self._entry.runtime_data
+
+    # Entity IDs are read through the coordinator so option changes apply in place
+    @property
+    def _tv_entity_id(self) -> str | None:
+        """Return the configured TV entity ID."""
+        return self.coordinator.config.get("tv_entity")
+
+    @property
+    def _jellyfin_entity_id(self) -> str | None:
+        """Return the configured Jellyfin entity ID."""
+        return self.coordinator.config.get("jellyfin_entity")
+
+    @property
+    def _ghosttube_entity_id(self) -> str | None:
+        """Return the configured GhostTube entity ID."""
+        return self.coordinator.config.get("ghosttube_entity")
+
     @property
     def supported_features(self) -> MediaPlayerEntityFeature:  # noqa: PLR0912
         """Return supported features based on TV capabilities."""
@@ -89,6 +168,8 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
 
         # Map TV features to our features
         features |= MediaPlayerEntityFeature.TURN_ON
+        # play_media wakes the TV and launches the right app itself
+        features |= MediaPlayerEntityFeature.PLAY_MEDIA
         if tv_features & MediaPlayerEntityFeature.TURN_OFF:
             features |= MediaPlayerEntityFeature.TURN_OFF
         if tv_features & MediaPlayerEntityFeature.VOLUME_SET:
@@ -140,7 +221,9 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         current_source = tv_attrs.get("source")
         result: dict[str, Any] | None = None
 
-        if current_source == "Jellyfin":
+        if not self._is_active_app_fresh(current_source):
+            result = {}
+        elif current_source == "Jellyfin":
             result = self.coordinator.data.get("jellyfin_attributes", {})
         elif current_source == "GhostTube":
             result = self.coordinator.data.get("ghosttube_attributes", {})
@@ -164,7 +247,9 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         current_source = tv_attrs.get("source")
         result: str | None = None
 
-        if current_source == "Jellyfin":
+        if not self._is_active_app_fresh(current_source):
+            result = None
+        elif current_source == "Jellyfin":
             result = self.coordinator.data.get("jellyfin_state")
         elif current_source == "GhostTube":
             result = self.coordinator.data.get("ghosttube_state")
@@ -176,6 +261,28 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         )
         return result
 
+    def _is_active_app_fresh(self, current_source: str | None) -> bool:
+        """Return whether the foreground app's data is recent enough to trust."""
+        app = APP_SOURCES.get(current_source)
+        fresh = app is None or self._runtime_data.freshness.is_fresh(app)
+        if not fresh:
+            _LOGGER.debug("Ignoring stale %s data for source %s", app, current_source)
+        return fresh
+
+    def _get_cached_attribute(self, key: str) -> Any | None:
+        """
+        Return a stand-in value for the current item until the app reports it.
+
+        Values warmed by the next-up prefetcher win over those remembered from the
+        last time the item was seen.
+        """
+        active_attrs = self._get_active_app_attributes()
+        content_id = active_attrs.get("media_content_id") if active_attrs else None
+        metadata = self._runtime_data.prefetch.metadata.get(content_id, {})
+        if (value := metadata.get(key)) is not None:
+            return value
+        return self._runtime_data.metadata.get(content_id, key)
+
     def _get_idle_image_for_source(self, source: str | None) -> str | None:
         """Return idle artwork for known sources."""
         if source == "Jellyfin":
@@ -187,6 +294,10 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
     @property
     def state(self) -> MediaPlayerState | None:
         """Return the state of the media player."""
+        if self.coordinator.data is None:
+            # Still pending: the first snapshot is taken in the background
+            _LOGGER.debug("state requested before first snapshot; returning None")
+            return None
         if not self.coordinator.data:
             result = MediaPlayerState.OFF
             _LOGGER.debug(
@@ -290,6 +401,8 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         """Return the title of current playing media."""
         active_attrs = self._get_active_app_attributes()
         title = active_attrs.get("media_title") if active_attrs else None
+        if not title:
+            title = self._get_cached_attribute("media_title")
         _LOGGER.debug("media_title returning %s", title)
         return title
 
@@ -314,12 +427,19 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         """Return the duration of current playing media in seconds."""
         active_attrs = self._get_active_app_attributes()
         duration = active_attrs.get("media_duration") if active_attrs else None
+        if duration is None:
+            duration = self._get_cached_attribute("media_duration")
         _LOGGER.debug("media_duration returning %s", duration)
         return duration
 
     @property
-    def media_position(self) -> int | None:
+    def media_position(self) -> float | None:
         """Return the position of current playing media in seconds."""
+        # A seek in progress reports where playback is headed
+        if predicted := self._runtime_data.seek.predicted(
+            self._get_active_app_entity_id()
+        ):
+            return predicted[0]
         active_attrs = self._get_active_app_attributes()
         position = active_attrs.get("media_position") if active_attrs else None
         _LOGGER.debug("media_position returning %s", position)
@@ -328,6 +448,10 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
     @property
     def media_position_updated_at(self) -> Any | None:
         """Return when the position was last updated."""
+        if predicted := self._runtime_data.seek.predicted(
+            self._get_active_app_entity_id()
+        ):
+            return predicted[1]
         active_attrs = self._get_active_app_attributes()
         updated_at = (
             active_attrs.get("media_position_updated_at") if active_attrs else None
@@ -345,7 +469,12 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
             return image_url
 
         app_state = self._get_active_app_state()
-        if app_state not in {"playing", "paused"}:
+        if app_state in {"playing", "paused"}:
+            image_url = self._get_cached_attribute("entity_picture")
+            if image_url:
+                _LOGGER.debug("media_image_url using cached %s", image_url)
+                return image_url
+        else:
             source = self.source
             idle_image = self._get_idle_image_for_source(source)
             if idle_image:
@@ -367,7 +496,8 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         by media_image_url. Data URIs cause errors because HA prepends its base URL,
         creating malformed URLs like "http://192.168.84.1:8123data:image/...".
 
-        This override decodes data URIs inline instead.
+        This override decodes data URIs inline instead. When the artwork proxy is
+        enabled, regular artwork is downsized through it before being served.
         """
         url = self.media_image_url
         if url and url.startswith("data:"):
@@ -379,6 +509,17 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
                 return data, mime_type
             return None, None
 
+        if url and (image := self._runtime_data.prefetch.async_get_image(url)):
+            return image
+
+        config = self.coordinator.config
+        if url and config.get(CONF_ARTWORK_PROXY):
+            return await self._runtime_data.artwork.async_get(
+                url,
+                int(config.get(CONF_ARTWORK_SIZE, DEFAULT_ARTWORK_SIZE)),
+                super().async_get_media_image,
+            )
+
         # Fall back to parent implementation for regular URLs
         return await super().async_get_media_image()
 
@@ -403,6 +544,8 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         """Return the series title of current playing media."""
         active_attrs = self._get_active_app_attributes()
         series_title = active_attrs.get("media_series_title") if active_attrs else None
+        if not series_title:
+            series_title = self._get_cached_attribute("media_series_title")
         _LOGGER.debug("media_series_title returning %s", series_title)
         return series_title
 
@@ -427,13 +570,15 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         """Turn on the media player."""
         # Use Wake on LAN to turn on the TV
         _LOGGER.debug(
-            "async_turn_on called; invoking wake_living_room_tv shell_command",
+            "async_turn_on called; invoking %s.%s",
+            WAKE_SERVICE_DOMAIN,
+            WAKE_SERVICE,
         )
-        await self.hass.services.async_call(
-            "shell_command",
-            "wake_living_room_tv",
-            {},
-            blocking=True,
+        await self._runtime_data.scheduler.async_call(
+            self._tv_entity_id,
+            WAKE_SERVICE,
+            domain=WAKE_SERVICE_DOMAIN,
+            command="turn_on",
         )
 
     async def async_turn_off(self) -> None:
@@ -442,12 +587,7 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
             "async_turn_off called; tv_entity_id=%s",
             self._tv_entity_id,
         )
-        await self.hass.services.async_call(
-            "media_player",
-            "turn_off",
-            {"entity_id": self._tv_entity_id},
-            blocking=True,
-        )
+        await self._runtime_data.scheduler.async_call(self._tv_entity_id, "turn_off")
 
     async def async_set_volume_level(self, volume: float) -> None:
         """Set volume level, range 0..1."""
@@ -456,11 +596,8 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
             self._tv_entity_id,
             volume,
         )
-        await self.hass.services.async_call(
-            "media_player",
-            "volume_set",
-            {"entity_id": self._tv_entity_id, "volume_level": volume},
-            blocking=True,
+        await self._runtime_data.scheduler.async_call(
+            self._tv_entity_id, "volume_set", {"volume_level": volume}
         )
 
     async def async_volume_up(self) -> None:
@@ -469,12 +606,7 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
             "async_volume_up called; tv_entity_id=%s",
             self._tv_entity_id,
         )
-        await self.hass.services.async_call(
-            "media_player",
-            "volume_up",
-            {"entity_id": self._tv_entity_id},
-            blocking=True,
-        )
+        await self._runtime_data.scheduler.async_call(self._tv_entity_id, "volume_up")
 
     async def async_volume_down(self) -> None:
         """Decrease volume."""
@@ -482,12 +614,7 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
             "async_volume_down called; tv_entity_id=%s",
             self._tv_entity_id,
         )
-        await self.hass.services.async_call(
-            "media_player",
-            "volume_down",
-            {"entity_id": self._tv_entity_id},
-            blocking=True,
-        )
+        await self._runtime_data.scheduler.async_call(self._tv_entity_id, "volume_down")
 
     async def async_mute_volume(self, mute: bool) -> None:  # noqa: FBT001
         """Mute or unmute the volume."""
@@ -496,11 +623,8 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
             self._tv_entity_id,
             mute,
         )
-        await self.hass.services.async_call(
-            "media_player",
-            "volume_mute",
-            {"entity_id": self._tv_entity_id, "is_volume_muted": mute},
-            blocking=True,
+        await self._runtime_data.scheduler.async_call(
+            self._tv_entity_id, "volume_mute", {"is_volume_muted": mute}
         )
 
     async def async_select_source(self, source: str) -> None:
@@ -510,78 +634,139 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
             self._tv_entity_id,
             source,
         )
-        await self.hass.services.async_call(
-            "media_player",
-            "select_source",
-            {"entity_id": self._tv_entity_id, "source": source},
-            blocking=True,
+        await self._runtime_data.scheduler.async_call(
+            self._tv_entity_id, "select_source", {"source": source}
         )
 
     async def async_media_play(self) -> None:
-        """Send play command to TV."""
-        _LOGGER.debug(
-            "async_media_play called; tv_entity_id=%s",
-            self._tv_entity_id,
-        )
-        await self.hass.services.async_call(
-            "media_player",
-            "media_play",
-            {"entity_id": self._tv_entity_id},
-            blocking=True,
-        )
+        """Send play command to the fastest reliable target."""
+        await self._async_route_transport("media_play", MediaPlayerEntityFeature.PLAY)
 
     async def async_media_pause(self) -> None:
-        """Send pause command to TV."""
-        _LOGGER.debug(
-            "async_media_pause called; tv_entity_id=%s",
-            self._tv_entity_id,
-        )
-        await self.hass.services.async_call(
-            "media_player",
-            "media_pause",
-            {"entity_id": self._tv_entity_id},
-            blocking=True,
-        )
+        """Send pause command to the fastest reliable target."""
+        await self._async_route_transport("media_pause", MediaPlayerEntityFeature.PAUSE)
 
     async def async_media_stop(self) -> None:
-        """Send stop command to TV."""
-        _LOGGER.debug(
-            "async_media_stop called; tv_entity_id=%s",
-            self._tv_entity_id,
-        )
-        await self.hass.services.async_call(
-            "media_player",
-            "media_stop",
-            {"entity_id": self._tv_entity_id},
-            blocking=True,
-        )
+        """Send stop command to the fastest reliable target."""
+        await self._async_route_transport("media_stop", MediaPlayerEntityFeature.STOP)
 
     async def async_media_next_track(self) -> None:
-        """Send next track command to TV."""
-        _LOGGER.debug(
-            "async_media_next_track called; tv_entity_id=%s",
-            self._tv_entity_id,
-        )
-        await self.hass.services.async_call(
-            "media_player",
-            "media_next_track",
-            {"entity_id": self._tv_entity_id},
-            blocking=True,
+        """Send next track command to the fastest reliable target."""
+        await self._async_route_transport(
+            "media_next_track", MediaPlayerEntityFeature.NEXT_TRACK
         )
 
     async def async_media_previous_track(self) -> None:
-        """Send previous track command to TV."""
-        _LOGGER.debug(
-            "async_media_previous_track called; tv_entity_id=%s",
-            self._tv_entity_id,
-        )
-        await self.hass.services.async_call(
-            "media_player",
-            "media_previous_track",
-            {"entity_id": self._tv_entity_id},
-            blocking=True,
+        """Send previous track command to the fastest reliable target."""
+        await self._async_route_transport(
+            "media_previous_track", MediaPlayerEntityFeature.PREVIOUS_TRACK
         )
 
+    async def _async_route_transport(
+        self,
+        service: str,
+        feature: MediaPlayerEntityFeature,
+    ) -> None:
+        """
+        Send a transport command to the TV, the active app entity or the app itself.
+
+        The router orders the targets by measured latency and success for the
+        current source. A target succeeds once the player shows the command's
+        effect. On failure the next target is tried, unless the command may have
+        been delivered and is not safe to repeat.
+        """
+        source = self.source
+        entity_ids = {TARGET_TV: self._tv_entity_id}
+        active_app_attrs = self._get_active_app_attributes() or {}
+        if active_app_attrs.get("supported_features", 0) & feature:
+            entity_ids[TARGET_APP] = self._get_active_app_entity_id()
+        lounge = self._runtime_data.lounge
+        if service in LOUNGE_COMMANDS and lounge.handles(
+            app_entity_id := self._get_active_app_entity_id()
+        ):
+            entity_ids[TARGET_LOUNGE] = app_entity_id
+        router = self._runtime_data.router
+        targets = router.choose(source, service, list(entity_ids))
+
+        _LOGGER.debug(
+            "%s called; source=%s targets=%s",
+            service,
+            source,
+            [entity_ids[target] for target in targets],
+        )
+
+        content_id = self.media_content_id
+        for attempt, target in enumerate(targets, start=1):
+            last = attempt == len(targets)
+            started = time.monotonic()
+            try:
+                if not await self._async_send_transport(
+                    target, entity_ids[target], service
+                ):
+                    # Superseded by a newer command before it ran
+                    return
+            except (ServiceValidationError, vol.Invalid):
+                # Never delivered, so any command can be tried elsewhere
+                router.record(
+                    source, service, target, time.monotonic() - started, ok=False
+                )
+                if last:
+                    raise
+            except HomeAssistantError:
+                router.record(
+                    source, service, target, time.monotonic() - started, ok=False
+                )
+                if last or service not in IDEMPOTENT_COMMANDS:
+                    raise
+            else:
+                try:
+                    await self.coordinator.async_wait_for(
+                        partial(self._transport_confirmed, service, content_id),
+                        CONFIRM_TIMEOUT,
+                    )
+                except TimeoutError:
+                    router.record(
+                        source, service, target, time.monotonic() - started, ok=False
+                    )
+                    if last or service not in IDEMPOTENT_COMMANDS:
+                        _LOGGER.debug(
+                            "%s sent to %s but not confirmed",
+                            service,
+                            entity_ids[target],
+                        )
+                        return
+                else:
+                    router.record(
+                        source, service, target, time.monotonic() - started, ok=True
+                    )
+                    return
+            _LOGGER.debug("%s failed on %s; falling back", service, entity_ids[target])
+
+    async def _async_send_transport(
+        self, target: str, entity_id: str, service: str
+    ) -> bool:
+        """Send a transport command through one target; returns whether it ran."""
+        scheduler = self._runtime_data.scheduler
+        if target == TARGET_LOUNGE:
+            # Same lane as the app entity, so the two never interleave
+            return await scheduler.async_run(
+                entity_id,
+                service,
+                partial(self._runtime_data.lounge.async_command, service, {}),
+            )
+        return await scheduler.async_call(entity_id, service)
+
+    def _transport_confirmed(self, service: str, content_id: str | None) -> bool:
+        """Return whether the player shows the effect of a transport command."""
+        if service == "media_play":
+            return self.state == MediaPlayerState.PLAYING
+        if service == "media_pause":
+            return self.state == MediaPlayerState.PAUSED
+        if service == "media_stop":
+            return self.state not in (MediaPlayerState.PLAYING, MediaPlayerState.PAUSED)
+        # Track changes show as a different item
+        return self.media_content_id != content_id
+
     def _get_active_app_entity_id(self) -> str | None:
         """Get the entity ID of the currently active app."""
         if not self.coordinator.data:
@@ -609,18 +794,33 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         )
 
         if target_entity:
-            await self.hass.services.async_call(
-                "media_player",
-                "media_seek",
-                {"entity_id": target_entity, "seek_position": position},
-                blocking=True,
-            )
+            seek = self._runtime_data.seek
+            task = seek.async_request(target_entity, position)
+            # Show the predicted position before the app catches up
+            self.async_write_ha_state()
+            await seek.async_wait(task)
         else:
             _LOGGER.debug(
                 "async_media_seek skipped; no target entity available for source %s",
                 current_source,
             )
 
+    async def async_play_media(
+        self,
+        media_type: MediaType | str,
+        media_id: str,
+        **kwargs: Any,
+    ) -> None:
+        """Play media on whichever app can, waking the TV and launching as needed."""
+        _LOGGER.debug(
+            "async_play_media called; media_type=%s media_id=%s",
+            media_type,
+            media_id,
+        )
+        await self._runtime_data.play_media.async_play(
+            self, media_type, media_id, **kwargs
+        )
+
     async def async_browse_media(
         self,
         media_content_type: MediaType | str | None = None,
@@ -658,6 +858,10 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         )
 
         result = response.get(target_entity) if response else None
+        if isinstance(result, BrowseMedia | dict):
+            self._runtime_data.prefetch.async_observe_browse(result)
+            if current_source:
+                self._runtime_data.search.async_add_listing(current_source, result)
         if isinstance(result, BrowseMedia):
             return result
         if isinstance(result, dict):
@@ -668,6 +872,26 @@ class PhantomApparatusMediaPlayer(PhantomApparatusEntity, MediaPlayerEntity):
         )
         raise BrowseError(msg)
 
+    async def async_run_sequence(self, steps: list[dict[str, Any]]) -> ServiceResponse:
+        """Run a multi-step scene and report per-step timings."""
+        _LOGGER.debug("async_run_sequence called; steps=%s", steps)
+        return await async_run_sequence(self, steps)
+
+    async def async_search(
+        self,
+        query: str,
+        limit: int,
+        source: str | None = None,
+    ) -> ServiceResponse:
+        """Search the local index of browsed media."""
+        started = time.monotonic()
+        results = self._runtime_data.search.async_search(query, limit, source)
+        _LOGGER.debug("async_search called; query=%s results=%d", query, len(results))
+        return {
+            "results": results,
+            "took_ms": round((time.monotonic() - started) * 1000, 3),
+        }
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
@@ -0,0 +1,184 @@
+"""Persistent content-id metadata cache for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import APP_SOURCES, DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .coordinator import PhantomApparatusDataUpdateCoordinator
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+# App attributes remembered per item; artwork is left out because the app's
+# entity_picture is a proxy URL whose access token rotates
+CACHED_ATTRIBUTES = (
+    "media_title",
+    "media_series_title",
+    "media_duration",
+)
+# Least recently seen items are dropped beyond this many entries
+MAX_ITEMS = 2000
+# Items not seen for this long are dropped at compaction
+MAX_ITEM_AGE = timedelta(days=180)
+COMPACT_INTERVAL = timedelta(hours=6)
+
+
+@dataclass
+class MetadataCacheStats:
+    """Counters for cache use."""
+
+    hits: int = 0
+    misses: int = 0
+    learned: int = 0
+    compacted: int = 0
+
+
+def _entry_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the metadata store of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.metadata")
+
+
+async def async_remove_metadata(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the remembered metadata of a removed config entry."""
+    await _entry_store(hass, entry_id).async_remove()
+
+
+class MetadataCache:
+    """
+    Remember what each content ID looked like the last time it was seen.
+
+    App entities report media_content_id first and fill in the title, series and
+    duration later. The last values seen for an item stand in until the live ones
+    arrive. Only changed values mark the cache for saving, so position ticks never
+    reach storage. Hits and misses count each key once per item shown, however
+    often the entity asks for it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.stats = MetadataCacheStats()
+        self._store = _entry_store(hass, coordinator.config_entry.entry_id)
+        self._items: dict[str, dict[str, Any]] = {}
+        self._current: dict[str, str] = {}
+        self._counted_id: str | None = None
+        self._counted: set[str] = set()
+        self._unsub_compact: CALLBACK_TYPE | None = None
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load remembered items and start periodic compaction."""
+        if stored := await self._store.async_load():
+            # Drop attributes no longer cached, such as stored artwork URLs
+            self._items = {
+                content_id: {
+                    key: value
+                    for key, value in item.items()
+                    if key == "seen" or key in CACHED_ATTRIBUTES
+                }
+                for content_id, item in stored.get("items", {}).items()
+            }
+        self._loaded = True
+        self._async_compact()
+        self._unsub_compact = async_track_time_interval(
+            self.hass, self._async_compact, COMPACT_INTERVAL
+        )
+
+    @callback
+    def get(self, content_id: str | None, key: str) -> Any | None:
+        """Return the remembered value of key for content_id, if any."""
+        if not content_id:
+            return None
+        value = self._items.get(content_id, {}).get(key)
+        if content_id != self._counted_id:
+            self._counted_id = content_id
+            self._counted.clear()
+        if key not in self._counted:
+            self._counted.add(key)
+            if value is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        return value
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Remember metadata the apps report for their current items."""
+        data = self.coordinator.data or {}
+        changed = False
+        for app in APP_SOURCES.values():
+            attrs = data.get(f"{app}_attributes", {})
+            if not (content_id := attrs.get("media_content_id")):
+                continue
+            item = self._items.setdefault(content_id, {})
+            if self._current.get(app) != content_id:
+                # Seen again; counts towards keeping it at compaction
+                self._current[app] = content_id
+                item["seen"] = int(time.time())
+                changed = True
+            for key in CACHED_ATTRIBUTES:
+                if (value := attrs.get(key)) is not None and item.get(key) != value:
+                    item[key] = value
+                    self.stats.learned += 1
+                    changed = True
+        if changed:
+            self._async_schedule_save()
+
+    @callback
+    def _async_compact(self, _now: datetime | None = None) -> None:
+        """Drop items not seen for a long time and bound the total."""
+        cutoff = time.time() - MAX_ITEM_AGE.total_seconds()
+        kept = sorted(
+            (
+                (content_id, item)
+                for content_id, item in self._items.items()
+                if item.get("seen", 0) >= cutoff
+            ),
+            key=lambda entry: entry[1].get("seen", 0),
+        )[-MAX_ITEMS:]
+        if (dropped := len(self._items) - len(kept)) > 0:
+            self._items = dict(kept)
+            self.stats.compacted += dropped
+            LOGGER.debug("Compacted metadata cache; dropped %s items", dropped)
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save remembered items soon."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the stored representation."""
+        return {"items": self._items}
+
+    async def async_shutdown(self) -> None:
+        """Stop compacting and flush remembered items."""
+        if self._unsub_compact is not None:
+            self._unsub_compact()
+            self._unsub_compact = None
+        # Unloaded before the cache was loaded; saving would wipe it
+        if self._loaded:
+            await self._store.async_save(self._data_to_save())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache statistics, for diagnostics."""
+        return {**asdict(self.stats), "items": len(self._items)}
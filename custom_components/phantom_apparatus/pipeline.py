@@ -0,0 +1,195 @@
+"""Launch-and-deep-link play_media pipeline for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from .const import APP_SOURCES, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import PhantomApparatusDataUpdateCoordinator
+    from .media_player import PhantomApparatusMediaPlayer
+    from .scheduler import CommandScheduler
+    from .search import MediaSearchIndex
+
+WAKE_TIMEOUT = 30
+LAUNCH_TIMEOUT = 30
+FIRST_FRAME_TIMEOUT = 60
+# Pipeline runs kept for diagnostics
+MAX_RUNS = 20
+
+_JELLYFIN_ID_RE = re.compile(r"^[0-9a-f]{32}$", re.IGNORECASE)
+# A bare 11-character video ID is indistinguishable from other apps' IDs, so
+# only links and YouTube media types are routed to GhostTube
+_YOUTUBE_URL_RE = re.compile(
+    r"^(https?://)?((www|m|music)\.)?"
+    r"(youtube\.com/(watch\?|shorts/|live/|embed/)|youtu\.be/)",
+    re.IGNORECASE,
+)
+
+_APP_UNREADY_STATES = {None, "unavailable", "unknown", "off"}
+
+
+class PlayMediaPipeline:
+    """
+    Wake the TV, launch the target app and hand it the play request.
+
+    Waking, launching and waiting for the app entity to come up are overlapped:
+    each stage only waits for the coordinator state it needs. Time to first frame
+    is measured as the time until the app entity reports playing.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+        search: MediaSearchIndex,
+        scheduler: CommandScheduler,
+    ) -> None:
+        """Initialize the pipeline."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.search = search
+        self.scheduler = scheduler
+        self.runs: deque[dict[str, Any]] = deque(maxlen=MAX_RUNS)
+
+    def resolve_source(self, media_type: str, media_id: str) -> str:
+        """Return the app source that can play media_id."""
+        if source := self.search.async_source_for(media_id):
+            return source
+        if "youtube" in media_type.casefold() or _YOUTUBE_URL_RE.match(media_id):
+            return "GhostTube"
+        if _JELLYFIN_ID_RE.match(media_id):
+            return "Jellyfin"
+        current = (self.coordinator.data or {}).get("tv_attributes", {}).get("source")
+        if current in APP_SOURCES:
+            return current
+        msg = f"Cannot tell which app plays {media_type} {media_id}"
+        raise ServiceValidationError(msg)
+
+    def _data(self) -> dict[str, Any]:
+        """Return the current coordinator snapshot."""
+        return self.coordinator.data or {}
+
+    async def async_play(
+        self,
+        player: PhantomApparatusMediaPlayer,
+        media_type: str,
+        media_id: str,
+        **kwargs: Any,
+    ) -> None:
+        """Run the pipeline; returns once the app has accepted the request."""
+        source = self.resolve_source(media_type, media_id)
+        app = APP_SOURCES[source]
+        app_entity_id = self.coordinator.config.get(f"{app}_entity")
+        if not app_entity_id:
+            msg = f"No {source} entity configured"
+            raise ServiceValidationError(msg)
+
+        started = time.monotonic()
+        run: dict[str, Any] = {"source": source, "media_content_id": media_id}
+        self.runs.append(run)
+
+        def _mark(stage: str) -> None:
+            run[stage] = round(time.monotonic() - started, 3)
+
+        async def _wake() -> None:
+            if self._data().get("tv_state") == "off":
+                await player.async_turn_on()
+            await self.coordinator.async_wait_for(
+                lambda: self._data().get("tv_state") not in {None, "off"},
+                WAKE_TIMEOUT,
+            )
+            _mark("tv_on")
+
+        async def _launch() -> None:
+            await wake
+            if self._data().get("tv_attributes", {}).get("source") != source:
+                await player.async_select_source(source)
+            await self.coordinator.async_wait_for(
+                lambda: self._data().get("tv_attributes", {}).get("source") == source,
+                LAUNCH_TIMEOUT,
+            )
+            _mark("foreground")
+
+        async def _app_ready() -> None:
+            await self.coordinator.async_wait_for(
+                lambda: self._data().get(f"{app}_state") not in _APP_UNREADY_STATES,
+                WAKE_TIMEOUT + LAUNCH_TIMEOUT,
+            )
+            _mark("app_ready")
+
+        wake = asyncio.ensure_future(_wake())
+        stages = [
+            wake,
+            asyncio.ensure_future(_launch()),
+            asyncio.ensure_future(_app_ready()),
+        ]
+        try:
+            # The app entity usually connects while the launch is still settling,
+            # so the play request goes out as soon as both are done
+            await asyncio.gather(*stages[1:])
+            await self.scheduler.async_call(
+                app_entity_id,
+                "play_media",
+                {
+                    "media_content_type": media_type,
+                    "media_content_id": media_id,
+                    **kwargs,
+                },
+            )
+        except TimeoutError as err:
+            run["error"] = "timeout"
+            msg = f"{source} did not become ready to play {media_id}"
+            raise HomeAssistantError(msg) from err
+        except HomeAssistantError as err:
+            run["error"] = str(err)
+            raise
+        finally:
+            for stage in stages:
+                stage.cancel()
+        _mark("dispatched")
+
+        # Entry-scoped, so an unload does not leave it waiting on a dead coordinator
+        self.coordinator.config_entry.async_create_background_task(
+            self.hass,
+            self._async_measure_first_frame(app, media_id, run, started),
+            name="phantom_apparatus play_media first frame",
+        )
+
+    async def _async_measure_first_frame(
+        self,
+        app: str,
+        media_id: str,
+        run: dict[str, Any],
+        started: float,
+    ) -> None:
+        """Record when the app reports playing, as a time-to-first-frame proxy."""
+        previous_id = self._data().get(f"{app}_attributes", {}).get("media_content_id")
+
+        def _playing() -> bool:
+            data = self._data()
+            content_id = data.get(f"{app}_attributes", {}).get("media_content_id")
+            return data.get(f"{app}_state") == "playing" and (
+                content_id in {media_id, None} or content_id != previous_id
+            )
+
+        try:
+            await self.coordinator.async_wait_for(_playing, FIRST_FRAME_TIMEOUT)
+        except TimeoutError:
+            run["error"] = "no playback"
+            return
+        run["playing"] = round(time.monotonic() - started, 3)
+        LOGGER.debug("play_media pipeline finished: %s", run)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return recent pipeline runs, for diagnostics."""
+        return {"runs": list(self.runs)}
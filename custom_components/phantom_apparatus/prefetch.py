@@ -0,0 +1,314 @@
+"""Next-up artwork and metadata prefetch for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.media_player import (
+    BrowseMedia,
+    MediaClass,
+    async_fetch_image,
+)
+from homeassistant.core import callback
+
+from .const import (
+    APP_SOURCES,
+    CONF_ARTWORK_PROXY,
+    CONF_ARTWORK_SIZE,
+    DEFAULT_ARTWORK_SIZE,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from homeassistant.core import HomeAssistant
+
+    from .artwork import ArtworkProxy
+    from .coordinator import PhantomApparatusDataUpdateCoordinator
+
+# Browse listings remembered for sibling lookups
+MAX_LISTINGS = 200
+# Warmed artwork kept in memory when the artwork proxy is disabled
+MAX_IMAGES = 8
+
+_NUMBER_RE = re.compile(r"\d+")
+
+
+@dataclass
+class PrefetchStats:
+    """Counters for next-up prediction and warming."""
+
+    predictions: int = 0
+    hits: int = 0
+    misses: int = 0
+    warmed_images: int = 0
+    served_images: int = 0
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the share of predicted transitions that were right."""
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+
+def _number(value: Any) -> int | None:
+    """Return the first number in a season or episode value, such as "Season 2"."""
+    if isinstance(value, int):
+        return value
+    match = _NUMBER_RE.search(str(value)) if value is not None else None
+    return int(match.group()) if match else None
+
+
+def browse_items(node: BrowseMedia | dict[str, Any]) -> list[dict[str, Any]]:
+    """Return a browse node's children as plain dicts."""
+    if isinstance(node, BrowseMedia):
+        node = node.as_dict()
+    return [
+        child.as_dict(parent=False) if isinstance(child, BrowseMedia) else child
+        for child in node.get("children") or []
+    ]
+
+
+class NextUpPrefetcher:
+    """
+    Predict the item after the one playing and warm its artwork and metadata.
+
+    Predictions come from browse listings seen earlier, both browsed through the
+    unified player and crawled by the search index. An episode is followed by the
+    next one of its series, found from the app's media_series_title, media_season
+    and media_episode in the season listings, moving on to the next season after
+    the last episode. Anything else is followed by the next playable sibling of the
+    same media class in its listing, such as a playlist. Warmed metadata fills in
+    for the app entity until it catches up after the transition.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+        artwork: ArtworkProxy,
+    ) -> None:
+        """Initialize the prefetcher."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.stats = PrefetchStats()
+        self.metadata: dict[str, dict[str, Any]] = {}
+        self._artwork = artwork
+        self._listings: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        self._parents: dict[str, str] = {}
+        # Season listing content ID -> series title, and back by season number
+        self._series: dict[str, str] = {}
+        self._seasons: dict[tuple[str, int], str] = {}
+        self._images: OrderedDict[str, tuple[bytes, str | None]] = OrderedDict()
+        self._current_id: str | None = None
+        self._current_attrs: dict[str, Any] = {}
+        self._predicted_id: str | None = None
+        self._warm_task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_observe_browse(self, node: BrowseMedia | dict[str, Any]) -> None:
+        """Remember a browse listing so its items can be predicted later."""
+        if isinstance(node, BrowseMedia):
+            parent_id, title = node.media_content_id, node.title
+        else:
+            parent_id, title = node.get("media_content_id"), node.get("title")
+        children = browse_items(node)
+        if title:
+            # A series listing names the seasons it holds
+            self._series.update(
+                (child["media_content_id"], title)
+                for child in children
+                if child.get("media_class") == MediaClass.SEASON
+                and child.get("media_content_id")
+            )
+        items = [
+            item
+            for item in children
+            if item.get("can_play") and item.get("media_content_id")
+        ]
+        if not parent_id or not items:
+            return
+
+        self._listings[parent_id] = items
+        self._listings.move_to_end(parent_id)
+        for item in items:
+            self._parents[item["media_content_id"]] = parent_id
+        if (series := self._series.get(parent_id)) and (
+            season := _number(title)
+        ) is not None:
+            self._seasons[(series.casefold(), season)] = parent_id
+        while len(self._listings) > MAX_LISTINGS:
+            dropped_id, dropped = self._listings.popitem(last=False)
+            for item in dropped:
+                if self._parents.get(item["media_content_id"]) not in self._listings:
+                    self._parents.pop(item["media_content_id"], None)
+            self._seasons = {
+                key: season_id
+                for key, season_id in self._seasons.items()
+                if season_id != dropped_id
+            }
+
+        # The listing may cover what is already playing
+        if self._predicted_id is None and self._current_id is not None:
+            self._async_predict(self._current_id)
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Score the last prediction and predict again when the item changes."""
+        data = self.coordinator.data or {}
+        source = data.get("tv_attributes", {}).get("source")
+        app = APP_SOURCES.get(source)
+        attrs = data.get(f"{app}_attributes", {}) if app else {}
+        content_id = attrs.get("media_content_id")
+        if not content_id or content_id == self._current_id:
+            return
+        self._current_id = content_id
+        self._current_attrs = attrs
+
+        if self._predicted_id is not None:
+            if content_id == self._predicted_id:
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+            self._predicted_id = None
+
+        # Keep the entry for the item that just started; it is what fills the gap
+        self.metadata = {
+            key: value for key, value in self.metadata.items() if key == content_id
+        }
+        self._async_predict(content_id)
+
+    @callback
+    def _async_predict(self, content_id: str) -> None:
+        """Predict the item after content_id and start warming it."""
+        if (next_item := self._predict(content_id)) is None:
+            return
+        self.stats.predictions += 1
+        self._predicted_id = next_item["media_content_id"]
+        self.metadata[self._predicted_id] = {
+            "media_title": next_item.get("title"),
+            "media_content_type": next_item.get("media_content_type"),
+            "entity_picture": next_item.get("thumbnail"),
+        }
+        LOGGER.debug("Predicted next item %s after %s", self._predicted_id, content_id)
+
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+        if thumbnail := next_item.get("thumbnail"):
+            self._warm_task = self.hass.async_create_background_task(
+                self._async_warm_image(thumbnail),
+                name="phantom_apparatus prefetch artwork",
+            )
+
+    def _predict(self, content_id: str) -> dict[str, Any] | None:
+        """Return the browse item expected to play after content_id."""
+        if (next_episode := self._predict_episode(content_id)) is not None:
+            return next_episode
+        if (parent_id := self._parents.get(content_id)) is None:
+            return None
+        items = self._listings.get(parent_id, [])
+        index = next(
+            (
+                i
+                for i, item in enumerate(items)
+                if item["media_content_id"] == content_id
+            ),
+            None,
+        )
+        if index is None:
+            return None
+        media_class = items[index].get("media_class")
+        return next(
+            (
+                item
+                for item in items[index + 1 :]
+                if item.get("media_class") == media_class
+            ),
+            None,
+        )
+
+    def _predict_episode(self, content_id: str) -> dict[str, Any] | None:
+        """Return the episode after the playing one, by series, season and episode."""
+        series = self._current_attrs.get("media_series_title")
+        season = _number(self._current_attrs.get("media_season"))
+        episode = _number(self._current_attrs.get("media_episode"))
+        if not series or season is None or episode is None:
+            return None
+        series = series.casefold()
+
+        episodes = self._episodes(series, season)
+        # Position in the listing wins; the number only places unlisted episodes
+        index = next(
+            (
+                i
+                for i, item in enumerate(episodes)
+                if item["media_content_id"] == content_id
+            ),
+            episode - 1,
+        )
+        if 0 <= index + 1 < len(episodes):
+            return episodes[index + 1]
+        if index + 1 == len(episodes) and (
+            following := self._episodes(series, season + 1)
+        ):
+            return following[0]
+        return None
+
+    def _episodes(self, series: str, season: int) -> list[dict[str, Any]]:
+        """Return the known episodes of one season, in listing order."""
+        if (season_id := self._seasons.get((series, season))) is None:
+            return []
+        return [
+            item
+            for item in self._listings.get(season_id, [])
+            if item.get("media_class") == MediaClass.EPISODE
+        ]
+
+    async def _async_warm_image(self, url: str) -> None:
+        """Fetch predicted artwork ahead of the transition."""
+        if url.startswith(("data:", "/")):
+            return
+        fetch = partial(async_fetch_image, LOGGER, self.hass, url)
+        config = self.coordinator.config
+        if config.get(CONF_ARTWORK_PROXY):
+            # The proxy keeps its own disk cache; the first request is the warm-up
+            await self._artwork.async_get(
+                url, int(config.get(CONF_ARTWORK_SIZE, DEFAULT_ARTWORK_SIZE)), fetch
+            )
+            self.stats.warmed_images += 1
+            return
+        if url in self._images:
+            return
+
+        data, content_type = await fetch()
+        if data:
+            self._images[url] = (data, content_type)
+            while len(self._images) > MAX_IMAGES:
+                self._images.popitem(last=False)
+            self.stats.warmed_images += 1
+
+    @callback
+    def async_get_image(self, url: str) -> tuple[bytes, str | None] | None:
+        """Return warmed artwork for url, if any."""
+        if (image := self._images.get(url)) is not None:
+            self.stats.served_images += 1
+        return image
+
+    async def async_shutdown(self) -> None:
+        """Cancel any warm-up in progress."""
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            self._warm_task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return prefetch statistics, for diagnostics."""
+        return {
+            **asdict(self.stats),
+            "hit_rate": self.stats.hit_rate,
+            "predicted": self._predicted_id,
+        }
@@ -0,0 +1,394 @@
+"""Usage-learned TV pre-wake scheduling for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import Event, EventStateChangedData, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+    async_track_time_change,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    APP_SOURCES,
+    CONF_PREWAKE,
+    CONF_PREWAKE_LEAD_MINUTES,
+    CONF_PREWAKE_TRIGGERS,
+    DEFAULT_PREWAKE_LEAD_MINUTES,
+    DOMAIN,
+    LOGGER,
+    WAKE_SERVICE,
+    WAKE_SERVICE_DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .coordinator import PhantomApparatusDataUpdateCoordinator
+    from .scheduler import CommandScheduler
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+# Usage is bucketed per weekday into slots of this many minutes
+SLOT_MINUTES = 15
+# Power-ons older than this are forgotten, so the schedule follows habits
+HISTORY_DAYS = 56
+# Share of past weeks with use in a slot before it is pre-woken on schedule
+WAKE_THRESHOLD = 0.5
+# Lower bar when a trigger entity says someone is around
+TRIGGER_THRESHOLD = 0.25
+# Distinct days of use needed before a slot is trusted at all
+MIN_DAYS = 2
+# How long after the expected use a pre-wake may wait to be used
+HIT_GRACE = timedelta(minutes=15)
+
+# Trigger entity states that mean someone is around
+TRIGGER_ACTIVE_STATES = {"on", "home"}
+# App states that mean the TV is in use
+IN_USE_STATES = {"playing", "paused"}
+# TV states that mean it is not on
+TV_OFF_STATES = {None, "off", "unavailable"}
+
+_WEEK = 7 * 86400
+
+
+def _slot(when: datetime) -> tuple[int, int]:
+    """Return the (weekday, slot) bucket for a local time."""
+    local = dt_util.as_local(when)
+    return local.weekday(), (local.hour * 60 + local.minute) // SLOT_MINUTES
+
+
+def _entry_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the pre-wake store of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.prewake")
+
+
+async def async_remove_prewake(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the learned usage of a removed config entry."""
+    await _entry_store(hass, entry_id).async_remove()
+
+
+@dataclass
+class PreWakeStats:
+    """Counters proving whether pre-waking pays off."""
+
+    prewakes: int = 0
+    hits: int = 0
+    misses: int = 0
+    turned_off: int = 0
+    errors: int = 0
+    learned: int = 0
+    saved_seconds: float = 0
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the share of pre-wakes that were used."""
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+
+@dataclass
+class _PendingPreWake:
+    """A pre-wake waiting to be used."""
+
+    woken_at: float
+    reason: str
+    on_at: float | None = None
+
+
+class PreWakeScheduler:
+    """
+    Learn when the TV gets used and wake it shortly before.
+
+    Usage starts are bucketed per weekday and quarter hour. A slot is pre-woken on
+    schedule when enough past weeks had use in it, or earlier when a trigger entity
+    such as presence or motion activates while use is plausible. A pre-wake counts
+    as a hit when the app the TV shows starts playing before the slot is over;
+    otherwise it is a miss and the TV is turned back off, unless someone has used it
+    since it came on. Pre-wakes themselves are never learned as usage, only the
+    playback that follows them.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+        scheduler: CommandScheduler,
+    ) -> None:
+        """Initialize the pre-wake scheduler."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.scheduler = scheduler
+        self.stats = PreWakeStats()
+        self._store = _entry_store(hass, coordinator.config_entry.entry_id)
+        self._first_seen: float | None = None
+        self._power_ons: list[float] = []
+        self._tv_state: str | None = None
+        self._waking = False
+        self._pending: _PendingPreWake | None = None
+        self._last_slot: tuple[str, tuple[int, int]] | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._unsub_triggers: CALLBACK_TYPE | None = None
+        self._unsub_expiry: CALLBACK_TYPE | None = None
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load learned usage and statistics."""
+        if stored := await self._store.async_load():
+            self._first_seen = stored.get("first_seen")
+            self._power_ons = stored.get("power_ons", [])
+            self.stats = PreWakeStats(**stored.get("stats", {}))
+        self._loaded = True
+        if self._first_seen is None:
+            self._first_seen = time.time()
+            self._async_schedule_save()
+
+    @callback
+    def async_start(self) -> None:
+        """Start the per-minute check and follow the trigger entities."""
+        self._tv_state = (self.coordinator.data or {}).get("tv_state")
+        self._unsub_timer = async_track_time_change(
+            self.hass, self._async_check_schedule, second=0
+        )
+        self.async_apply_config()
+
+    @callback
+    def async_apply_config(self) -> None:
+        """Resubscribe to the configured trigger entities."""
+        if self._unsub_triggers is not None:
+            self._unsub_triggers()
+            self._unsub_triggers = None
+        if triggers := self.coordinator.config.get(CONF_PREWAKE_TRIGGERS):
+            self._unsub_triggers = async_track_state_change_event(
+                self.hass, triggers, self._async_trigger_changed
+            )
+
+    @property
+    def _lead(self) -> timedelta:
+        """Return how long before expected use the TV is woken."""
+        return timedelta(
+            minutes=int(
+                self.coordinator.config.get(
+                    CONF_PREWAKE_LEAD_MINUTES, DEFAULT_PREWAKE_LEAD_MINUTES
+                )
+            )
+        )
+
+    def likelihood(self, when: datetime) -> float:
+        """Return the share of recent weeks with use in when's slot or a neighbour."""
+        weekday, slot = _slot(when)
+        days = {
+            dt_util.as_local(dt_util.utc_from_timestamp(ts)).date()
+            for ts in self._power_ons
+            if (ts_slot := _slot(dt_util.utc_from_timestamp(ts)))[0] == weekday
+            and abs(ts_slot[1] - slot) <= 1
+        }
+        if len(days) < MIN_DAYS or self._first_seen is None:
+            return 0.0
+        span = min(when.timestamp() - self._first_seen, HISTORY_DAYS * 86400)
+        weeks = max(1, round(span / _WEEK))
+        return min(1.0, len(days) / weeks)
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Learn power-ons and score the pending pre-wake."""
+        data = self.coordinator.data or {}
+        previous, self._tv_state = self._tv_state, data.get("tv_state")
+        now = time.time()
+
+        if previous == "off" and self._tv_state not in TV_OFF_STATES:
+            if self._waking:
+                # Our own pre-wake; only the use that follows it is learned
+                self._waking = False
+                if self._pending is not None:
+                    self._pending.on_at = now
+            else:
+                self._async_learn(now)
+
+        if (pending := self._pending) is None:
+            return
+        if self._tv_state == "off" and pending.on_at is not None:
+            self._async_resolve(hit=False)
+        elif self._used_since(data, pending.woken_at):
+            self._async_learn(now)
+            # The boot already happened, so its duration is latency hidden from use
+            self.stats.saved_seconds += (pending.on_at or now) - pending.woken_at
+            self._async_resolve(hit=True)
+
+    def _used_since(self, data: dict[str, Any], since: float) -> bool:
+        """Return whether the app the TV shows started being used after since."""
+        if self._tv_state in TV_OFF_STATES:
+            return False
+        app = APP_SOURCES.get((data.get("tv_attributes") or {}).get("source"))
+        last_updated = data.get(f"{app}_last_updated")
+        return (
+            app is not None
+            and data.get(f"{app}_state") in IN_USE_STATES
+            and last_updated is not None
+            and last_updated.timestamp() > since
+        )
+
+    @callback
+    def _async_learn(self, ts: float) -> None:
+        """Record a start of use and forget old ones."""
+        cutoff = ts - HISTORY_DAYS * 86400
+        self._power_ons = [t for t in self._power_ons if t >= cutoff]
+        self._power_ons.append(ts)
+        self.stats.learned += 1
+        self._async_schedule_save()
+
+    @callback
+    def _async_check_schedule(self, now: datetime) -> None:
+        """Pre-wake when the slot one lead time ahead is usually used."""
+        if not self.coordinator.config.get(CONF_PREWAKE):
+            return
+        target = now + self._lead
+        if self.likelihood(target) >= WAKE_THRESHOLD:
+            self._async_prewake(target, "schedule")
+
+    @callback
+    def _async_trigger_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Pre-wake early when someone shows up around a likely slot."""
+        new_state = event.data["new_state"]
+        if (
+            not self.coordinator.config.get(CONF_PREWAKE)
+            or new_state is None
+            or new_state.state not in TRIGGER_ACTIVE_STATES
+        ):
+            return
+        now = dt_util.utcnow()
+        target = max((now, now + self._lead), key=self.likelihood)
+        if self.likelihood(target) >= TRIGGER_THRESHOLD:
+            self._async_prewake(target, event.data["entity_id"])
+
+    @callback
+    def _async_prewake(self, target: datetime, reason: str) -> None:
+        """Wake the TV ahead of the use expected at target."""
+        slot_key = (dt_util.as_local(target).date().isoformat(), _slot(target))
+        if (
+            self._pending is not None
+            or slot_key == self._last_slot
+            or (self.coordinator.data or {}).get("tv_state") != "off"
+        ):
+            return
+        self._last_slot = slot_key
+        self._pending = _PendingPreWake(woken_at=time.time(), reason=reason)
+        self._waking = True
+        self.stats.prewakes += 1
+        LOGGER.debug("Pre-waking TV for %s (%s)", target, reason)
+
+        window = (target - dt_util.utcnow()) + timedelta(minutes=SLOT_MINUTES)
+        self._unsub_expiry = async_call_later(
+            self.hass, window + HIT_GRACE, self._async_expire
+        )
+        self.coordinator.config_entry.async_create_background_task(
+            self.hass, self._async_wake(), name=f"{DOMAIN} pre-wake"
+        )
+
+    async def _async_wake(self) -> None:
+        """Send the wake command."""
+        try:
+            await self.scheduler.async_call(
+                self.coordinator.config.get("tv_entity"),
+                WAKE_SERVICE,
+                domain=WAKE_SERVICE_DOMAIN,
+                command="turn_on",
+            )
+        except HomeAssistantError:
+            LOGGER.warning("Pre-wake failed", exc_info=True)
+            self.stats.errors += 1
+            self._waking = False
+            self._pending = None
+            if self._unsub_expiry is not None:
+                self._unsub_expiry()
+                self._unsub_expiry = None
+
+    @callback
+    def _async_expire(self, _now: datetime) -> None:
+        """Score an unused pre-wake as a miss and put the TV back to sleep."""
+        self._unsub_expiry = None
+        self._waking = False
+        if (pending := self._pending) is None:
+            return
+        self._async_resolve(hit=False)
+        data = self.coordinator.data or {}
+        tv_entity_id = self.coordinator.config.get("tv_entity")
+        # Any TV change after it came on means someone is using it
+        tv_last_updated = data.get("tv_last_updated")
+        if (
+            tv_entity_id
+            and data.get("tv_state") != "off"
+            and (
+                tv_last_updated is None
+                or tv_last_updated.timestamp() <= (pending.on_at or pending.woken_at)
+            )
+        ):
+            self.coordinator.config_entry.async_create_background_task(
+                self.hass,
+                self._async_turn_off(tv_entity_id),
+                name=f"{DOMAIN} pre-wake turn off",
+            )
+
+    async def _async_turn_off(self, tv_entity_id: str) -> None:
+        """Put the TV back to sleep after an unused pre-wake."""
+        try:
+            if await self.scheduler.async_call(tv_entity_id, "turn_off"):
+                self.stats.turned_off += 1
+        except HomeAssistantError:
+            LOGGER.warning("Turning the TV off after a pre-wake failed", exc_info=True)
+            self.stats.errors += 1
+
+    @callback
+    def _async_resolve(self, *, hit: bool) -> None:
+        """Close the pending pre-wake."""
+        if hit:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        LOGGER.debug("Pre-wake %s (%s)", "used" if hit else "missed", self._pending)
+        self._pending = None
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save learned usage and statistics soon."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the stored representation."""
+        return {
+            "first_seen": self._first_seen,
+            "power_ons": self._power_ons,
+            "stats": asdict(self.stats),
+        }
+
+    async def async_shutdown(self) -> None:
+        """Stop scheduling and flush learned usage."""
+        for unsub in (self._unsub_timer, self._unsub_triggers, self._unsub_expiry):
+            if unsub is not None:
+                unsub()
+        self._unsub_timer = self._unsub_triggers = self._unsub_expiry = None
+        # Unloaded before the model was loaded; saving would wipe it
+        if self._loaded:
+            await self._store.async_save(self._data_to_save())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return pre-wake statistics, for diagnostics."""
+        return {
+            **asdict(self.stats),
+            "hit_rate": self.stats.hit_rate,
+            "power_ons": len(self._power_ons),
+            "pending": asdict(self._pending) if self._pending else None,
+        }
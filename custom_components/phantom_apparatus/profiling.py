@@ -0,0 +1,79 @@
+"""On-demand profiling for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import pstats
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Functions listed in the service response and the text summary
+SUMMARY_ROWS = 25
+
+_PACKAGE_DIR = str(Path(__file__).parent)
+
+
+async def async_profile(hass: HomeAssistant, seconds: float) -> dict[str, Any]:
+    """
+    Profile the event loop thread for a while and dump the results.
+
+    Coordinator callbacks, entity property evaluation and commands all run on the
+    event loop, so that is the only thread profiled. Nothing is installed outside
+    a profiling window. Writes a pstats dump, readable by snakeviz or flameprof,
+    and a text summary limited to this integration's functions.
+    """
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as err:
+        # Only one profiler can be active per thread
+        msg = f"Unable to start profiling: {err}"
+        raise ServiceValidationError(msg) from err
+    LOGGER.info("Profiling for %s seconds", seconds)
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.disable()
+
+    stamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%S")
+    path = Path(hass.config.path(DOMAIN, "profiles", f"profile-{stamp}.prof"))
+    functions = await hass.async_add_executor_job(_write_profile, profiler, path)
+    LOGGER.info("Profile written to %s", path)
+    return {"profile": str(path), "functions": functions}
+
+
+def _write_profile(profiler: cProfile.Profile, path: Path) -> list[dict[str, Any]]:
+    """Write the dump and summary, and return the integration's top functions."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(path)
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream).sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(_PACKAGE_DIR, SUMMARY_ROWS)
+    path.with_suffix(".txt").write_text(stream.getvalue(), encoding="utf-8")
+
+    rows = []
+    for (filename, line, name), row in stats.stats.items():  # type: ignore[attr-defined]
+        if not filename.startswith(_PACKAGE_DIR):
+            continue
+        _, calls, total, cumulative, _ = row
+        rows.append(
+            {
+                "function": f"{Path(filename).name}:{line}({name})",
+                "calls": calls,
+                "total_ms": round(1000 * total, 3),
+                "cumulative_ms": round(1000 * cumulative, 3),
+            }
+        )
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:SUMMARY_ROWS]
@@ -0,0 +1,106 @@
+"""Latency-aware transport command routing for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any
+
+TARGET_TV = "tv"
+TARGET_APP = "app"
+TARGET_LOUNGE = "lounge"
+
+# Weight of the newest sample in the moving averages
+SMOOTHING = 0.2
+# Every Nth command for a route tries the runner-up, so estimates stay current
+EXPLORE_EVERY = 20
+# Success rate floor, so a flaky target is penalised but still comparable
+MIN_SUCCESS = 0.05
+# How long a target gets to show a command's effect before it counts as failed
+CONFIRM_TIMEOUT = 3
+# Commands that can be sent again through another target after a failure; a
+# repeated next or previous track would skip twice
+IDEMPOTENT_COMMANDS = frozenset({"media_play", "media_pause", "media_stop"})
+
+
+@dataclass
+class RouteEstimate:
+    """Moving latency and success estimate for one (source, command, target)."""
+
+    latency: float | None = None
+    success: float = 1.0
+    samples: int = 0
+    failures: int = 0
+
+    def record(self, latency: float, *, ok: bool) -> None:
+        """Fold one command outcome into the estimate."""
+        self.samples += 1
+        if not ok:
+            self.failures += 1
+        self.success += SMOOTHING * ((1.0 if ok else 0.0) - self.success)
+        if ok:
+            self.latency = (
+                latency
+                if self.latency is None
+                else self.latency + SMOOTHING * (latency - self.latency)
+            )
+
+    @property
+    def score(self) -> float:
+        """Return the expected cost of using this target; lower is better."""
+        if self.latency is None:
+            return float("inf")
+        return self.latency / max(self.success, MIN_SUCCESS)
+
+
+class CommandRouter:
+    """
+    Pick between the TV, the app entity and the app itself for transport commands.
+
+    Targets without samples are tried first so every route gets measured, after
+    which the lowest expected cost wins. Callers measure a command until its effect
+    shows, and fall back through the returned order when it fails.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the router."""
+        self._estimates: dict[tuple[str, str, str], RouteEstimate] = defaultdict(
+            RouteEstimate
+        )
+        self._calls: dict[tuple[str, str], int] = defaultdict(int)
+
+    def choose(self, source: str | None, command: str, targets: list[str]) -> list[str]:
+        """Return the candidate targets ordered by preference."""
+        if len(targets) < 2:  # noqa: PLR2004
+            return list(targets)
+
+        key = (source or "", command)
+        self._calls[key] += 1
+        estimates = {target: self._estimates[(*key, target)] for target in targets}
+
+        if unmeasured := [t for t in targets if not estimates[t].samples]:
+            return unmeasured + [t for t in targets if t not in unmeasured]
+
+        ordered = sorted(targets, key=lambda target: estimates[target].score)
+        if self._calls[key] % EXPLORE_EVERY == 0:
+            ordered[0], ordered[1] = ordered[1], ordered[0]
+        return ordered
+
+    def record(
+        self,
+        source: str | None,
+        command: str,
+        target: str,
+        latency: float,
+        *,
+        ok: bool,
+    ) -> None:
+        """Record the outcome of a routed command."""
+        self._estimates[(source or "", command, target)].record(latency, ok=ok)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the current estimates, for diagnostics."""
+        return {
+            f"{source}/{command}/{target}": asdict(estimate)
+            for (source, command, target), estimate in self._estimates.items()
+        }
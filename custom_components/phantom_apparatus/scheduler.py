@@ -0,0 +1,310 @@
+"""Per-device command lanes with priorities for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import itertools
+import time
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+    from homeassistant.core import HomeAssistant
+
+PRIORITY_POWER = 0
+PRIORITY_SOURCE = 1
+PRIORITY_TRANSPORT = 2
+PRIORITY_VOLUME = 3
+
+# Anything not listed is a transport command
+COMMAND_PRIORITIES = {
+    "turn_on": PRIORITY_POWER,
+    "turn_off": PRIORITY_POWER,
+    "select_source": PRIORITY_SOURCE,
+    "volume_set": PRIORITY_VOLUME,
+    "volume_up": PRIORITY_VOLUME,
+    "volume_down": PRIORITY_VOLUME,
+    "volume_mute": PRIORITY_VOLUME,
+}
+
+# Absolute commands where only the newest queued one matters; relative ones such
+# as volume_up or media_play_pause always run
+LAST_WINS_GROUPS = {
+    "turn_on": "power",
+    "turn_off": "power",
+    "select_source": "source",
+    "volume_set": "volume",
+    "volume_mute": "mute",
+    "media_play": "play_state",
+    "media_pause": "play_state",
+    "media_stop": "play_state",
+    "media_seek": "seek",
+    "play_media": "play_media",
+}
+
+# Queued commands per lane before callers are made to wait
+MAX_QUEUE_DEPTH = 16
+# How long a caller waits for room before its command is rejected
+BACKPRESSURE_TIMEOUT = 5
+# Weight of the newest sample in the moving averages
+SMOOTHING = 0.2
+
+
+@dataclass
+class LaneStats:
+    """Counters and queue timings for one lane."""
+
+    enqueued: int = 0
+    executed: int = 0
+    failed: int = 0
+    superseded: int = 0
+    evicted: int = 0
+    rejected: int = 0
+    cancelled: int = 0
+    max_depth: int = 0
+    wait_ms: float | None = None
+    max_wait_ms: float = 0
+
+    def record_wait(self, seconds: float) -> None:
+        """Fold one queue wait into the statistics."""
+        wait_ms = 1000 * seconds
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.wait_ms = (
+            wait_ms
+            if self.wait_ms is None
+            else self.wait_ms + SMOOTHING * (wait_ms - self.wait_ms)
+        )
+
+
+@dataclass
+class _Command:
+    """A queued service call."""
+
+    priority: int
+    seq: int
+    command: str
+    job: Callable[[], Coroutine[Any, Any, Any]]
+    future: asyncio.Future[bool]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def sort_key(self) -> tuple[int, int]:
+        """Return the queue order: priority, then arrival."""
+        return self.priority, self.seq
+
+
+class _Lane:
+    """Commands for one target, run one at a time in priority order."""
+
+    def __init__(self) -> None:
+        self.queue: list[_Command] = []
+        self.stats = LaneStats()
+        self.changed = asyncio.Condition()
+        self.current: _Command | None = None
+        self.call: asyncio.Task[Any] | None = None
+        self.worker: asyncio.Task[None] | None = None
+
+
+class CommandScheduler:
+    """
+    Serialize commands per target entity, most important first.
+
+    Every command for a target goes through that target's lane and runs only
+    after the previous one finished, so a turn_off cannot interleave with a burst
+    of volume_up. Queued commands run by priority (power, source, transport,
+    volume), then in arrival order. A newer absolute command replaces a queued one
+    of the same kind, and turn_off drops everything queued behind it. Full lanes
+    make callers wait, evicting the least important queued command when the new
+    one outranks it.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._lanes: dict[str, _Lane] = {}
+        self._seq = itertools.count()
+
+    async def async_call(
+        self,
+        entity_id: str,
+        service: str,
+        data: dict[str, Any] | None = None,
+        *,
+        domain: str = "media_player",
+        command: str | None = None,
+    ) -> bool:
+        """
+        Run a service call in entity_id's lane and wait for it.
+
+        command names the command for ordering when the service itself does not,
+        as for a Wake-on-LAN script standing in for turn_on. Returns whether the
+        call ran; it does not if a later command makes this one obsolete.
+        """
+        if domain == "media_player":
+            data = {ATTR_ENTITY_ID: entity_id, **(data or {})}
+        return await self.async_run(
+            entity_id,
+            command or service,
+            partial(
+                self.hass.services.async_call, domain, service, data, blocking=True
+            ),
+        )
+
+    async def async_run(
+        self,
+        entity_id: str,
+        command: str,
+        job: Callable[[], Coroutine[Any, Any, Any]],
+    ) -> bool:
+        """
+        Run job in entity_id's lane as command and wait for it.
+
+        For commands that reach the target some other way than a service call,
+        such as a direct connection to the app. Returns whether job ran.
+        """
+        lane = self._async_lane(entity_id)
+        item = _Command(
+            priority=COMMAND_PRIORITIES.get(command, PRIORITY_TRANSPORT),
+            seq=next(self._seq),
+            command=command,
+            job=job,
+            future=self.hass.loop.create_future(),
+        )
+
+        async with lane.changed:
+            self._async_supersede(lane, item)
+            if len(lane.queue) >= MAX_QUEUE_DEPTH:
+                self._async_make_room(lane, item)
+            try:
+                async with asyncio.timeout(BACKPRESSURE_TIMEOUT):
+                    await lane.changed.wait_for(
+                        lambda: len(lane.queue) < MAX_QUEUE_DEPTH
+                    )
+            except TimeoutError as err:
+                lane.stats.rejected += 1
+                msg = f"Too many commands queued for {entity_id}"
+                raise HomeAssistantError(msg) from err
+            bisect.insort(lane.queue, item, key=lambda queued: queued.sort_key)
+            lane.stats.enqueued += 1
+            lane.stats.max_depth = max(lane.stats.max_depth, len(lane.queue))
+            if lane.worker is None or lane.worker.done():
+                lane.worker = self.hass.async_create_background_task(
+                    self._async_run_lane(entity_id, lane),
+                    name=f"{DOMAIN} command lane {entity_id}",
+                )
+
+        try:
+            return await asyncio.shield(item.future)
+        except asyncio.CancelledError:
+            if not item.future.done():
+                self._async_abandon(lane, item)
+            raise
+
+    @callback
+    def _async_lane(self, entity_id: str) -> _Lane:
+        """Return entity_id's lane, creating it on first use."""
+        if (lane := self._lanes.get(entity_id)) is None:
+            lane = self._lanes[entity_id] = _Lane()
+        return lane
+
+    @callback
+    def _async_make_room(self, lane: _Lane, item: _Command) -> None:
+        """Evict the least important queued command if item outranks it."""
+        worst = lane.queue[-1]
+        if worst.priority > item.priority:
+            lane.queue.pop()
+            lane.stats.evicted += 1
+            worst.future.set_result(False)
+            lane.changed.notify_all()
+            LOGGER.debug("Evicted queued %s for %s", worst.command, item.command)
+
+    @callback
+    def _async_supersede(self, lane: _Lane, item: _Command) -> None:
+        """Drop queued commands that item makes obsolete."""
+        group = LAST_WINS_GROUPS.get(item.command)
+        kept: list[_Command] = []
+        for queued in lane.queue:
+            if (
+                group is not None and LAST_WINS_GROUPS.get(queued.command) == group
+            ) or (item.command == "turn_off" and queued.priority > PRIORITY_POWER):
+                lane.stats.superseded += 1
+                queued.future.set_result(False)
+            else:
+                kept.append(queued)
+        if len(kept) < len(lane.queue):
+            lane.queue = kept
+            lane.changed.notify_all()
+
+    @callback
+    def _async_abandon(self, lane: _Lane, item: _Command) -> None:
+        """Withdraw a command whose caller gave up."""
+        lane.stats.cancelled += 1
+        if item in lane.queue:
+            lane.queue.remove(item)
+            # Not holding the lock here, so wake callers waiting for room later
+            self.hass.async_create_background_task(
+                self._async_notify(lane), name=f"{DOMAIN} command lane notify"
+            )
+        elif lane.current is item and lane.call is not None:
+            lane.call.cancel()
+        item.future.cancel()
+
+    async def _async_notify(self, lane: _Lane) -> None:
+        """Wake callers waiting for room in lane."""
+        async with lane.changed:
+            lane.changed.notify_all()
+
+    async def _async_run_lane(self, entity_id: str, lane: _Lane) -> None:
+        """Run one lane's commands in order until its queue is empty."""
+        while lane.queue:
+            async with lane.changed:
+                item = lane.queue.pop(0)
+                lane.changed.notify_all()
+
+            lane.stats.record_wait(time.monotonic() - item.enqueued_at)
+            lane.current = item
+            lane.call = self.hass.async_create_task(item.job(), eager_start=False)
+            # Waiting rather than awaiting keeps a cancelled call from stopping
+            # the lane itself
+            await asyncio.wait([lane.call])
+            lane.current = None
+            if item.future.done():
+                continue
+            if lane.call.cancelled():
+                item.future.cancel()
+            elif (err := lane.call.exception()) is not None:
+                lane.stats.failed += 1
+                item.future.set_exception(err)
+            else:
+                lane.stats.executed += 1
+                item.future.set_result(True)
+            LOGGER.debug("Ran %s on %s", item.command, entity_id)
+
+    async def async_shutdown(self) -> None:
+        """Stop every lane and release waiting callers."""
+        for lane in self._lanes.values():
+            for item in lane.queue:
+                item.future.cancel()
+            lane.queue.clear()
+            if lane.call is not None:
+                lane.call.cancel()
+            if lane.worker is not None:
+                lane.worker.cancel()
+        self._lanes.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return per-lane statistics, for diagnostics."""
+        return {
+            entity_id: {"depth": len(lane.queue), **asdict(lane.stats)}
+            for entity_id, lane in self._lanes.items()
+        }
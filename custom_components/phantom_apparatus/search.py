@@ -0,0 +1,318 @@
+"""Local media search index for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import bisect
+import difflib
+import re
+import time
+import unicodedata
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.media_player import BrowseMedia
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import APP_SOURCES, LOGGER
+from .prefetch import browse_items
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import PhantomApparatusDataUpdateCoordinator
+    from .prefetch import NextUpPrefetcher
+
+SERVICE_SEARCH = "search"
+
+REFRESH_INTERVAL = timedelta(hours=6)
+# Upper bound on browse round trips per app and refresh
+MAX_CRAWL_NODES = 250
+MAX_CRAWL_DEPTH = 4
+# Minimum similarity for a fuzzy token match
+FUZZY_CUTOFF = 0.8
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Per query token: exact beats prefix beats fuzzy
+_SCORE_EXACT = 3
+_SCORE_PREFIX = 2
+_SCORE_FUZZY = 1
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into accent-free, case-folded word tokens."""
+    normalized = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in normalized if not unicodedata.combining(char))
+    return _TOKEN_RE.findall(stripped.casefold())
+
+
+@dataclass(slots=True)
+class IndexedItem:
+    """A searchable browse item."""
+
+    source: str
+    media_content_id: str
+    media_content_type: str
+    title: str
+    media_class: str | None
+    context: str | None
+    thumbnail: str | None
+    can_play: bool
+
+
+class MediaSearchIndex:
+    """
+    In-memory inverted index over titles, series and channels.
+
+    Items come from browse responses, both those passing through the unified
+    player and a bounded background crawl of each app. A listing's title is
+    indexed as context for its children, so episodes are found by series name and
+    videos by channel name. Crawled listings are passed on to the next-up
+    prefetcher as well.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+        prefetch: NextUpPrefetcher,
+    ) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._prefetch = prefetch
+        self._items: dict[tuple[str, str], IndexedItem] = {}
+        self._postings: dict[str, set[tuple[str, str]]] = defaultdict(set)
+        self._vocabulary: list[str] = []
+        self._vocabulary_dirty = False
+        self._last_refresh: float | None = None
+        self._refresh_seconds: float | None = None
+
+    @callback
+    def async_add_listing(
+        self,
+        source: str,
+        node: BrowseMedia | dict[str, Any],
+    ) -> list[dict[str, Any]]:
+        """Index a browse listing and return its children as dicts."""
+        items, children = self._listing_items(source, node)
+        for item in items:
+            self._async_add(item)
+        return children
+
+    @staticmethod
+    def _listing_items(
+        source: str,
+        node: BrowseMedia | dict[str, Any],
+    ) -> tuple[list[IndexedItem], list[dict[str, Any]]]:
+        """Return a browse listing's searchable items and its children as dicts."""
+        context = node.title if isinstance(node, BrowseMedia) else node.get("title")
+        children = browse_items(node)
+        items = [
+            IndexedItem(
+                source=source,
+                media_content_id=content_id,
+                media_content_type=child.get("media_content_type") or "",
+                title=title,
+                media_class=child.get("media_class"),
+                context=context,
+                thumbnail=child.get("thumbnail"),
+                can_play=bool(child.get("can_play")),
+            )
+            for child in children
+            if (content_id := child.get("media_content_id"))
+            and (title := child.get("title"))
+        ]
+        return items, children
+
+    @callback
+    def _async_add(self, item: IndexedItem) -> None:
+        """Add or replace one item."""
+        key = (item.source, item.media_content_id)
+        if (previous := self._items.get(key)) is not None:
+            if previous == item:
+                return
+            for token in self._tokens(previous):
+                self._postings[token].discard(key)
+        self._items[key] = item
+        for token in self._tokens(item):
+            if token not in self._postings or not self._postings[token]:
+                self._vocabulary_dirty = True
+            self._postings[token].add(key)
+
+    @callback
+    def _async_replace(self, items: dict[tuple[str, str], IndexedItem]) -> None:
+        """Swap the whole index for items."""
+        self._items = {}
+        self._postings = defaultdict(set)
+        for item in items.values():
+            self._async_add(item)
+        self._vocabulary_dirty = True
+
+    @staticmethod
+    def _tokens(item: IndexedItem) -> set[str]:
+        """Return the tokens an item is found by."""
+        return set(tokenize(item.title)) | set(tokenize(item.context or ""))
+
+    @callback
+    def async_source_for(self, content_id: str) -> str | None:
+        """Return the source an indexed content ID belongs to."""
+        return next(
+            (source for source in APP_SOURCES if (source, content_id) in self._items),
+            None,
+        )
+
+    @callback
+    def async_search(
+        self,
+        query: str,
+        limit: int = 10,
+        source: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return the best matches for query; every query word must match."""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(
+                token for token, keys in self._postings.items() if keys
+            )
+            self._vocabulary_dirty = False
+
+        scores: dict[tuple[str, str], int] | None = None
+        for token in tokenize(query):
+            token_scores = self._match_token(token)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    key: score + token_scores[key]
+                    for key, score in scores.items()
+                    if key in token_scores
+                }
+            if not scores:
+                return []
+
+        items = [
+            (score, self._items[key])
+            for key, score in (scores or {}).items()
+            if source is None or key[0] == source
+        ]
+        items.sort(key=lambda pair: (-pair[0], not pair[1].can_play, pair[1].title))
+        return [asdict(item) for _, item in items[:limit]]
+
+    def _match_token(self, token: str) -> dict[tuple[str, str], int]:
+        """Score every item matching one query token."""
+        scores: dict[tuple[str, str], int] = {}
+
+        def _add(term: str, score: int) -> None:
+            for key in self._postings.get(term, ()):
+                scores[key] = max(scores.get(key, 0), score)
+
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, token)
+        for term in vocabulary[start:]:
+            if not term.startswith(token):
+                break
+            _add(term, _SCORE_EXACT if term == token else _SCORE_PREFIX)
+
+        if not scores:
+            for term in difflib.get_close_matches(
+                token, vocabulary, n=5, cutoff=FUZZY_CUTOFF
+            ):
+                _add(term, _SCORE_FUZZY)
+        return scores
+
+    async def async_refresh(self) -> None:
+        """
+        Rebuild the index from a crawl of each app's browse tree.
+
+        The crawl fills a fresh map that then replaces the index, so items gone
+        from an app are dropped. An app that cannot be browsed keeps what was
+        indexed for it before.
+        """
+        started = time.monotonic()
+        config = self.coordinator.config
+        items: dict[tuple[str, str], IndexedItem] = {}
+        for source, app in APP_SOURCES.items():
+            entity_id = config.get(f"{app}_entity")
+            state = self.hass.states.get(entity_id) if entity_id else None
+            crawled = (
+                None
+                if state is None or state.state == "unavailable"
+                else await self._async_crawl(source, entity_id)
+            )
+            if crawled is None:
+                crawled = {
+                    key: item for key, item in self._items.items() if key[0] == source
+                }
+            items.update(crawled)
+        self._async_replace(items)
+
+        self._last_refresh = time.time()
+        self._refresh_seconds = time.monotonic() - started
+        LOGGER.debug(
+            "Search index refreshed in %.1fs; %d items",
+            self._refresh_seconds,
+            len(self._items),
+        )
+
+    async def _async_crawl(
+        self, source: str, entity_id: str
+    ) -> dict[tuple[str, str], IndexedItem] | None:
+        """
+        Crawl one app's browse tree breadth-first, within a fixed budget.
+
+        Returns the items found, or None when the root could not be browsed.
+        """
+        items: dict[tuple[str, str], IndexedItem] = {}
+        queue: deque[tuple[dict[str, Any], int]] = deque([({}, 0)])
+        visited = 0
+        while queue and visited < MAX_CRAWL_NODES:
+            target, depth = queue.popleft()
+            visited += 1
+            try:
+                response = await self.hass.services.async_call(
+                    "media_player",
+                    "browse_media",
+                    {"entity_id": entity_id, **target},
+                    blocking=True,
+                    return_response=True,
+                )
+            except HomeAssistantError:
+                LOGGER.debug("Browse of %s %s failed", entity_id, target)
+                if depth == 0:
+                    return None
+                continue
+
+            node = response.get(entity_id) if response else None
+            if not isinstance(node, BrowseMedia | dict):
+                continue
+            listing, children = self._listing_items(source, node)
+            items.update(
+                ((item.source, item.media_content_id), item) for item in listing
+            )
+            self._prefetch.async_observe_browse(node)
+            if depth + 1 >= MAX_CRAWL_DEPTH:
+                continue
+            queue.extend(
+                (
+                    {
+                        "media_content_type": child["media_content_type"],
+                        "media_content_id": child["media_content_id"],
+                    },
+                    depth + 1,
+                )
+                for child in children
+                if child.get("can_expand") and child.get("media_content_id")
+            )
+        return items
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return index statistics, for diagnostics."""
+        return {
+            "items": len(self._items),
+            "tokens": len(self._postings),
+            "last_refresh": self._last_refresh,
+            "refresh_seconds": self._refresh_seconds,
+        }
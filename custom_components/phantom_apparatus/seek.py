@@ -0,0 +1,228 @@
+"""Last-wins seek coalescing with predicted position for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import APP_SOURCES, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from .coordinator import PhantomApparatusDataUpdateCoordinator
+    from .lounge import LoungeClient
+    from .scheduler import CommandScheduler
+
+# Quiet time before a seek is sent, so a drag collapses into one request
+SEEK_SETTLE = 0.15
+# The prediction is dropped if the app never reports a position
+RECONCILE_TIMEOUT = 10
+# Weight of the newest sample in the moving averages
+SMOOTHING = 0.2
+
+
+@dataclass
+class SeekStats:
+    """Counters and timings for seeks."""
+
+    requests: int = 0
+    sent: int = 0
+    superseded: int = 0
+    errors: int = 0
+    reconciled: int = 0
+    timed_out: int = 0
+    rtt_ms: float | None = None
+    reconcile_ms: float | None = None
+    drift_seconds: float | None = None
+
+    @staticmethod
+    def smooth(average: float | None, sample: float) -> float:
+        """Fold a sample into a moving average."""
+        return sample if average is None else average + SMOOTHING * (sample - average)
+
+
+@dataclass
+class _Prediction:
+    """Where playback should be after the latest seek."""
+
+    entity_id: str
+    position: float
+    updated_at: datetime
+    sent_at: datetime | None = None
+
+
+def _as_datetime(value: Any) -> datetime | None:
+    """Return a position timestamp as a datetime."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return dt_util.parse_datetime(value)
+    return None
+
+
+class SeekCoalescer:
+    """
+    Collapse bursts of seeks into the last one and predict the position meanwhile.
+
+    Each seek replaces the previous one: a seek still waiting to be sent is
+    dropped and one in flight is cancelled. The target position is reported right
+    away and kept until a coordinator update brings a position the app reported
+    after the seek was sent, or until the app has stayed silent for too long.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+        scheduler: CommandScheduler,
+        lounge: LoungeClient,
+    ) -> None:
+        """Initialize the coalescer."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.scheduler = scheduler
+        self.lounge = lounge
+        self.stats = SeekStats()
+        self._prediction: _Prediction | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._unsub_timeout: CALLBACK_TYPE | None = None
+
+    @callback
+    def predicted(self, entity_id: str | None) -> tuple[float, datetime] | None:
+        """Return the predicted position and its timestamp for entity_id, if any."""
+        prediction = self._prediction
+        if prediction is None or prediction.entity_id != entity_id:
+            return None
+        return prediction.position, prediction.updated_at
+
+    @callback
+    def async_request(self, entity_id: str, position: float) -> asyncio.Task[None]:
+        """Record the predicted position and schedule a seek superseding any other."""
+        self.stats.requests += 1
+        self._async_cancel_timeout()
+        self._prediction = _Prediction(entity_id, position, dt_util.utcnow())
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            self.stats.superseded += 1
+        self._task = self.hass.async_create_task(
+            self._async_send(self._prediction), eager_start=False
+        )
+        return self._task
+
+    @staticmethod
+    async def async_wait(task: asyncio.Task[None]) -> None:
+        """Wait for a requested seek; returns early if a later seek supersedes it."""
+        # Waiting on the task, rather than awaiting it, keeps a superseded seek
+        # from surfacing as a cancellation of the caller
+        await asyncio.wait([task])
+        if not task.cancelled():
+            task.result()
+
+    async def _async_send(self, prediction: _Prediction) -> None:
+        """Send one seek after the settle time."""
+        await asyncio.sleep(SEEK_SETTLE)
+        prediction.sent_at = dt_util.utcnow()
+        self._unsub_timeout = async_call_later(
+            self.hass, RECONCILE_TIMEOUT, partial(self._async_timeout, prediction)
+        )
+        started = time.monotonic()
+        self.stats.sent += 1
+        data = {"seek_position": prediction.position}
+        try:
+            if self.lounge.handles(prediction.entity_id):
+                await self.scheduler.async_run(
+                    prediction.entity_id,
+                    "media_seek",
+                    partial(self.lounge.async_command, "media_seek", data),
+                )
+            else:
+                await self.scheduler.async_call(
+                    prediction.entity_id, "media_seek", data
+                )
+        except HomeAssistantError:
+            self.stats.errors += 1
+            if self._prediction is prediction:
+                self._prediction = None
+                self._async_cancel_timeout()
+            raise
+        self.stats.rtt_ms = self.stats.smooth(
+            self.stats.rtt_ms, 1000 * (time.monotonic() - started)
+        )
+        LOGGER.debug("Seek to %s sent to %s", prediction.position, prediction.entity_id)
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Drop the prediction once the app reports a position after the seek."""
+        prediction = self._prediction
+        if prediction is None or prediction.sent_at is None:
+            return
+
+        state, attrs = self._app_state(prediction.entity_id)
+        reported_at = _as_datetime(attrs.get("media_position_updated_at"))
+        if reported_at is None or reported_at < prediction.sent_at:
+            return
+        self._prediction = None
+        self._async_cancel_timeout()
+        self.stats.reconciled += 1
+        self.stats.reconcile_ms = self.stats.smooth(
+            self.stats.reconcile_ms,
+            1000 * (dt_util.utcnow() - prediction.sent_at).total_seconds(),
+        )
+        if (reported := attrs.get("media_position")) is not None:
+            elapsed = (
+                (reported_at - prediction.updated_at).total_seconds()
+                if state == "playing"
+                else 0
+            )
+            self.stats.drift_seconds = self.stats.smooth(
+                self.stats.drift_seconds,
+                abs(reported - (prediction.position + elapsed)),
+            )
+
+    @callback
+    def _async_timeout(self, prediction: _Prediction, _now: datetime) -> None:
+        """Drop a prediction the app never reported a position for."""
+        self._unsub_timeout = None
+        if self._prediction is not prediction:
+            return
+        self._prediction = None
+        self.stats.timed_out += 1
+        # Nothing else changed, so listeners would keep showing the prediction
+        self.coordinator.async_update_listeners()
+
+    @callback
+    def _async_cancel_timeout(self) -> None:
+        """Stop waiting for the app to report a position."""
+        if self._unsub_timeout is not None:
+            self._unsub_timeout()
+            self._unsub_timeout = None
+
+    def _app_state(self, entity_id: str) -> tuple[str | None, dict[str, Any]]:
+        """Return the coordinator state and attributes of an app entity."""
+        data = self.coordinator.data or {}
+        config = self.coordinator.config
+        for app in APP_SOURCES.values():
+            if config.get(f"{app}_entity") == entity_id:
+                return data.get(f"{app}_state"), data.get(f"{app}_attributes", {})
+        return None, {}
+
+    async def async_shutdown(self) -> None:
+        """Cancel any seek in progress."""
+        self._async_cancel_timeout()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return seek statistics, for diagnostics."""
+        return asdict(self.stats)
@@ -0,0 +1,166 @@
+"""Multi-step command sequences for The Phantom Apparatus media player."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.const import CONF_TIMEOUT
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .media_player import PhantomApparatusMediaPlayer
+
+SERVICE_RUN_SEQUENCE = "run_sequence"
+
+CONF_ACTION = "action"
+CONF_DATA = "data"
+CONF_STEPS = "steps"
+CONF_WAIT_FOR = "wait_for"
+
+DEFAULT_STEP_TIMEOUT = 30
+
+# Service name -> (entity method, {service field: (method argument, validator)}),
+# with the same required fields and validators as the media_player services
+SEQUENCE_ACTIONS: dict[str, tuple[str, dict[str, tuple[str, Callable[[Any], Any]]]]] = {
+    "turn_on": ("async_turn_on", {}),
+    "turn_off": ("async_turn_off", {}),
+    "select_source": ("async_select_source", {"source": ("source", cv.string)}),
+    "volume_set": (
+        "async_set_volume_level",
+        {"volume_level": ("volume", cv.small_float)},
+    ),
+    "volume_up": ("async_volume_up", {}),
+    "volume_down": ("async_volume_down", {}),
+    "volume_mute": ("async_mute_volume", {"is_volume_muted": ("mute", cv.boolean)}),
+    "media_play": ("async_media_play", {}),
+    "media_pause": ("async_media_pause", {}),
+    "media_stop": ("async_media_stop", {}),
+    "media_next_track": ("async_media_next_track", {}),
+    "media_previous_track": ("async_media_previous_track", {}),
+    "media_seek": (
+        "async_media_seek",
+        {"seek_position": ("position", cv.positive_float)},
+    ),
+}
+
+WAIT_FOR_SCHEMA = vol.Schema(
+    {
+        vol.Optional("state"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("tv_state"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("source"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+def _validate_step_data(step: dict[str, Any]) -> dict[str, Any]:
+    """Check a step's data against the fields its action takes."""
+    _, arguments = SEQUENCE_ACTIONS[step[CONF_ACTION]]
+    schema = vol.Schema(
+        {vol.Required(field): validator for field, (_, validator) in arguments.items()}
+    )
+    try:
+        data = schema(step[CONF_DATA])
+    except vol.Invalid as err:
+        msg = f"Invalid data for {step[CONF_ACTION]}: {err}"
+        raise vol.Invalid(msg, path=[CONF_DATA]) from err
+    return {**step, CONF_DATA: data}
+
+
+STEP_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(CONF_ACTION): vol.In(list(SEQUENCE_ACTIONS)),
+            vol.Optional(CONF_DATA, default={}): dict,
+            vol.Optional(CONF_WAIT_FOR): WAIT_FOR_SCHEMA,
+            vol.Optional(CONF_TIMEOUT, default=DEFAULT_STEP_TIMEOUT): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+        }
+    ),
+    _validate_step_data,
+)
+
+RUN_SEQUENCE_SCHEMA: dict[vol.Marker, Any] = {
+    vol.Required(CONF_STEPS): vol.All(cv.ensure_list, [STEP_SCHEMA]),
+}
+
+
+def _conditions_met(
+    player: PhantomApparatusMediaPlayer,
+    wait_for: dict[str, list[str]],
+) -> bool:
+    """Return whether the player currently satisfies every wait_for condition."""
+    data = player.coordinator.data or {}
+    current = {
+        "state": player.state,
+        "tv_state": data.get("tv_state"),
+        "source": player.source,
+    }
+    return all(current[key] in values for key, values in wait_for.items())
+
+
+async def _async_run_step(
+    player: PhantomApparatusMediaPlayer,
+    index: int,
+    step: dict[str, Any],
+    started: float,
+) -> dict[str, Any]:
+    """Wait for the step's conditions, then issue its command."""
+    action = step[CONF_ACTION]
+    method_name, arguments = SEQUENCE_ACTIONS[action]
+    kwargs = {
+        argument: step[CONF_DATA][field] for field, (argument, _) in arguments.items()
+    }
+    result: dict[str, Any] = {"index": index, CONF_ACTION: action}
+
+    try:
+        async with asyncio.timeout(step[CONF_TIMEOUT]):
+            if wait_for := step.get(CONF_WAIT_FOR):
+                await player.coordinator.async_wait_for(
+                    lambda: _conditions_met(player, wait_for),
+                    step[CONF_TIMEOUT],
+                )
+            result["started"] = round(time.monotonic() - started, 3)
+            await getattr(player, method_name)(**kwargs)
+    except TimeoutError:
+        result["error"] = "timeout"
+    except HomeAssistantError as err:
+        result["error"] = str(err) or type(err).__name__
+    result["finished"] = round(time.monotonic() - started, 3)
+    result["success"] = "error" not in result
+
+    LOGGER.debug("run_sequence step finished: %s", result)
+    return result
+
+
+async def async_run_sequence(
+    player: PhantomApparatusMediaPlayer,
+    steps: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """
+    Run a list of steps against the player.
+
+    Every step starts right away and blocks only on its own wait_for conditions, so
+    independent steps overlap and dependent steps run as soon as the coordinator
+    reports the state they need. Timings are seconds since the sequence started.
+    """
+    started = time.monotonic()
+    results = await asyncio.gather(
+        *(
+            _async_run_step(player, index, step, started)
+            for index, step in enumerate(steps)
+        )
+    )
+    return {
+        CONF_STEPS: results,
+        "success": all(result["success"] for result in results),
+        "duration": round(time.monotonic() - started, 3),
+    }
@@ -0,0 +1,255 @@
+"""Domain services for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Awaitable
+from functools import wraps
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError, Unauthorized, UnknownUser
+from homeassistant.helpers import config_validation as cv
+
+from .bulk import DEFAULT_BULK_TIMEOUT, DEFAULT_MAX_CONCURRENCY, async_bulk_command
+from .const import DOMAIN
+from .profiling import async_profile
+from .sequence import SEQUENCE_ACTIONS
+from .trace import trace_path
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .data import PhantomApparatusConfigEntry
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_SOURCE = "source"
+ATTR_TRACE = "trace"
+ATTR_SPEED = "speed"
+ATTR_SECONDS = "seconds"
+ATTR_COMMAND = "command"
+ATTR_DATA = "data"
+ATTR_TIMEOUT = "timeout"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+
+SERVICE_GET_VIEWING_SESSIONS = "get_viewing_sessions"
+SERVICE_START_TRACE = "start_trace"
+SERVICE_STOP_TRACE = "stop_trace"
+SERVICE_REPLAY_TRACE = "replay_trace"
+SERVICE_PROFILE = "profile"
+SERVICE_BULK_COMMAND = "bulk_command"
+
+GET_VIEWING_SESSIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_SOURCE): cv.string,
+    }
+)
+
+TRACE_ENTRY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+REPLAY_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_TRACE): cv.string,
+        vol.Optional(ATTR_SPEED, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SECONDS, default=30): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+    }
+)
+
+BULK_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_COMMAND): vol.In(list(SEQUENCE_ACTIONS)),
+        vol.Optional(ATTR_DATA, default={}): dict,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_BULK_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=300)
+        ),
+        vol.Optional(ATTR_MAX_CONCURRENCY, default=DEFAULT_MAX_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=32)
+        ),
+    }
+)
+
+
+@callback
+def _async_get_entries(
+    hass: HomeAssistant,
+    entry_id: str | None,
+) -> list[PhantomApparatusConfigEntry]:
+    """Return the loaded entries a service call applies to."""
+    entries: list[PhantomApparatusConfigEntry] = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+        and (entry_id is None or entry.entry_id == entry_id)
+    ]
+    if entry_id is not None and not entries:
+        msg = f"Config entry {entry_id} not found or not loaded"
+        raise ServiceValidationError(msg)
+    return entries
+
+
+def _admin_only(
+    hass: HomeAssistant,
+    handler: Callable[[ServiceCall], Awaitable[ServiceResponse] | ServiceResponse],
+) -> Callable[[ServiceCall], Awaitable[ServiceResponse]]:
+    """
+    Wrap a service handler so only admin users may call it.
+
+    Performs the check of async_register_admin_service, which cannot return a
+    service response.
+    """
+
+    @wraps(handler)
+    async def _async_handle(call: ServiceCall) -> ServiceResponse:
+        if call.context.user_id:
+            user = await hass.auth.async_get_user(call.context.user_id)
+            if user is None:
+                raise UnknownUser(context=call.context)
+            if not user.is_admin:
+                raise Unauthorized(context=call.context)
+        result = handler(call)
+        if isinstance(result, Awaitable):
+            return await result
+        return result
+
+    return _async_handle
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's domain services."""
+
+    @callback
+    def async_get_viewing_sessions(call: ServiceCall) -> ServiceResponse:
+        """Report viewing sessions, optionally filtered by time window and source."""
+        sessions = []
+        watched_by_source: dict[str, int] = defaultdict(int)
+        for entry in _async_get_entries(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            for session in entry.runtime_data.sessions.async_query(
+                start=call.data.get(ATTR_START),
+                end=call.data.get(ATTR_END),
+                source=call.data.get(ATTR_SOURCE),
+            ):
+                sessions.append({**session, "entry_id": entry.entry_id})
+                watched_by_source[session["source"]] += session["watched"]
+
+        sessions.sort(key=lambda session: session["start"])
+        return {
+            "sessions": sessions,
+            "watched_by_source": dict(watched_by_source),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_VIEWING_SESSIONS,
+        async_get_viewing_sessions,
+        schema=GET_VIEWING_SESSIONS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    @callback
+    def async_start_trace(call: ServiceCall) -> ServiceResponse:
+        """Start recording the tracked entities' state changes."""
+        return {
+            entry.entry_id: {"trace": entry.runtime_data.trace.async_start().name}
+            for entry in _async_get_entries(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        }
+
+    async def async_stop_trace(call: ServiceCall) -> ServiceResponse:
+        """Stop recording and report what was captured."""
+        return {
+            entry.entry_id: summary
+            for entry in _async_get_entries(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+            if (summary := await entry.runtime_data.trace.async_stop()) is not None
+        }
+
+    async def async_replay_trace_service(call: ServiceCall) -> ServiceResponse:
+        """Replay a recorded trace and report throughput and latency."""
+        (entry,) = _async_get_entries(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+        return await entry.runtime_data.trace.async_replay(
+            trace_path(hass, call.data[ATTR_TRACE]), call.data[ATTR_SPEED]
+        )
+
+    async def async_profile_service(call: ServiceCall) -> ServiceResponse:
+        """Profile the integration's hot paths for a number of seconds."""
+        return await async_profile(hass, call.data[ATTR_SECONDS])
+
+    async def async_bulk_command_service(call: ServiceCall) -> ServiceResponse:
+        """Send one command to several apparatus entries concurrently."""
+        entries = [
+            entry
+            for entry_id in call.data.get(ATTR_CONFIG_ENTRY_ID) or [None]
+            for entry in _async_get_entries(hass, entry_id)
+        ]
+        return await async_bulk_command(
+            hass,
+            entries,
+            call.data[ATTR_COMMAND],
+            call.data[ATTR_DATA],
+            context=call.context,
+            timeout=call.data[ATTR_TIMEOUT],
+            max_concurrency=call.data[ATTR_MAX_CONCURRENCY],
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_TRACE,
+        _admin_only(hass, async_start_trace),
+        schema=TRACE_ENTRY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_TRACE,
+        _admin_only(hass, async_stop_trace),
+        schema=TRACE_ENTRY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY_TRACE,
+        _admin_only(hass, async_replay_trace_service),
+        schema=REPLAY_TRACE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _admin_only(hass, async_profile_service),
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_COMMAND,
+        async_bulk_command_service,
+        schema=BULK_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,181 @@
+"""Compact viewing-session log for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import APP_SOURCES, DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import PhantomApparatusDataUpdateCoordinator
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+# Sessions shorter than this are channel surfing, not viewing
+MIN_WATCHED_SECONDS = 10
+# Oldest sessions are dropped beyond this many entries
+MAX_SESSIONS = 5000
+
+
+class ViewingSession(TypedDict):
+    """A single stored viewing session; timestamps are epoch seconds."""
+
+    start: int
+    end: int
+    source: str
+    content_id: str | None
+    title: str | None
+    watched: int
+
+
+def _entry_store(hass: HomeAssistant, entry_id: str) -> Store[list[ViewingSession]]:
+    """Return the session store of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.sessions")
+
+
+def _timestamp(value: datetime) -> float:
+    """Return epoch seconds, reading a naive time in Home Assistant's time zone."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.get_default_time_zone())
+    return value.timestamp()
+
+
+async def async_remove_sessions(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the stored sessions of a removed config entry."""
+    await _entry_store(hass, entry_id).async_remove()
+
+
+class ViewingSessionLog:
+    """
+    Append-only log of what was watched, on which app, and for how long.
+
+    Sessions are derived from coordinator snapshots rather than recorder history, so
+    position ticks and artwork changes never reach storage.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the session log."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._store = _entry_store(hass, coordinator.config_entry.entry_id)
+        self._sessions: list[ViewingSession] = []
+        self._current: ViewingSession | None = None
+        self._playing_since: float | None = None
+        self._watched: float = 0
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load stored sessions."""
+        self._sessions = await self._store.async_load() or []
+        self._loaded = True
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Follow playback transitions in the latest coordinator snapshot."""
+        data = self.coordinator.data or {}
+        now = dt_util.utcnow().timestamp()
+
+        source = data.get("tv_attributes", {}).get("source")
+        app = APP_SOURCES.get(source) if data.get("tv_state") != "off" else None
+        app_state = data.get(f"{app}_state") if app else None
+        app_attrs = data.get(f"{app}_attributes", {}) if app else {}
+        content_id = app_attrs.get("media_content_id")
+
+        if self._current is not None and (
+            app_state not in {"playing", "paused"}
+            or self._current["source"] != source
+            or self._current["content_id"] != content_id
+        ):
+            self._async_close_session(now)
+
+        if self._current is None:
+            if app_state != "playing":
+                return
+            self._current = ViewingSession(
+                start=int(now),
+                end=int(now),
+                source=source,
+                content_id=content_id,
+                title=None,
+                watched=0,
+            )
+            self._watched = 0
+
+        # Titles often arrive after the content ID
+        if title := app_attrs.get("media_title"):
+            self._current["title"] = title
+
+        if app_state == "playing" and self._playing_since is None:
+            self._playing_since = now
+        elif app_state != "playing" and self._playing_since is not None:
+            self._watched += now - self._playing_since
+            self._playing_since = None
+
+    @callback
+    def _async_close_session(self, now: float) -> None:
+        """Finish the open session and append it if it is worth keeping."""
+        session = self._current
+        self._current = None
+        if session is None:
+            return
+
+        if self._playing_since is not None:
+            self._watched += now - self._playing_since
+            self._playing_since = None
+
+        if self._watched < MIN_WATCHED_SECONDS:
+            return
+
+        session["end"] = int(now)
+        session["watched"] = int(self._watched)
+        self._sessions.append(session)
+        del self._sessions[:-MAX_SESSIONS]
+        LOGGER.debug("Viewing session recorded: %s", session)
+        self._store.async_delay_save(lambda: self._sessions, SAVE_DELAY)
+
+    async def async_shutdown(self) -> None:
+        """Close any open session and flush the log."""
+        # Unloaded before the log was loaded; saving would wipe it
+        if not self._loaded:
+            return
+        self._async_close_session(dt_util.utcnow().timestamp())
+        await self._store.async_save(self._sessions)
+
+    @callback
+    def async_query(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        source: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return sessions overlapping the given window, oldest first.
+
+        Naive bounds, as the service's date and time selector sends them, are in
+        Home Assistant's time zone rather than the host's.
+        """
+        start_ts = _timestamp(start) if start else None
+        end_ts = _timestamp(end) if end else None
+        return [
+            {
+                **session,
+                "start": datetime.fromtimestamp(session["start"], UTC).isoformat(),
+                "end": datetime.fromtimestamp(session["end"], UTC).isoformat(),
+            }
+            for session in self._sessions
+            if (start_ts is None or session["end"] >= start_ts)
+            and (end_ts is None or session["start"] <= end_ts)
+            and (source is None or session["source"] == source)
+        ]
@@ -0,0 +1,377 @@
+"""Record and replay upstream state-change traces for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import Event, EventStateChangedData, State, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .const import DOMAIN, LOGGER
+from .coordinator import PhantomApparatusDataUpdateCoordinator
+from .freshness import FreshnessArbiter
+from .media_player import PhantomApparatusMediaPlayer
+
+if TYPE_CHECKING:
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+    from homeassistant.helpers.entity import CalculatedState
+
+    from .data import PhantomApparatusConfigEntry, PhantomApparatusData
+
+# Upstream roles, matching the "<role>_entity" config keys
+ROLES = ("tv", "jellyfin", "ghosttube")
+
+# Buffered lines written per flush
+FLUSH_EVENTS = 200
+# Recording stops by itself after this many events
+MAX_TRACE_EVENTS = 100_000
+# Replayed states are keyed by these private entity IDs, never the real upstream
+REPLAY_ENTITY_ID = "media_player.phantom_apparatus_replay_{entry_id}_{role}"
+
+
+def trace_path(hass: HomeAssistant, name: str) -> Path:
+    """Return the path of a trace file, which must live in the traces directory."""
+    if not name or Path(name).name != name:
+        msg = f"Invalid trace name {name!r}"
+        raise ServiceValidationError(msg)
+    return Path(hass.config.path(DOMAIN, "traces", name))
+
+
+def _replay_entity_id(entry_id: str, role: str) -> str:
+    """Return the private entity ID a replay keys role's states by."""
+    return REPLAY_ENTITY_ID.format(entry_id=entry_id.lower(), role=role)
+
+
+class _ReplayCoordinator(PhantomApparatusDataUpdateCoordinator):
+    """
+    A coordinator fed a trace's states directly, instead of following entities.
+
+    The states never reach the state machine, so the recorder and the logbook
+    never see a replay.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: PhantomApparatusConfigEntry) -> None:
+        """Initialize the replay coordinator."""
+        super().__init__(hass, LOGGER, config_entry=entry, name=f"{DOMAIN} replay")
+        self._states: dict[str, State] = {}
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """Return the entry configuration with the replay entities swapped in."""
+        entry_id = self.config_entry.entry_id
+        return {
+            **super().config,
+            **{f"{role}_entity": _replay_entity_id(entry_id, role) for role in ROLES},
+        }
+
+    @property
+    def tracked_entity_ids(self) -> list[str]:
+        """Return no entities; states are set by the replay instead."""
+        return []
+
+    def _get_state(self, entity_id: str) -> State | None:
+        """Return the last replayed state of an entity."""
+        return self._states.get(entity_id)
+
+    @callback
+    def async_set_state(
+        self, entity_id: str, state: str | None, attributes: dict[str, Any]
+    ) -> None:
+        """Take one replayed state, None for a removed entity, and publish it."""
+        if state is None:
+            self._states.pop(entity_id, None)
+        else:
+            self._states[entity_id] = State(entity_id, state, attributes)
+        self.async_publish()
+
+
+class _ReplayMediaPlayer(PhantomApparatusMediaPlayer):
+    """
+    A unified player over a replay coordinator.
+
+    Never added to Home Assistant. Each update calculates the state a write would
+    produce and keeps it, so the replay exercises the player without recording
+    anything.
+    """
+
+    _attr_has_entity_name = False
+    _attr_name = "Phantom Apparatus replay"
+
+    def __init__(
+        self,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+        entry: PhantomApparatusConfigEntry,
+        runtime_data: PhantomApparatusData,
+    ) -> None:
+        """Initialize the replay player."""
+        super().__init__(coordinator, entry)
+        self.hass = coordinator.hass
+        self.entity_id = _replay_entity_id(entry.entry_id, "player")
+        self._attr_unique_id = None
+        self._attr_device_info = None
+        self._replay_runtime_data = runtime_data
+        self.calculated: CalculatedState | None = None
+
+    @property
+    def _runtime_data(self) -> PhantomApparatusData:
+        """Return the entry's components, with the replay's own coordinator."""
+        return self._replay_runtime_data
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Follow the replay coordinator; returns a callable that stops."""
+        return self.coordinator.async_add_listener(self._handle_coordinator_update)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Calculate the state instead of writing it."""
+        self.calculated = self._async_calculate_state()
+
+
+class TraceRecorder:
+    """
+    Capture the tracked entities' state changes to a gzipped JSONL file.
+
+    Lines are keyed by role rather than entity ID, so a trace recorded in one
+    household replays against any entry. Each line holds the offset in seconds,
+    the role, the state and only the attributes that changed ("a") or were
+    removed ("x") since the previous line for that role.
+
+    Replays never touch the entry's upstream entities or its player, nor the state
+    machine at all. They feed a separate coordinator and unified player that exist
+    only for the replay.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PhantomApparatusDataUpdateCoordinator,
+        entry_id: str,
+    ) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.entry_id = entry_id
+        self.path: Path | None = None
+        self.events = 0
+        self._roles: dict[str, str] = {}
+        self._attributes: dict[str, dict[str, Any]] = {}
+        self._buffer: list[str] = []
+        self._started = 0.0
+        self._unsub: CALLBACK_TYPE | None = None
+        self._write_lock = asyncio.Lock()
+        self._replaying = False
+
+    @property
+    def recording(self) -> bool:
+        """Return whether a trace is being recorded."""
+        return self._unsub is not None
+
+    @callback
+    def async_start(self) -> Path:
+        """Start a new trace, beginning with a snapshot of every role."""
+        if self.recording:
+            msg = f"Already recording to {self.path}"
+            raise ServiceValidationError(msg)
+
+        config = self.coordinator.config
+        self._roles = {
+            entity_id: role
+            for role in ROLES
+            if (entity_id := config.get(f"{role}_entity"))
+        }
+        stamp = dt_util.utcnow().strftime("%Y%m%dT%H%M%S")
+        self.path = trace_path(self.hass, f"{self.entry_id}-{stamp}.jsonl.gz")
+        self.events = 0
+        self._attributes = {}
+        self._buffer = []
+        self._started = time.monotonic()
+        for entity_id in self._roles:
+            self._async_record(entity_id, self.hass.states.get(entity_id))
+        self._unsub = async_track_state_change_event(
+            self.hass, list(self._roles), self._async_state_changed
+        )
+        LOGGER.debug("Recording state-change trace to %s", self.path)
+        return self.path
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Record one state change."""
+        self._async_record(event.data["entity_id"], event.data["new_state"])
+        if self.events >= MAX_TRACE_EVENTS:
+            LOGGER.warning("Trace %s reached %d events", self.path, self.events)
+            self.hass.async_create_task(self.async_stop())
+        elif len(self._buffer) >= FLUSH_EVENTS:
+            self.hass.async_create_task(self._async_flush())
+
+    @callback
+    def _async_record(self, entity_id: str, state: State | None) -> None:
+        """Append one delta-encoded line to the buffer."""
+        role = self._roles[entity_id]
+        previous = self._attributes.get(role, {})
+        attributes = dict(state.attributes) if state else {}
+        line: dict[str, Any] = {
+            "t": round(time.monotonic() - self._started, 3),
+            "r": role,
+            "s": state.state if state else None,
+            "a": {
+                key: value
+                for key, value in attributes.items()
+                if key not in previous or previous[key] != value
+            },
+        }
+        if removed := [key for key in previous if key not in attributes]:
+            line["x"] = removed
+        self._attributes[role] = attributes
+        self._buffer.append(json_dumps(line))
+        self.events += 1
+
+    async def _async_flush(self) -> None:
+        """Append buffered lines to the trace file."""
+        async with self._write_lock:
+            if not self._buffer or self.path is None:
+                return
+            lines, self._buffer = self._buffer, []
+            await self.hass.async_add_executor_job(self._append, self.path, lines)
+
+    @staticmethod
+    def _append(path: Path, lines: list[str]) -> None:
+        """Write lines as a new gzip member; readers see one continuous stream."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "at", encoding="utf-8") as file:
+            file.writelines(f"{line}\n" for line in lines)
+
+    async def async_stop(self) -> dict[str, Any] | None:
+        """Stop recording and return a summary of the trace."""
+        if self._unsub is None:
+            return None
+        self._unsub()
+        self._unsub = None
+        await self._async_flush()
+        return {
+            "trace": self.path.name if self.path else None,
+            "events": self.events,
+            "seconds": round(time.monotonic() - self._started, 3),
+        }
+
+    async def async_replay(self, path: Path, speed: float) -> dict[str, Any]:
+        """
+        Replay a trace through a private coordinator and player; report timings.
+
+        States are written with the recorded spacing divided by speed; a speed of 0
+        replays as fast as possible. Latency is the time each write takes to pass
+        synchronously through the coordinator and the unified player.
+        """
+        if self._replaying:
+            msg = "A trace is already being replayed"
+            raise ServiceValidationError(msg)
+        try:
+            events = await self.hass.async_add_executor_job(_read_trace, path)
+        except (OSError, ValueError) as err:
+            msg = f"Unable to read trace {path.name}: {err}"
+            raise ServiceValidationError(msg) from err
+
+        entry = self.coordinator.config_entry
+        coordinator = _ReplayCoordinator(self.hass, entry)
+        freshness = FreshnessArbiter(self.hass, coordinator)
+        player = _ReplayMediaPlayer(
+            coordinator,
+            entry,
+            replace(
+                entry.runtime_data,
+                coordinator=coordinator,
+                config=coordinator.config,
+                freshness=freshness,
+            ),
+        )
+        unsub_freshness = coordinator.async_add_listener(freshness.async_handle_update)
+        unsub_player = player.async_start()
+        self._replaying = True
+        try:
+            await coordinator.async_start()
+            return await _async_replay_events(coordinator, path, events, speed)
+        finally:
+            self._replaying = False
+            unsub_player()
+            unsub_freshness()
+            await freshness.async_shutdown()
+            await coordinator.async_shutdown()
+
+
+def _read_trace(path: Path) -> list[dict[str, Any]]:
+    """Load a trace file."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [json_loads(line) for line in file if line.strip()]
+
+
+def _percentile(values: list[float], share: float) -> float:
+    """Return a nearest-rank percentile of sorted values."""
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+async def _async_replay_events(
+    coordinator: _ReplayCoordinator,
+    path: Path,
+    events: list[dict[str, Any]],
+    speed: float,
+) -> dict[str, Any]:
+    """Feed a trace's states to the replay coordinator and time each one."""
+    config = coordinator.config
+    entity_ids = {role: config.get(f"{role}_entity") for role in ROLES}
+    attributes: dict[str, dict[str, Any]] = {}
+    latencies: list[float] = []
+    skipped = 0
+    max_lag = 0.0
+
+    started = time.monotonic()
+    for event in events:
+        role = event["r"]
+        role_attributes = attributes.setdefault(role, {})
+        role_attributes.update(event.get("a", {}))
+        for key in event.get("x", []):
+            role_attributes.pop(key, None)
+        if not (entity_id := entity_ids.get(role)):
+            skipped += 1
+            continue
+
+        if speed:
+            delay = started + event["t"] / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+        else:
+            # Let other tasks run, as they would between real events
+            await asyncio.sleep(0)
+
+        begin = time.perf_counter()
+        coordinator.async_set_state(entity_id, event["s"], dict(role_attributes))
+        latencies.append(time.perf_counter() - begin)
+
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    return {
+        "trace": path.name,
+        "events": len(latencies),
+        "skipped": skipped,
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "mean": round(1000 * sum(latencies) / len(latencies), 3),
+            "p50": round(1000 * _percentile(latencies, 0.5), 3),
+            "p95": round(1000 * _percentile(latencies, 0.95), 3),
+            "max": round(1000 * latencies[-1], 3),
+        }
+        if latencies
+        else None,
+        "max_lag_ms": round(1000 * max_lag, 1),
+    }
@@ -0,0 +1,175 @@
+"""Delta-streaming websocket API for The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.components import websocket_api
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.exceptions import Unauthorized
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.components.websocket_api import ActiveConnection
+
+ATTR_MIN_INTERVAL = "min_interval"
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+class DeltaSubscription:
+    """
+    Stream one entity's state to one websocket subscriber as deltas.
+
+    The first message is a full snapshot; later ones carry only the state and
+    attributes that differ from what this subscriber last received. With a
+    minimum interval, updates arriving too soon are coalesced into a single delta
+    sent when the interval has passed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: ActiveConnection,
+        msg_id: int,
+        entity_id: str,
+        min_interval: float,
+    ) -> None:
+        """Initialize the subscription."""
+        self.hass = hass
+        self.connection = connection
+        self.msg_id = msg_id
+        self.entity_id = entity_id
+        self.min_interval = min_interval
+        self._sent_state: str | None = None
+        self._sent_attributes: dict[str, Any] = {}
+        self._last_sent = 0.0
+        self._unsub_track: CALLBACK_TYPE | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Send the snapshot and start following the entity."""
+        state = self.hass.states.get(self.entity_id)
+        self._sent_state = state.state if state else None
+        self._sent_attributes = dict(state.attributes) if state else {}
+        self._last_sent = time.monotonic()
+        self.connection.send_message(
+            websocket_api.event_message(
+                self.msg_id,
+                {
+                    "snapshot": {
+                        "state": self._sent_state,
+                        "attributes": self._sent_attributes,
+                    }
+                },
+            )
+        )
+        self._unsub_track = async_track_state_change_event(
+            self.hass, [self.entity_id], self._async_state_changed
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the entity."""
+        if self._unsub_track is not None:
+            self._unsub_track()
+            self._unsub_track = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:  # noqa: ARG002
+        """Send a delta now, or once the subscriber's interval has passed."""
+        if self._unsub_timer is not None:
+            return
+        wait = self._last_sent + self.min_interval - time.monotonic()
+        if wait > 0:
+            self._unsub_timer = async_call_later(self.hass, wait, self._async_flush)
+            return
+        self._async_send_delta(self.hass.states.get(self.entity_id))
+
+    @callback
+    def _async_flush(self, _now: Any) -> None:
+        """Send the updates coalesced while throttled."""
+        self._unsub_timer = None
+        self._async_send_delta(self.hass.states.get(self.entity_id))
+
+    @callback
+    def _async_send_delta(self, state: State | None) -> None:
+        """Send whatever changed since the last message."""
+        new_state = state.state if state else None
+        attributes = dict(state.attributes) if state else {}
+        delta: dict[str, Any] = {}
+        if new_state != self._sent_state:
+            delta["state"] = new_state
+        if changed := {
+            key: value
+            for key, value in attributes.items()
+            if key not in self._sent_attributes or self._sent_attributes[key] != value
+        }:
+            delta["changed"] = changed
+        if removed := [key for key in self._sent_attributes if key not in attributes]:
+            delta["removed"] = removed
+        if not delta:
+            return
+
+        self._sent_state = new_state
+        self._sent_attributes = attributes
+        self._last_sent = time.monotonic()
+        self.connection.send_message(websocket_api.event_message(self.msg_id, delta))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required("entity_id"): cv.entity_id,
+        vol.Optional(ATTR_MIN_INTERVAL, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to state deltas for a unified player."""
+    entity_id = msg["entity_id"]
+    if not connection.user.permissions.check_entity(entity_id, POLICY_READ):
+        raise Unauthorized(entity_id=entity_id, permission=POLICY_READ)
+    registry_entry = er.async_get(hass).async_get(entity_id)
+    if registry_entry is None or registry_entry.platform != DOMAIN:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"{entity_id} is not a {DOMAIN} entity",
+        )
+        return
+
+    subscription = DeltaSubscription(
+        hass, connection, msg["id"], entity_id, msg[ATTR_MIN_INTERVAL]
+    )
+    connection.subscriptions[msg["id"]] = subscription.async_stop
+    connection.send_result(msg["id"])
+    subscription.async_start()
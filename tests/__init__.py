@@ -0,0 +1 @@
+"""Tests for The Phantom Apparatus."""
@@ -0,0 +1,142 @@
+"""Fixtures for The Phantom Apparatus tests."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from homeassistant.components.media_player import DATA_COMPONENT
+from homeassistant.components.media_player import DOMAIN as MEDIA_PLAYER_DOMAIN
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_NAME
+from homeassistant.core import ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.phantom_apparatus.const import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.phantom_apparatus.media_player import (
+        PhantomApparatusMediaPlayer,
+    )
+
+TV = "media_player.tv"
+JELLYFIN = "media_player.jellyfin"
+GHOSTTUBE = "media_player.ghosttube"
+PLAYER = "media_player.living_room"
+
+ENTRY_DATA = {
+    CONF_NAME: "Living Room",
+    "tv_entity": TV,
+    "jellyfin_entity": JELLYFIN,
+    "ghosttube_entity": GHOSTTUBE,
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture
+def upstream(hass: HomeAssistant) -> None:
+    """Set up a TV showing an idle Jellyfin app."""
+    hass.states.async_set(TV, "on", {"source": "Jellyfin", "supported_features": 0})
+    hass.states.async_set(JELLYFIN, "idle", {})
+    hass.states.async_set(GHOSTTUBE, "idle", {})
+
+
+def mock_entry(options: dict[str, Any] | None = None, **data: Any) -> MockConfigEntry:
+    """Return an apparatus config entry following the upstream fixtures."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=data.get(CONF_NAME, ENTRY_DATA[CONF_NAME]),
+        data={**ENTRY_DATA, **data},
+        options=options or {},
+    )
+
+
+def get_player(hass: HomeAssistant) -> PhantomApparatusMediaPlayer:
+    """
+    Return the unified player entity.
+
+    Tests mocking upstream media_player services replace the services the entity
+    is reached through as well, so they call its methods directly.
+    """
+    return hass.data[DATA_COMPONENT].get_entity(PLAYER)
+
+
+def _node(
+    content_id: str, title: str, media_class: str, **extra: Any
+) -> dict[str, Any]:
+    """Return a browse node as the browse_media service responds with it."""
+    return {
+        "media_content_id": content_id,
+        "media_content_type": media_class,
+        "media_class": media_class,
+        "title": title,
+        "can_play": media_class == "episode",
+        "can_expand": media_class != "episode",
+        "thumbnail": None,
+        **extra,
+    }
+
+
+@pytest.fixture
+async def library(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    """
+    Answer browse_media for the Jellyfin entity from a two-season series.
+
+    Replaces the media_player service, so the unified player's own browse is not
+    reachable either. Returns the nodes by content ID, the root under "", for
+    tests to change.
+    """
+    assert await async_setup_component(hass, MEDIA_PLAYER_DOMAIN, {})
+    nodes = {
+        "": _node("", "Jellyfin", "directory", children=["show"]),
+        "show": _node("show", "The Show", "tv_show", children=["s1", "s2"]),
+        "s1": _node("s1", "Season 1", "season", children=["e1", "e2"]),
+        "s2": _node("s2", "Season 2", "season", children=["e3"]),
+        "e1": _node("e1", "Pilot", "episode"),
+        "e2": _node("e2", "Second Episode", "episode"),
+        "e3": _node("e3", "Homecoming", "episode"),
+    }
+
+    def _browse(call: ServiceCall) -> ServiceResponse:
+        if call.data["entity_id"] != JELLYFIN:
+            msg = f"{call.data['entity_id']} cannot be browsed"
+            raise HomeAssistantError(msg)
+        node = dict(nodes[call.data.get("media_content_id", "")])
+        node["children"] = [
+            {**nodes[child], "children": None} for child in node.get("children", [])
+        ]
+        return {call.data["entity_id"]: node}
+
+    hass.services.async_register(
+        MEDIA_PLAYER_DOMAIN,
+        "browse_media",
+        _browse,
+        supports_response=SupportsResponse.ONLY,
+    )
+    return nodes
+
+
+@pytest.fixture
+async def config_entry(
+    hass: HomeAssistant,
+    upstream: None,  # noqa: ARG001
+) -> AsyncGenerator[MockConfigEntry]:
+    """Set up an apparatus entry and unload it after the test."""
+    entry = mock_entry()
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry
+    if entry.state is ConfigEntryState.LOADED:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
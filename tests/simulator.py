@@ -0,0 +1,524 @@
+"""Simulated device farm for load-testing The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import statistics
+import time
+from abc import abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.media_player import (
+    DATA_COMPONENT,
+    BrowseMedia,
+    MediaClass,
+    MediaPlayerEntity,
+    MediaPlayerEntityFeature,
+    MediaPlayerState,
+)
+from homeassistant.components.media_player import (
+    DOMAIN as MEDIA_PLAYER_DOMAIN,
+)
+from homeassistant.config_entries import SOURCE_USER, ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, CONF_NAME
+from homeassistant.core import callback
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from custom_components.phantom_apparatus.bulk import entry_entity_id
+from custom_components.phantom_apparatus.const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+    from custom_components.phantom_apparatus.data import PhantomApparatusConfigEntry
+    from custom_components.phantom_apparatus.media_player import (
+        PhantomApparatusMediaPlayer,
+    )
+
+TV_FEATURES = (
+    MediaPlayerEntityFeature.TURN_OFF
+    | MediaPlayerEntityFeature.VOLUME_SET
+    | MediaPlayerEntityFeature.VOLUME_STEP
+    | MediaPlayerEntityFeature.VOLUME_MUTE
+    | MediaPlayerEntityFeature.SELECT_SOURCE
+    | MediaPlayerEntityFeature.PLAY
+    | MediaPlayerEntityFeature.PAUSE
+    | MediaPlayerEntityFeature.STOP
+)
+APP_FEATURES = (
+    MediaPlayerEntityFeature.PLAY
+    | MediaPlayerEntityFeature.PAUSE
+    | MediaPlayerEntityFeature.STOP
+    | MediaPlayerEntityFeature.SEEK
+    | MediaPlayerEntityFeature.BROWSE_MEDIA
+)
+SOURCES = ["Live TV", "Jellyfin", "GhostTube"]
+
+# Playing apps report their position this often, as polled integrations do
+TICK_INTERVAL = timedelta(seconds=1)
+# Event loop lag is sampled this often
+LAG_INTERVAL = 0.05
+SETUP_TIMEOUT = 30
+
+# (service, data for a round, whether the unified player confirms it)
+SCENARIO: list[
+    tuple[
+        str,
+        Callable[[int], dict[str, Any]],
+        Callable[[PhantomApparatusMediaPlayer, dict[str, Any]], bool],
+    ]
+] = [
+    (
+        "select_source",
+        lambda _: {"source": "Jellyfin"},
+        lambda player, data: player.source == data["source"],
+    ),
+    (
+        "media_play",
+        lambda _: {},
+        lambda player, _: player.state == MediaPlayerState.PLAYING,
+    ),
+    (
+        "volume_set",
+        lambda round_: {"volume_level": round((round_ % 10) / 10 + 0.05, 2)},
+        lambda player, data: player.volume_level == data["volume_level"],
+    ),
+    (
+        "media_pause",
+        lambda _: {},
+        lambda player, _: player.state == MediaPlayerState.PAUSED,
+    ),
+    (
+        "select_source",
+        lambda _: {"source": "Live TV"},
+        lambda player, data: player.source == data["source"],
+    ),
+]
+
+
+@dataclass
+class DeviceProfile:
+    """How the simulated devices behave."""
+
+    delay: float
+    failure_rate: float
+    push_delay: float
+
+
+def _percentiles(samples: list[float]) -> dict[str, Any]:
+    """Return count and p50/p95/p99/max in milliseconds."""
+    if not samples:
+        return {"count": 0}
+    ms = sorted(1000 * sample for sample in samples)
+    cuts = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else []
+    return {
+        "count": len(ms),
+        "p50_ms": round(cuts[49] if cuts else ms[0], 1),
+        "p95_ms": round(cuts[94] if cuts else ms[0], 1),
+        "p99_ms": round(cuts[98] if cuts else ms[0], 1),
+        "max_ms": round(ms[-1], 1),
+    }
+
+
+class SimulatedMediaPlayer(MediaPlayerEntity):
+    """A TV or app entity that answers after a delay and sometimes fails."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        room: SimulatedRoom,
+        entity_id: str,
+        name: str,
+        features: MediaPlayerEntityFeature,
+    ) -> None:
+        """Initialize the simulated player."""
+        self.room = room
+        self.entity_id = entity_id
+        self._attr_name = name
+        self._attr_supported_features = features
+
+    async def async_turn_on(self) -> None:
+        """Turn on."""
+        await self.room.async_respond()
+        self._attr_state = MediaPlayerState.ON
+        self.room.async_push(self)
+
+    async def async_turn_off(self) -> None:
+        """Turn off."""
+        await self.room.async_respond()
+        self._attr_state = MediaPlayerState.OFF
+        self.room.async_push(self)
+
+    async def async_select_source(self, source: str) -> None:
+        """Bring source to the foreground."""
+        await self.room.async_respond()
+        self._attr_source = source
+        self.room.async_push(self)
+
+    async def async_set_volume_level(self, volume: float) -> None:
+        """Set the volume."""
+        await self.room.async_respond()
+        self._attr_volume_level = volume
+        self.room.async_push(self)
+
+    async def async_media_play(self) -> None:
+        """Play."""
+        await self.room.async_respond()
+        self.async_set_playback(MediaPlayerState.PLAYING)
+
+    async def async_media_pause(self) -> None:
+        """Pause."""
+        await self.room.async_respond()
+        self.async_set_playback(MediaPlayerState.PAUSED)
+
+    async def async_media_stop(self) -> None:
+        """Stop."""
+        await self.room.async_respond()
+        self.async_set_playback(MediaPlayerState.IDLE)
+
+    @callback
+    @abstractmethod
+    def async_set_playback(self, state: MediaPlayerState) -> None:
+        """Apply a transport command."""
+
+
+class SimulatedTV(SimulatedMediaPlayer):
+    """A simulated TV that passes transport commands on to the foreground app."""
+
+    def __init__(self, room: SimulatedRoom, entity_id: str) -> None:
+        """Initialize the simulated TV."""
+        super().__init__(room, entity_id, "TV", TV_FEATURES)
+        self._attr_state = MediaPlayerState.ON
+        self._attr_source = SOURCES[0]
+        self._attr_source_list = SOURCES
+        self._attr_volume_level = 0.1
+
+    @callback
+    def async_set_playback(self, state: MediaPlayerState) -> None:
+        """Pass a transport command on to the foreground app, if any."""
+        if (app := self.room.apps.get(self.source)) is not None:
+            app.async_set_playback(state)
+
+
+class SimulatedApp(SimulatedMediaPlayer):
+    """A simulated app entity playing one long item."""
+
+    def __init__(self, room: SimulatedRoom, entity_id: str, name: str) -> None:
+        """Initialize the simulated app."""
+        super().__init__(room, entity_id, name, APP_FEATURES)
+        self._attr_state = MediaPlayerState.IDLE
+        self._attr_media_content_id = f"{entity_id}_item"
+        self._attr_media_title = f"{room.name} {name}"
+        self._attr_media_duration = 3600
+        self._attr_media_position = 0
+
+    @callback
+    def async_set_playback(self, state: MediaPlayerState) -> None:
+        """Change the play state."""
+        self._attr_state = state
+        self._attr_media_position_updated_at = dt_util.utcnow()
+        self.room.async_push(self)
+
+    @callback
+    def async_tick(self) -> None:
+        """Advance the position while playing, as a polled integration reports it."""
+        if self.state == MediaPlayerState.PLAYING:
+            self._attr_media_position = (self.media_position or 0) + 1
+            self._attr_media_position_updated_at = dt_util.utcnow()
+            self.async_write_ha_state()
+
+    async def async_media_seek(self, position: float) -> None:
+        """Seek."""
+        await self.room.async_respond()
+        self._attr_media_position = position
+        self._attr_media_position_updated_at = dt_util.utcnow()
+        self.room.async_push(self)
+
+    async def async_browse_media(
+        self,
+        media_content_type: str | None = None,  # noqa: ARG002
+        media_content_id: str | None = None,  # noqa: ARG002
+    ) -> BrowseMedia:
+        """Return a library holding the app's one item, for the search crawl."""
+        await self.room.async_respond()
+        item = BrowseMedia(
+            media_class=MediaClass.VIDEO,
+            media_content_id=self.media_content_id,
+            media_content_type="video",
+            title=self.media_title,
+            can_play=True,
+            can_expand=False,
+        )
+        return BrowseMedia(
+            media_class=MediaClass.DIRECTORY,
+            media_content_id="library",
+            media_content_type="library",
+            title=self.name,
+            can_play=False,
+            can_expand=True,
+            children=[item],
+        )
+
+
+class SimulatedRoom:
+    """A simulated TV with Jellyfin and GhostTube app entities."""
+
+    def __init__(self, hass: HomeAssistant, index: int, profile: DeviceProfile) -> None:
+        """Initialize the room."""
+        self.hass = hass
+        self.name = f"Simulated room {index:02}"
+        self.profile = profile
+        prefix = f"media_player.{DOMAIN}_sim_{index:02}"
+        self.tv = SimulatedTV(self, f"{prefix}_tv")
+        self.apps = {
+            source: SimulatedApp(self, f"{prefix}_{source.lower()}", source)
+            for source in ("Jellyfin", "GhostTube")
+        }
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @property
+    def entities(self) -> list[SimulatedMediaPlayer]:
+        """Return the room's entities."""
+        return [self.tv, *self.apps.values()]
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """Return config entry data following the room."""
+        return {
+            CONF_NAME: self.name,
+            "tv_entity": self.tv.entity_id,
+            "jellyfin_entity": self.apps["Jellyfin"].entity_id,
+            "ghosttube_entity": self.apps["GhostTube"].entity_id,
+        }
+
+    async def async_respond(self) -> None:
+        """Wait like a device round trip, failing at the configured rate."""
+        await asyncio.sleep(self.profile.delay * random.uniform(0.5, 1.5))  # noqa: S311
+        if random.random() < self.profile.failure_rate:  # noqa: S311
+            msg = f"Simulated failure in {self.name}"
+            raise HomeAssistantError(msg)
+
+    @callback
+    def async_push(self, player: SimulatedMediaPlayer) -> None:
+        """Publish a player's state now or after the push delay."""
+        if not self.profile.push_delay:
+            player.async_write_ha_state()
+            return
+
+        @callback
+        def _write(_now: Any) -> None:
+            if player.hass is not None:
+                player.async_write_ha_state()
+
+        delay = self.profile.push_delay * random.uniform(0.5, 1.5)  # noqa: S311
+        self._unsubs.append(async_call_later(self.hass, delay, _write))
+
+    @callback
+    def async_start_ticks(self) -> None:
+        """Report positions of playing apps every tick."""
+
+        @callback
+        def _tick(_now: Any) -> None:
+            for app in self.apps.values():
+                app.async_tick()
+
+        self._unsubs.append(async_track_time_interval(self.hass, _tick, TICK_INTERVAL))
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel pending pushes and ticks."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+
+
+@dataclass
+class SimulationResults:
+    """Per-command outcomes collected across rooms and rounds."""
+
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    timeouts: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    lag: list[float] = field(default_factory=list)
+    updates: int = 0
+
+    @callback
+    def async_count_update(self) -> None:
+        """Count a coordinator update."""
+        self.updates += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return latency and failure summaries per command."""
+        return {
+            "commands": {
+                service: {
+                    **_percentiles(self.latencies[service]),
+                    "errors": self.errors[service],
+                    "timeouts": self.timeouts[service],
+                }
+                for service in dict.fromkeys(service for service, _, _ in SCENARIO)
+            },
+            "loop_lag": _percentiles(self.lag),
+            "coordinator_updates": self.updates,
+        }
+
+
+async def _async_add_entry(
+    hass: HomeAssistant, room: SimulatedRoom
+) -> PhantomApparatusConfigEntry:
+    """Create an apparatus for room through the config flow and wait for it."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}, data=room.config
+    )
+    if result["type"] is not FlowResultType.CREATE_ENTRY:
+        msg = f"Could not create {room.name}: {result.get('reason') or result}"
+        raise HomeAssistantError(msg)
+    # The flow returns once the entry is set up; the first snapshot follows
+    entry: PhantomApparatusConfigEntry = result["result"]
+    if entry.state is not ConfigEntryState.LOADED:
+        msg = f"Could not set up {room.name}: {entry.state}"
+        raise HomeAssistantError(msg)
+    coordinator = entry.runtime_data.coordinator
+    await coordinator.async_wait_for(
+        lambda: coordinator.data is not None, SETUP_TIMEOUT
+    )
+    return entry
+
+
+async def _async_sample_lag(results: SimulationResults) -> None:
+    """Record how late the event loop wakes a sleeper, until cancelled."""
+    while True:
+        started = time.monotonic()
+        await asyncio.sleep(LAG_INTERVAL)
+        results.lag.append(max(0.0, time.monotonic() - started - LAG_INTERVAL))
+
+
+async def _async_run_room(
+    hass: HomeAssistant,
+    entry: PhantomApparatusConfigEntry,
+    round_: int,
+    results: SimulationResults,
+    timeout: float,  # noqa: ASYNC109
+) -> None:
+    """Run the scenario once against one apparatus."""
+    entity_id = entry_entity_id(hass, entry.entry_id)
+    player: PhantomApparatusMediaPlayer = hass.data[DATA_COMPONENT].get_entity(
+        entity_id
+    )
+    for service, make_data, confirmed in SCENARIO:
+        data = make_data(round_)
+        started = time.monotonic()
+        try:
+            await hass.services.async_call(
+                "media_player",
+                service,
+                {ATTR_ENTITY_ID: entity_id, **data},
+                blocking=True,
+            )
+            await entry.runtime_data.coordinator.async_wait_for(
+                partial(confirmed, player, data), timeout
+            )
+        except TimeoutError:
+            results.timeouts[service] += 1
+        except HomeAssistantError:
+            results.errors[service] += 1
+        else:
+            results.latencies[service].append(time.monotonic() - started)
+
+
+async def _async_teardown(
+    hass: HomeAssistant,
+    rooms: list[SimulatedRoom],
+    config_entries: list[PhantomApparatusConfigEntry],
+) -> None:
+    """Remove the temporary apparatus and simulated entities."""
+    for room in rooms:
+        room.async_stop()
+    for entry in config_entries:
+        await hass.config_entries.async_remove(entry.entry_id)
+    for room in rooms:
+        for entity in room.entities:
+            if entity.hass is not None:
+                await entity.async_remove()
+
+
+async def async_run_simulation(  # noqa: PLR0913
+    hass: HomeAssistant,
+    *,
+    entries: int,
+    rounds: int,
+    delay: float,
+    failure_rate: float,
+    push_delay: float,
+    timeout: float,  # noqa: ASYNC109
+) -> dict[str, Any]:
+    """
+    Drive apparatus commands against a farm of simulated TVs and apps.
+
+    Adds simulated upstream entities and one temporary apparatus per room, runs
+    the scenario in every room at once for a number of rounds, and reports
+    command-to-confirmed-state latency and event loop lag. A command is confirmed
+    when the apparatus player itself shows its effect. Everything added is removed
+    again afterwards.
+    """
+    await async_setup_component(hass, MEDIA_PLAYER_DOMAIN, {})
+    profile = DeviceProfile(delay, failure_rate, push_delay)
+    rooms = [SimulatedRoom(hass, index, profile) for index in range(1, entries + 1)]
+    config_entries: list[PhantomApparatusConfigEntry] = []
+    unsubs: list[CALLBACK_TYPE] = []
+    results = SimulationResults()
+
+    sampler = hass.async_create_background_task(
+        _async_sample_lag(results), name=f"{DOMAIN} simulation lag"
+    )
+    started = time.monotonic()
+    try:
+        await hass.data[DATA_COMPONENT].async_add_entities(
+            [entity for room in rooms for entity in room.entities]
+        )
+        for room in rooms:
+            config_entries.append(await _async_add_entry(hass, room))
+            room.async_start_ticks()
+        unsubs.extend(
+            entry.runtime_data.coordinator.async_add_listener(
+                results.async_count_update
+            )
+            for entry in config_entries
+        )
+        LOGGER.debug("Simulating %s rooms for %s rounds", entries, rounds)
+
+        results.lag.clear()
+        scenario_started = time.monotonic()
+        for round_ in range(rounds):
+            await asyncio.gather(
+                *(
+                    _async_run_room(hass, entry, round_, results, timeout)
+                    for entry in config_entries
+                )
+            )
+        scenario_elapsed = time.monotonic() - scenario_started
+    finally:
+        sampler.cancel()
+        for unsub in unsubs:
+            unsub()
+        await _async_teardown(hass, rooms, config_entries)
+
+    return {
+        "entries": entries,
+        "rounds": rounds,
+        **results.as_dict(),
+        "scenario_seconds": round(scenario_elapsed, 2),
+        "total_seconds": round(time.monotonic() - started, 2),
+    }
@@ -0,0 +1,126 @@
+"""Tests for the artwork resizing proxy."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+from typing import TYPE_CHECKING
+
+import pytest
+from PIL import Image
+
+from custom_components.phantom_apparatus.artwork import ArtworkProxy
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Awaitable, Callable
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+
+SIZE = 64
+MAX_BYTES = 1 << 20
+
+
+def _image(mode: str = "RGB", color: str = "red") -> bytes:
+    """Return a PNG larger than SIZE."""
+    output = io.BytesIO()
+    Image.new(mode, (4 * SIZE, 3 * SIZE), color).save(output, "PNG")
+    return output.getvalue()
+
+
+class FakeSource:
+    """Serves one image and counts fetches."""
+
+    def __init__(self, data: bytes) -> None:
+        """Initialize the source."""
+        self.data = data
+        self.fetches = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    def fetch(self) -> Callable[[], Awaitable[tuple[bytes | None, str | None]]]:
+        """Return a fetch callback for the proxy."""
+
+        async def _fetch() -> tuple[bytes | None, str | None]:
+            self.fetches += 1
+            await self.release.wait()
+            return self.data, "image/png"
+
+        return _fetch
+
+
+@pytest.fixture
+async def proxy(hass: HomeAssistant, tmp_path: Path) -> AsyncGenerator[ArtworkProxy]:
+    """Return a proxy caching under a temporary config directory."""
+    hass.config.config_dir = str(tmp_path)
+    artwork = ArtworkProxy(hass, "entry", MAX_BYTES)
+    yield artwork
+    await artwork.async_shutdown()
+
+
+@pytest.mark.parametrize(
+    ("mode", "content_type"), [("RGB", "image/jpeg"), ("RGBA", "image/png")]
+)
+async def test_resizes_to_fit(
+    proxy: ArtworkProxy, mode: str, content_type: str
+) -> None:
+    """Artwork is scaled into the box, keeping PNG only for transparency."""
+    source = FakeSource(_image(mode))
+    data, mime = await proxy.async_get("http://art/1", SIZE, source.fetch())
+
+    assert mime == content_type
+    with Image.open(io.BytesIO(data)) as image:
+        assert max(image.size) == SIZE
+    assert proxy.stats.source_bytes == len(source.data)
+
+
+async def test_serves_hits_from_disk(proxy: ArtworkProxy) -> None:
+    """A second request is answered from the cache without fetching."""
+    source = FakeSource(_image())
+    first = await proxy.async_get("http://art/1", SIZE, source.fetch())
+    second = await proxy.async_get("http://art/1", SIZE, source.fetch())
+
+    assert second == first
+    assert source.fetches == 1
+    assert (proxy.stats.hits, proxy.stats.misses) == (1, 1)
+
+
+async def test_concurrent_misses_share_one_resize(
+    hass: HomeAssistant, proxy: ArtworkProxy
+) -> None:
+    """Requests arriving during a resize wait for it instead of repeating it."""
+    source = FakeSource(_image())
+    source.release.clear()
+    requests = [
+        hass.async_create_task(proxy.async_get("http://art/1", SIZE, source.fetch()))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    source.release.set()
+    results = await asyncio.gather(*requests)
+
+    assert source.fetches == 1
+    assert results.count(results[0]) == len(results)
+    assert proxy.stats.misses == 1
+    assert proxy.stats.entries == 1
+    assert proxy.stats.bytes == len(results[0][0])
+
+
+async def test_evicts_least_recently_used(proxy: ArtworkProxy) -> None:
+    """Past the size bound the least recently used files are deleted."""
+    image = _image()
+    for name in ("first", "second"):
+        await proxy.async_get(f"http://art/{name}", SIZE, FakeSource(image).fetch())
+    # Touch the first image so the second is the oldest, then allow two entries
+    await proxy.async_get("http://art/first", SIZE, FakeSource(image).fetch())
+    proxy.max_bytes = proxy.stats.bytes
+
+    await proxy.async_get("http://art/third", SIZE, FakeSource(image).fetch())
+
+    assert proxy.stats.evictions == 1
+    assert proxy.stats.entries == 2
+    assert proxy.stats.bytes == proxy.max_bytes
+    assert len(list(proxy._cache_dir.iterdir())) == 2
+    source = FakeSource(image)
+    await proxy.async_get("http://art/second", SIZE, source.fetch())
+    assert source.fetches == 1
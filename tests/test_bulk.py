@@ -0,0 +1,161 @@
+"""Tests for concurrent commands across apparatus entries."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from homeassistant.const import CONF_NAME
+from homeassistant.core import Context
+from homeassistant.exceptions import HomeAssistantError, Unauthorized
+
+from custom_components.phantom_apparatus.bulk import (
+    async_bulk_command,
+    entry_entity_id,
+)
+from custom_components.phantom_apparatus.const import DOMAIN
+
+from .conftest import mock_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall
+    from pytest_homeassistant_custom_component.common import MockUser
+
+    from custom_components.phantom_apparatus.data import PhantomApparatusConfigEntry
+
+ROOMS = 6
+
+
+class FakeVolumeService:
+    """Stands in for media_player.volume_set, failing or hanging for some players."""
+
+    def __init__(self) -> None:
+        """Initialize the service."""
+        self.failing: set[str] = set()
+        self.hanging: set[str] = set()
+        self.calls: list[ServiceCall] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def async_handle(self, call: ServiceCall) -> None:
+        """Answer one call after giving the others a chance to start."""
+        entity_id = call.data["entity_id"]
+        self.calls.append(call)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if entity_id in self.hanging:
+                await asyncio.Event().wait()
+            if entity_id in self.failing:
+                msg = f"{entity_id} is not responding"
+                raise HomeAssistantError(msg)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+async def entries(
+    hass: HomeAssistant,
+    upstream: None,  # noqa: ARG001
+) -> list[PhantomApparatusConfigEntry]:
+    """Set up several apparatus."""
+    config_entries = []
+    for index in range(ROOMS):
+        entry = mock_entry(**{CONF_NAME: f"Room {index}"})
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        config_entries.append(entry)
+    await hass.async_block_till_done()
+    return config_entries
+
+
+@pytest.fixture
+def volume(
+    hass: HomeAssistant,
+    entries: list[PhantomApparatusConfigEntry],  # noqa: ARG001
+) -> FakeVolumeService:
+    """Replace volume_set on the unified players with a fake."""
+    service = FakeVolumeService()
+    hass.services.async_register("media_player", "volume_set", service.async_handle)
+    return service
+
+
+async def _async_bulk(
+    hass: HomeAssistant, context: Context | None = None, **data: Any
+) -> dict[str, Any]:
+    """Set every apparatus to half volume through the service."""
+    return await hass.services.async_call(
+        DOMAIN,
+        "bulk_command",
+        {"command": "volume_set", "data": {"volume_level": 0.5}, **data},
+        blocking=True,
+        context=context,
+        return_response=True,
+    )
+
+
+async def test_aggregates_results(
+    hass: HomeAssistant,
+    entries: list[PhantomApparatusConfigEntry],
+    volume: FakeVolumeService,
+    hass_admin_user: MockUser,
+) -> None:
+    """Every entry gets the command in the caller's context; failures are listed."""
+    failing = entry_entity_id(hass, entries[0].entry_id)
+    volume.failing.add(failing)
+    context = Context(user_id=hass_admin_user.id)
+
+    response = await _async_bulk(hass, context)
+
+    assert (response["succeeded"], response["failed"]) == (ROOMS - 1, 1)
+    result = response["results"][entries[0].entry_id]
+    assert result["result"] == "error"
+    assert failing in result["error"]
+    assert {call.context.user_id for call in volume.calls} == {hass_admin_user.id}
+
+
+async def test_times_out_each_entry(
+    hass: HomeAssistant,
+    entries: list[PhantomApparatusConfigEntry],
+    volume: FakeVolumeService,
+) -> None:
+    """An entry that never answers times out without holding up the rest."""
+    volume.hanging.add(entry_entity_id(hass, entries[-1].entry_id))
+
+    response = await async_bulk_command(
+        hass,
+        entries,
+        "volume_set",
+        {"volume_level": 0.5},
+        context=Context(),
+        timeout=0.1,
+        max_concurrency=ROOMS,
+    )
+
+    assert response["results"][entries[-1].entry_id]["result"] == "timeout"
+    assert response["succeeded"] == ROOMS - 1
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 2, ROOMS])
+@pytest.mark.usefixtures("entries")
+async def test_caps_concurrency(
+    hass: HomeAssistant, volume: FakeVolumeService, max_concurrency: int
+) -> None:
+    """No more than max_concurrency commands are in flight at once."""
+    response = await _async_bulk(hass, max_concurrency=max_concurrency)
+
+    assert response["succeeded"] == ROOMS
+    assert volume.max_in_flight == max_concurrency
+
+
+@pytest.mark.usefixtures("entries")
+async def test_needs_control_permission(
+    hass: HomeAssistant, volume: FakeVolumeService, hass_read_only_user: MockUser
+) -> None:
+    """A user who may not control the players is refused before anything is sent."""
+    with pytest.raises(Unauthorized):
+        await _async_bulk(hass, Context(user_id=hass_read_only_user.id))
+
+    assert not volume.calls
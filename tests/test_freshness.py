@@ -0,0 +1,47 @@
+"""Tests for trusting app data over the TV."""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from .conftest import JELLYFIN, PLAYER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+TITLE = "Episode 1"
+DURATION = 1800
+
+
+@pytest.mark.parametrize(
+    ("age", "title"),
+    [
+        # Well past the max age, but still inside the episode
+        (130, TITLE),
+        (DURATION + 1, None),
+    ],
+)
+@pytest.mark.usefixtures("config_entry")
+async def test_playing_app_expires_at_its_end(
+    hass: HomeAssistant, age: float, title: str | None
+) -> None:
+    """Quiet playback stays trusted until its position passes the duration."""
+    hass.states.async_set(
+        JELLYFIN,
+        "playing",
+        {
+            "media_title": TITLE,
+            "media_position": 0,
+            "media_position_updated_at": dt_util.utcnow() - timedelta(seconds=age),
+            "media_duration": DURATION,
+        },
+        timestamp=time.time() - age,
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get(PLAYER).attributes.get("media_title") == title
@@ -0,0 +1,147 @@
+"""Tests for setting up The Phantom Apparatus."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.setup import async_setup_component
+
+from custom_components.phantom_apparatus.const import DOMAIN
+from custom_components.phantom_apparatus.coordinator import (
+    PhantomApparatusDataUpdateCoordinator,
+)
+from custom_components.phantom_apparatus.sessions import ViewingSessionLog
+
+from .conftest import ENTRY_DATA, PLAYER, TV, mock_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+ENTRY_COUNT = 10
+# Per-entry stores an entry leaves behind once unloaded
+STORES = ("sessions", "prewake", "metadata")
+
+
+@pytest.mark.usefixtures("upstream")
+async def test_setup_returns_before_first_snapshot(hass: HomeAssistant) -> None:
+    """Setup does not wait for the first snapshot; the entity starts pending."""
+    started = asyncio.Event()
+    release = asyncio.Event()
+    original = PhantomApparatusDataUpdateCoordinator.async_start
+
+    async def _blocked_start(self: PhantomApparatusDataUpdateCoordinator) -> None:
+        started.set()
+        await release.wait()
+        await original(self)
+
+    entry = mock_entry()
+    entry.add_to_hass(hass)
+    with patch.object(
+        PhantomApparatusDataUpdateCoordinator, "async_start", _blocked_start
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await started.wait()
+        assert entry.state is ConfigEntryState.LOADED
+        assert hass.states.get(PLAYER).state == "unknown"
+
+        release.set()
+        await hass.async_block_till_done()
+    assert hass.states.get(PLAYER).state == "idle"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_setup_without_upstream_entities(hass: HomeAssistant) -> None:
+    """Entries set up while none of their upstream entities exist yet."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    entries = [mock_entry(name=f"Room {index}") for index in range(ENTRY_COUNT)]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert all(entry.state is ConfigEntryState.LOADED for entry in entries)
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.usefixtures("upstream")
+async def test_unload_before_start_finishes(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """An entry unloaded mid-start drops its listeners and keeps its stored data."""
+    entry = mock_entry()
+    key = f"{DOMAIN}.{entry.entry_id}.sessions"
+    stored = {"version": 1, "minor_version": 1, "key": key, "data": [{"id": 1}]}
+    hass_storage[key] = stored
+    started = asyncio.Event()
+
+    async def _blocked_load(self: ViewingSessionLog) -> None:  # noqa: ARG001
+        started.set()
+        await asyncio.Event().wait()
+
+    entry.add_to_hass(hass)
+    with patch.object(ViewingSessionLog, "async_load", _blocked_load):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await started.wait()
+        coordinator = entry.runtime_data.coordinator
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert not coordinator._listeners
+    assert hass_storage[key] == stored
+
+
+async def test_options_applied_in_place(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Changing options rewires the running entry without a reload."""
+    hass.states.async_set("media_player.other_tv", "off", {})
+    runtime_data = config_entry.runtime_data
+
+    with patch(
+        "custom_components.phantom_apparatus.async_unload_entry"
+    ) as unload_entry:
+        hass.config_entries.async_update_entry(
+            config_entry, options={**ENTRY_DATA, "tv_entity": "media_player.other_tv"}
+        )
+        await hass.async_block_till_done()
+
+    unload_entry.assert_not_called()
+    assert config_entry.runtime_data is runtime_data
+    assert hass.states.get(PLAYER).state == "off"
+
+    # Only the newly configured TV is followed
+    hass.states.async_set(TV, "off", {})
+    hass.states.async_set("media_player.other_tv", "on", {"source": "Jellyfin"})
+    await hass.async_block_till_done()
+    assert hass.states.get(PLAYER).state == "idle"
+
+
+async def test_remove_entry_deletes_storage(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    config_entry: MockConfigEntry,
+) -> None:
+    """Removing an entry deletes what it stored."""
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    keys = [f"{DOMAIN}.{config_entry.entry_id}.{name}" for name in STORES]
+    assert all(key in hass_storage for key in keys)
+    artwork = Path(hass.config.path(DOMAIN, "artwork", config_entry.entry_id))
+    await hass.async_add_executor_job(_write_cached_artwork, artwork)
+
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert not any(key in hass_storage for key in keys)
+    assert not await hass.async_add_executor_job(artwork.exists)
+
+
+def _write_cached_artwork(cache_dir: Path) -> None:
+    """Leave a file in an artwork cache directory."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache_dir / "cached.jpg").write_bytes(b"jpeg")
@@ -0,0 +1,71 @@
+"""Load tests driving many apparatus against the simulated device farm."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.phantom_apparatus.const import DOMAIN
+
+from .simulator import SCENARIO, async_run_simulation
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# A few dozen rooms at once, still quick enough for the suite; raise them locally
+# for a real load run
+ENTRIES = 32
+ROUNDS = 3
+DELAY = 0.01
+PUSH_DELAY = 0.02
+TIMEOUT = 5
+# Slowest any one room may see a command confirmed, or the loop wake a sleeper;
+# a device round trip here is tens of milliseconds
+LATENCY_BUDGET = 2
+# Coordinator updates per command sent; more means updates are piling up
+UPDATES_PER_COMMAND = 3
+
+
+@pytest.mark.parametrize(("failure_rate", "succeeded"), [(0, True), (1, False)])
+async def test_simulated_farm(
+    hass: HomeAssistant, failure_rate: float, *, succeeded: bool
+) -> None:
+    """
+    Every scenario command is confirmed, or counted as failed, in every room.
+
+    Confirmation must stay within the latency budget for every room, not just on
+    average, and the event loop must keep up while all of them run.
+    """
+    results = await async_run_simulation(
+        hass,
+        entries=ENTRIES,
+        rounds=ROUNDS,
+        delay=DELAY,
+        failure_rate=failure_rate,
+        push_delay=PUSH_DELAY,
+        timeout=TIMEOUT,
+    )
+
+    for service, stats in results["commands"].items():
+        runs = ENTRIES * ROUNDS * sum(command == service for command, _, _ in SCENARIO)
+        assert stats["timeouts"] == 0
+        if succeeded:
+            assert stats["count"] == runs
+            assert stats["errors"] == 0
+            assert stats["max_ms"] < 1000 * LATENCY_BUDGET
+        else:
+            assert stats["count"] == 0
+            assert stats["errors"] == runs
+    assert results["loop_lag"]["count"] > 0
+    assert results["loop_lag"]["max_ms"] < 1000 * LATENCY_BUDGET
+    commands = ENTRIES * ROUNDS * len(SCENARIO)
+    assert results["coordinator_updates"] <= UPDATES_PER_COMMAND * commands
+
+    # Everything the run added is gone again
+    assert not hass.config_entries.async_entries(DOMAIN)
+    assert not [
+        entity_id
+        for entity_id in hass.states.async_entity_ids("media_player")
+        if entity_id.startswith(f"media_player.{DOMAIN}_sim")
+    ]
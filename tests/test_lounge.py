@@ -0,0 +1,246 @@
+"""Tests for the YouTube lounge channel, against a fake lounge server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from homeassistant.components.diagnostics import REDACTED
+
+from custom_components.phantom_apparatus.const import (
+    CONF_LOUNGE_SCREEN_ID,
+    CONF_LOUNGE_URL,
+)
+from custom_components.phantom_apparatus.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+from .conftest import mock_entry
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable
+
+    from homeassistant.core import HomeAssistant
+    from pytest_aiohttp import AiohttpServer
+
+    from custom_components.phantom_apparatus.lounge import LoungeClient
+
+SCREEN_ID = "screen-1"
+WAIT_TIMEOUT = 5
+
+
+def _frame(payload: str) -> str:
+    """Return payload as a length-prefixed bind response chunk."""
+    return f"{len(payload)}\n{payload}"
+
+
+def _chunk(*events: list[Any]) -> str:
+    """Return a bind response chunk carrying events."""
+    return _frame(json.dumps(list(events)))
+
+
+class FakeLoungeServer:
+    """Pairs one screen and streams events pushed by the test."""
+
+    def __init__(self) -> None:
+        """Initialize the server state."""
+        self.streams: list[asyncio.Queue[str | None]] = []
+        self.polling = asyncio.Event()
+        self.commands: list[str] = []
+        self.next_id = 0
+        self.url = ""
+        self.app = web.Application()
+        self.app.router.add_post("/pairing/get_lounge_token_batch", self._pair)
+        self.app.router.add_post("/bc/bind", self._bind)
+        self.app.router.add_get("/bc/bind", self._poll)
+
+    def event(self, name: str, *args: Any) -> list[Any]:
+        """Return a numbered event."""
+        self.next_id += 1
+        return [self.next_id, [name, *args]]
+
+    def push(self, text: str) -> None:
+        """Stream text on the newest long poll."""
+        self.streams[-1].put_nowait(text)
+
+    async def _pair(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        token = "lounge-token" if data["screen_ids"] == SCREEN_ID else None
+        return web.json_response({"screens": [{"loungeToken": token}]})
+
+    async def _bind(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        if command := data.get("req0__sc"):
+            self.commands.append(command)
+            return web.Response(text="")
+        return web.Response(
+            text=_chunk(self.event("c", "sid"), self.event("S", "gsessionid"))
+        )
+
+    async def _poll(self, request: web.Request) -> web.StreamResponse:
+        stream: asyncio.Queue[str | None] = asyncio.Queue()
+        self.streams.append(stream)
+        self.polling.set()
+        response = web.StreamResponse()
+        await response.prepare(request)
+        while (text := await stream.get()) is not None:
+            await response.write(text.encode())
+        return response
+
+
+@pytest.fixture
+async def server(
+    socket_enabled: None,  # noqa: ARG001
+    aiohttp_server: AiohttpServer,
+) -> AsyncGenerator[FakeLoungeServer]:
+    """Run a fake lounge server."""
+    fake = FakeLoungeServer()
+    test_server = await aiohttp_server(fake.app)
+    fake.url = str(test_server.make_url(""))
+    yield fake
+    for stream in fake.streams:
+        stream.put_nowait(None)
+
+
+@pytest.fixture
+async def lounge(
+    hass: HomeAssistant,
+    upstream: None,  # noqa: ARG001
+    server: FakeLoungeServer,
+) -> AsyncGenerator[LoungeClient]:
+    """Set up an entry paired with the fake server, reconnecting at once."""
+    entry = mock_entry(
+        options={CONF_LOUNGE_SCREEN_ID: SCREEN_ID, CONF_LOUNGE_URL: server.url}
+    )
+    entry.add_to_hass(hass)
+    with patch("custom_components.phantom_apparatus.lounge.RECONNECT_DELAYS", (0,)):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        yield entry.runtime_data.lounge
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def _async_wait_for(lounge: LoungeClient, predicate: Callable[[], bool]) -> None:
+    """Wait for a coordinator snapshot in which predicate holds."""
+    await lounge.coordinator.async_wait_for(predicate, WAIT_TIMEOUT)
+
+
+async def test_pairs_and_follows_events(
+    server: FakeLoungeServer, lounge: LoungeClient
+) -> None:
+    """Pushed now-playing events are laid over the GhostTube entity."""
+    async with asyncio.timeout(WAIT_TIMEOUT):
+        await server.polling.wait()
+    server.push(
+        _chunk(
+            server.event(
+                "nowPlaying",
+                {"videoId": "video-1", "state": "1", "currentTime": "12.5"},
+            )
+        )
+    )
+    await _async_wait_for(
+        lounge,
+        lambda: lounge.coordinator.data.get("ghosttube_attributes", {}).get(
+            "media_content_id"
+        )
+        == "video-1",
+    )
+    data = lounge.coordinator.data
+    assert data["ghosttube_state"] == "playing"
+    assert data["ghosttube_attributes"]["media_position"] == 12.5
+
+    await lounge.async_command("media_pause", {})
+    assert server.commands == ["pause"]
+
+
+@pytest.mark.parametrize(
+    "malformed",
+    [
+        "not a length\n",
+        _frame("not json"),
+        _frame("[[1, 2]]"),
+        _frame('[["one", ["c", "sid"]]]'),
+    ],
+)
+async def test_reconnects_after_malformed_chunk(
+    server: FakeLoungeServer, lounge: LoungeClient, malformed: str
+) -> None:
+    """A malformed response drops the session, which is then bound again."""
+    async with asyncio.timeout(WAIT_TIMEOUT):
+        await server.polling.wait()
+    server.push(malformed)
+    await _async_wait_for(
+        lounge,
+        lambda: lounge.stats.disconnects == 1 and lounge.stats.connects == 2,
+    )
+    assert lounge.connected
+
+
+async def test_diagnostics_redact_screen_id(
+    hass: HomeAssistant, lounge: LoungeClient
+) -> None:
+    """The screen ID, enough to control the app, stays out of diagnostics."""
+    diagnostics = await async_get_config_entry_diagnostics(
+        hass, lounge.coordinator.config_entry
+    )
+    assert diagnostics["config"][CONF_LOUNGE_SCREEN_ID] == REDACTED
+
+
+async def test_queue_update_keeps_position_time(
+    server: FakeLoungeServer, lounge: LoungeClient
+) -> None:
+    """Only a reported position moves media_position_updated_at."""
+    async with asyncio.timeout(WAIT_TIMEOUT):
+        await server.polling.wait()
+    server.push(
+        _chunk(
+            server.event(
+                "nowPlaying",
+                {"videoId": "video-1", "state": "1", "currentTime": "12.5"},
+            )
+        )
+    )
+    await _async_wait_for(
+        lounge,
+        lambda: "media_position"
+        in lounge.coordinator.data.get("ghosttube_attributes", {}),
+    )
+    position_at = lounge.coordinator.data["ghosttube_attributes"][
+        "media_position_updated_at"
+    ]
+
+    server.push(_chunk(server.event("playlistModified", {"videoIds": "video-2"})))
+    await _async_wait_for(
+        lounge, lambda: lounge.coordinator.data.get("ghosttube_queue") == ["video-2"]
+    )
+
+    attributes = lounge.coordinator.data["ghosttube_attributes"]
+    assert attributes["media_position_updated_at"] == position_at
+
+
+@pytest.mark.parametrize(("stable_after", "failures"), [(60, 3), (0, 1)])
+async def test_backoff_resets_after_stable_connection(
+    server: FakeLoungeServer, lounge: LoungeClient, stable_after: int, failures: int
+) -> None:
+    """Sessions dropped soon after binding keep backing off."""
+    with patch(
+        "custom_components.phantom_apparatus.lounge.STABLE_CONNECTION", stable_after
+    ):
+        for drops in range(1, 4):
+            async with asyncio.timeout(WAIT_TIMEOUT):
+                await server.polling.wait()
+            server.polling.clear()
+            server.push("not a length\n")
+            await _async_wait_for(
+                lounge,
+                lambda drops=drops: lounge.stats.disconnects == drops
+                and lounge.connected,
+            )
+
+    assert lounge._failures == failures
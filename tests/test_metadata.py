@@ -0,0 +1,50 @@
+"""Tests for the content-id metadata cache."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from .conftest import JELLYFIN, PLAYER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+EPISODE = {
+    "media_content_id": "episode-1",
+    "media_title": "Episode 1",
+    "media_duration": 1800,
+    "entity_picture": "/api/media_player_proxy/media_player.jellyfin?token=old",
+}
+
+
+async def _async_play(hass: HomeAssistant, attributes: dict[str, Any]) -> None:
+    """Report attributes for what Jellyfin is playing."""
+    hass.states.async_set(JELLYFIN, "playing", attributes)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.usefixtures("upstream")
+async def test_cached_metadata_fills_in(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """A returning item shows its remembered title, but not stale artwork."""
+    await _async_play(hass, EPISODE)
+    await _async_play(hass, {"media_content_id": "episode-2"})
+    stats = config_entry.runtime_data.metadata.stats
+    hits = stats.hits
+
+    await _async_play(hass, {"media_content_id": "episode-1"})
+    state = hass.states.get(PLAYER)
+    assert state.attributes["media_title"] == "Episode 1"
+    assert state.attributes["media_duration"] == 1800
+    assert "token=old" not in (state.attributes.get("entity_picture") or "")
+
+    # Position ticks for the same item ask again without counting again
+    for position in range(1, 4):
+        await _async_play(
+            hass, {"media_content_id": "episode-1", "media_position": position}
+        )
+    assert stats.hits == hits + 2
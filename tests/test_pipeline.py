@@ -0,0 +1,92 @@
+"""Tests for the launch-and-deep-link play_media pipeline."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import async_mock_service
+
+from .conftest import JELLYFIN, TV, get_player
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+JELLYFIN_ID = "0123456789abcdef0123456789abcdef"
+FIRST_FRAME_TASK = "phantom_apparatus play_media first frame"
+
+
+def _first_frame_tasks(entry: MockConfigEntry) -> set[asyncio.Task]:
+    """Return the entry's first-frame measurements."""
+    return {
+        task for task in entry._background_tasks if task.get_name() == FIRST_FRAME_TASK
+    }
+
+
+@pytest.mark.parametrize(
+    ("media_type", "media_id", "source"),
+    [
+        ("url", "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "GhostTube"),
+        ("url", "https://youtu.be/dQw4w9WgXcQ", "GhostTube"),
+        ("url", "youtube.com/shorts/dQw4w9WgXcQ", "GhostTube"),
+        ("youtube", "dQw4w9WgXcQ", "GhostTube"),
+        ("video", JELLYFIN_ID, "Jellyfin"),
+        # Eleven characters, but no sign of YouTube: the foreground app plays it
+        ("video", "episode_123", "Jellyfin"),
+        ("url", "https://example.com/youtube.com/watch?v=1", "Jellyfin"),
+    ],
+)
+async def test_resolves_source(
+    config_entry: MockConfigEntry, media_type: str, media_id: str, source: str
+) -> None:
+    """Only YouTube links and media types are sent to GhostTube."""
+    pipeline = config_entry.runtime_data.play_media
+    assert pipeline.resolve_source(media_type, media_id) == source
+
+
+async def test_unknown_media_outside_an_app(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Media no app claims is rejected when no app is in the foreground."""
+    hass.states.async_set(TV, "on", {"source": "HDMI 1"})
+    await hass.async_block_till_done()
+
+    with pytest.raises(ServiceValidationError):
+        config_entry.runtime_data.play_media.resolve_source("video", "episode_123")
+
+
+async def test_measures_first_frame(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """The play request is handed over and playback timed in the background."""
+    calls = async_mock_service(hass, "media_player", "play_media")
+    pipeline = config_entry.runtime_data.play_media
+
+    await pipeline.async_play(get_player(hass), "video", JELLYFIN_ID)
+
+    assert calls[0].data["media_content_id"] == JELLYFIN_ID
+    assert _first_frame_tasks(config_entry)
+    hass.states.async_set(JELLYFIN, "playing", {"media_content_id": JELLYFIN_ID})
+    await hass.async_block_till_done(wait_background_tasks=True)
+    run = pipeline.as_dict()["runs"][-1]
+    assert run["playing"] >= run["dispatched"]
+
+
+async def test_unload_stops_first_frame_wait(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Unloading the entry cancels a first-frame measurement still waiting."""
+    async_mock_service(hass, "media_player", "play_media")
+    pipeline = config_entry.runtime_data.play_media
+    await pipeline.async_play(get_player(hass), "video", JELLYFIN_ID)
+    tasks = _first_frame_tasks(config_entry)
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert tasks
+    assert all(task.cancelled() for task in tasks)
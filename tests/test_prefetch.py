@@ -0,0 +1,76 @@
+"""Tests for next-up prediction."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from .conftest import JELLYFIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+def _play(hass: HomeAssistant, content_id: str, season: Any, episode: Any) -> None:
+    """Show Jellyfin playing an episode of the library's series."""
+    hass.states.async_set(
+        JELLYFIN,
+        "playing",
+        {
+            "media_content_id": content_id,
+            "media_series_title": "The Show",
+            "media_season": season,
+            "media_episode": episode,
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    ("playing", "predicted"),
+    [
+        (("e1", 1, 1), "e2"),
+        # The last episode of a season is followed by the next season
+        (("e2", 1, 2), "e3"),
+        # Not in any crawled listing, so placed by its number
+        (("unlisted", "1", "1"), "e2"),
+        (("e3", 2, 1), None),
+    ],
+)
+async def test_predicts_next_episode_from_crawl(
+    hass: HomeAssistant,
+    library: dict[str, dict[str, Any]],
+    config_entry: MockConfigEntry,
+    playing: tuple[str, Any, Any],
+    predicted: str | None,
+) -> None:
+    """The background crawl's season listings place the next episode."""
+    await hass.async_block_till_done(wait_background_tasks=True)
+    _play(hass, *playing)
+    await hass.async_block_till_done()
+
+    prefetch = config_entry.runtime_data.prefetch
+    assert prefetch.as_dict()["predicted"] == predicted
+    if predicted is not None:
+        assert (
+            prefetch.metadata[predicted]["media_title"] == library[predicted]["title"]
+        )
+
+
+@pytest.mark.usefixtures("library")
+async def test_scores_predictions(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Each transition counts as a hit or a miss of the last prediction."""
+    await hass.async_block_till_done(wait_background_tasks=True)
+    prefetch = config_entry.runtime_data.prefetch
+    _play(hass, "e1", 1, 1)
+    await hass.async_block_till_done()
+    _play(hass, "e2", 1, 2)
+    await hass.async_block_till_done()
+    _play(hass, "e1", 1, 1)
+    await hass.async_block_till_done()
+
+    assert (prefetch.stats.hits, prefetch.stats.misses) == (1, 1)
+    assert prefetch.as_dict()["hit_rate"] == 0.5
@@ -0,0 +1,111 @@
+"""Tests for usage-learned TV pre-waking."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.phantom_apparatus.const import (
+    WAKE_SERVICE,
+    WAKE_SERVICE_DOMAIN,
+)
+
+from .conftest import GHOSTTUBE, JELLYFIN, TV
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.phantom_apparatus.prewake import PreWakeScheduler
+
+
+@pytest.fixture(autouse=True)
+def tv_off(hass: HomeAssistant, upstream: None) -> None:  # noqa: ARG001
+    """Start with the TV off and Jellyfin left paused from earlier."""
+    hass.states.async_set(TV, "off", {"source": "Jellyfin", "supported_features": 0})
+    hass.states.async_set(JELLYFIN, "paused", {})
+
+
+@pytest.fixture
+def turn_off_calls(hass: HomeAssistant) -> list[ServiceCall]:
+    """Mock the wake and turn_off services."""
+    async_mock_service(hass, WAKE_SERVICE_DOMAIN, WAKE_SERVICE)
+    return async_mock_service(hass, "media_player", "turn_off")
+
+
+async def _async_prewake(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> PreWakeScheduler:
+    """Pre-wake the TV and bring it on."""
+    prewake = entry.runtime_data.prewake
+    prewake._async_prewake(dt_util.utcnow(), "test")
+    await hass.async_block_till_done()
+    hass.states.async_set(TV, "on", {"source": "Jellyfin", "supported_features": 0})
+    await hass.async_block_till_done()
+    return prewake
+
+
+@pytest.mark.usefixtures("turn_off_calls")
+async def test_hit_needs_the_shown_app_to_start(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Only new use of the app on screen scores a pre-wake as a hit."""
+    prewake = await _async_prewake(hass, config_entry)
+    assert prewake.stats.hits == 0
+
+    hass.states.async_set(GHOSTTUBE, "playing", {})
+    await hass.async_block_till_done()
+    assert prewake.stats.hits == 0
+
+    hass.states.async_set(JELLYFIN, "playing", {})
+    await hass.async_block_till_done()
+    assert prewake.stats.hits == 1
+    assert prewake.stats.learned == 1
+
+
+@pytest.mark.parametrize(("source", "turned_off"), [("Jellyfin", 1), ("HDMI 1", 0)])
+async def test_miss_keeps_a_used_tv_on(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    turn_off_calls: list[ServiceCall],
+    source: str,
+    turned_off: int,
+) -> None:
+    """An unused pre-wake turns the TV off, unless someone changed it since."""
+    prewake = await _async_prewake(hass, config_entry)
+    hass.states.async_set(TV, "on", {"source": source, "supported_features": 0})
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert prewake.stats.misses == 1
+    assert prewake.stats.turned_off == turned_off
+    assert len(turn_off_calls) == turned_off
+
+
+async def test_failed_turn_off_is_logged(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """A TV refusing to turn off is counted and logged, not left unhandled."""
+    async_mock_service(hass, WAKE_SERVICE_DOMAIN, WAKE_SERVICE)
+    async_mock_service(
+        hass, "media_player", "turn_off", raise_exception=HomeAssistantError("Busy")
+    )
+    prewake = await _async_prewake(hass, config_entry)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert prewake.stats.turned_off == 0
+    assert prewake.stats.errors == 1
+    assert "Turning the TV off after a pre-wake failed" in caplog.text
@@ -0,0 +1,55 @@
+"""Tests for the profile service."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.core import Context
+from homeassistant.exceptions import Unauthorized
+
+from custom_components.phantom_apparatus.const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.auth.models import User
+    from homeassistant.core import HomeAssistant
+
+
+def _remove_profile(path: Path) -> None:
+    """Delete a profile dump and its summary."""
+    path.unlink()
+    path.with_suffix(".txt").unlink(missing_ok=True)
+
+
+@pytest.mark.usefixtures("config_entry")
+async def test_profile(hass: HomeAssistant, hass_admin_user: User) -> None:
+    """Admins get a profile dump of the event loop."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        "profile",
+        {"seconds": 1},
+        blocking=True,
+        context=Context(user_id=hass_admin_user.id),
+        return_response=True,
+    )
+
+    path = Path(response["profile"])
+    assert await hass.async_add_executor_job(path.exists)
+    await hass.async_add_executor_job(_remove_profile, path)
+
+
+@pytest.mark.usefixtures("config_entry")
+async def test_profile_needs_admin(
+    hass: HomeAssistant, hass_read_only_user: User
+) -> None:
+    """Non-admin users cannot profile the event loop."""
+    with pytest.raises(Unauthorized):
+        await hass.services.async_call(
+            DOMAIN,
+            "profile",
+            {"seconds": 1},
+            blocking=True,
+            context=Context(user_id=hass_read_only_user.id),
+            return_response=True,
+        )
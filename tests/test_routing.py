@@ -0,0 +1,107 @@
+"""Tests for latency-aware transport routing."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from homeassistant.components.media_player import (
+    DOMAIN as MEDIA_PLAYER_DOMAIN,
+)
+from homeassistant.components.media_player import MediaPlayerEntityFeature
+from homeassistant.const import SERVICE_MEDIA_NEXT_TRACK
+from homeassistant.exceptions import HomeAssistantError, ServiceNotSupported
+
+from .conftest import JELLYFIN, PLAYER, TV, get_player
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+APP_FEATURES = (
+    MediaPlayerEntityFeature.PAUSE
+    | MediaPlayerEntityFeature.NEXT_TRACK
+    | MediaPlayerEntityFeature.PREVIOUS_TRACK
+)
+
+
+@pytest.fixture(autouse=True)
+def playing(hass: HomeAssistant, upstream: None) -> None:  # noqa: ARG001
+    """Play an episode in Jellyfin."""
+    hass.states.async_set(
+        JELLYFIN,
+        "playing",
+        {"supported_features": APP_FEATURES, "media_content_id": "episode-1"},
+    )
+
+
+@pytest.fixture(autouse=True)
+def short_confirm_timeout() -> None:
+    """Give up on confirmation quickly."""
+    with patch("custom_components.phantom_apparatus.media_player.CONFIRM_TIMEOUT", 0.1):
+        yield
+
+
+async def test_route_counts_only_once_the_effect_shows(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """A target that accepts a command but does nothing is not a success."""
+    targets: list[str] = []
+
+    async def _pause(call: ServiceCall) -> None:
+        targets.append(call.data["entity_id"])
+        if call.data["entity_id"] == JELLYFIN:
+            hass.states.async_set(
+                JELLYFIN, "paused", hass.states.get(JELLYFIN).attributes
+            )
+
+    hass.services.async_register("media_player", "media_pause", _pause)
+
+    await get_player(hass).async_media_pause()
+
+    assert targets == [TV, JELLYFIN]
+    assert hass.states.get(PLAYER).state == "paused"
+    estimates = config_entry.runtime_data.router.as_dict()
+    assert estimates["Jellyfin/media_pause/tv"]["failures"] == 1
+    assert estimates["Jellyfin/media_pause/app"]["failures"] == 0
+    assert estimates["Jellyfin/media_pause/app"]["latency"] is not None
+
+
+@pytest.mark.usefixtures("config_entry")
+async def test_failed_track_change_does_not_fall_back(hass: HomeAssistant) -> None:
+    """A track change that may have been delivered is not sent again."""
+    targets: list[str] = []
+
+    async def _next(call: ServiceCall) -> None:
+        targets.append(call.data["entity_id"])
+        msg = "Connection reset"
+        raise HomeAssistantError(msg)
+
+    hass.services.async_register(MEDIA_PLAYER_DOMAIN, SERVICE_MEDIA_NEXT_TRACK, _next)
+
+    with pytest.raises(HomeAssistantError):
+        await get_player(hass).async_media_next_track()
+    assert targets == [TV]
+
+
+@pytest.mark.usefixtures("config_entry")
+async def test_undelivered_track_change_falls_back(hass: HomeAssistant) -> None:
+    """A track change a target cannot take goes to the next target."""
+    targets: list[str] = []
+
+    async def _next(call: ServiceCall) -> None:
+        targets.append(call.data["entity_id"])
+        if call.data["entity_id"] == TV:
+            raise ServiceNotSupported(MEDIA_PLAYER_DOMAIN, SERVICE_MEDIA_NEXT_TRACK, TV)
+        hass.states.async_set(
+            JELLYFIN,
+            "playing",
+            {"supported_features": APP_FEATURES, "media_content_id": "episode-2"},
+        )
+
+    hass.services.async_register(MEDIA_PLAYER_DOMAIN, SERVICE_MEDIA_NEXT_TRACK, _next)
+
+    await get_player(hass).async_media_next_track()
+    assert targets == [TV, JELLYFIN]
+    assert hass.states.get(PLAYER).attributes["media_content_id"] == "episode-2"
@@ -0,0 +1,89 @@
+"""Tests for the per-device command lanes."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.phantom_apparatus.scheduler import (
+    MAX_QUEUE_DEPTH,
+    CommandScheduler,
+)
+
+from .conftest import TV
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+BACKPRESSURE_TIMEOUT = 0.1
+
+
+@pytest.fixture(autouse=True)
+def short_backpressure_timeout() -> None:
+    """Reject commands waiting for room quickly."""
+    with patch(
+        "custom_components.phantom_apparatus.scheduler.BACKPRESSURE_TIMEOUT",
+        BACKPRESSURE_TIMEOUT,
+    ):
+        yield
+
+
+async def _async_fill_lane(
+    hass: HomeAssistant, scheduler: CommandScheduler, release: asyncio.Event
+) -> tuple[list[asyncio.Task[bool]], asyncio.Task[bool]]:
+    """Block the lane, fill its queue and return the callers plus one waiting."""
+
+    async def _blocked() -> None:
+        await release.wait()
+
+    async def _noop() -> None:
+        pass
+
+    running = hass.async_create_task(scheduler.async_run(TV, "volume_up", _blocked))
+    await asyncio.sleep(0)
+    queued = [
+        hass.async_create_task(scheduler.async_run(TV, "volume_up", _noop))
+        for _ in range(MAX_QUEUE_DEPTH)
+    ]
+    waiting = hass.async_create_task(scheduler.async_run(TV, "volume_up", _noop))
+    await asyncio.sleep(0)
+    assert scheduler.as_dict()[TV]["depth"] == MAX_QUEUE_DEPTH
+    return [running, *queued], waiting
+
+
+async def test_abandoned_command_makes_room(hass: HomeAssistant) -> None:
+    """A caller waiting for room gets it as soon as a queued caller gives up."""
+    scheduler = CommandScheduler(hass)
+    release = asyncio.Event()
+    callers, waiting = await _async_fill_lane(hass, scheduler, release)
+
+    callers[-1].cancel()
+    # Past the point where a caller left waiting would have been rejected
+    await asyncio.sleep(2 * BACKPRESSURE_TIMEOUT)
+
+    release.set()
+    assert await waiting
+    await asyncio.gather(*callers, return_exceptions=True)
+    await scheduler.async_shutdown()
+
+
+async def test_superseded_commands_make_room(hass: HomeAssistant) -> None:
+    """A turn_off dropping queued commands wakes callers waiting for room."""
+    scheduler = CommandScheduler(hass)
+    release = asyncio.Event()
+    callers, waiting = await _async_fill_lane(hass, scheduler, release)
+
+    async def _noop() -> None:
+        pass
+
+    turn_off = hass.async_create_task(scheduler.async_run(TV, "turn_off", _noop))
+    await asyncio.sleep(2 * BACKPRESSURE_TIMEOUT)
+
+    release.set()
+    assert await turn_off
+    assert await waiting
+    assert not any(await asyncio.gather(*callers[1:]))
+    await scheduler.async_shutdown()
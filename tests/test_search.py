@@ -0,0 +1,78 @@
+"""Tests for the local media search index."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from custom_components.phantom_apparatus.const import DOMAIN
+
+from .conftest import JELLYFIN, PLAYER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+async def _async_search(hass: HomeAssistant, query: str) -> list[str]:
+    """Return the content IDs the search service finds for query."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        "search",
+        {"entity_id": PLAYER, "query": query},
+        blocking=True,
+        return_response=True,
+    )
+    return [result["media_content_id"] for result in response[PLAYER]["results"]]
+
+
+@pytest.mark.parametrize(
+    ("query", "found"),
+    [
+        ("homecoming", ["e3"]),
+        ("HOMEC", ["e3"]),
+        # Fuzzy
+        ("pilto", ["e1"]),
+        # By the listing an item is in
+        ("season 1", ["e1", "e2", "s1"]),
+        ("season 1 pilot", ["e1"]),
+        ("nothing", []),
+    ],
+)
+@pytest.mark.usefixtures("library", "config_entry")
+async def test_finds_crawled_items(
+    hass: HomeAssistant, query: str, found: list[str]
+) -> None:
+    """Exact, prefix and fuzzy matches come from the background crawl."""
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert sorted(await _async_search(hass, query)) == found
+
+
+async def test_refresh_drops_removed_items(
+    hass: HomeAssistant,
+    library: dict[str, dict[str, Any]],
+    config_entry: MockConfigEntry,
+) -> None:
+    """Items gone from the app are gone from the index after a refresh."""
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert await _async_search(hass, "second") == ["e2"]
+
+    library["s1"]["children"].remove("e2")
+    await config_entry.runtime_data.search.async_refresh()
+
+    assert await _async_search(hass, "second") == []
+    assert await _async_search(hass, "pilot") == ["e1"]
+
+
+@pytest.mark.usefixtures("library")
+async def test_refresh_keeps_unavailable_app(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """An app that cannot be browsed keeps what was indexed for it."""
+    await hass.async_block_till_done(wait_background_tasks=True)
+    hass.states.async_set(JELLYFIN, "unavailable")
+
+    await config_entry.runtime_data.search.async_refresh()
+
+    assert await _async_search(hass, "pilot") == ["e1"]
@@ -0,0 +1,120 @@
+"""Tests for last-wins seek coalescing."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.phantom_apparatus.seek import RECONCILE_TIMEOUT
+
+from .conftest import JELLYFIN, PLAYER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.phantom_apparatus.seek import SeekCoalescer
+
+
+@pytest.fixture
+def seek_calls(hass: HomeAssistant) -> list[ServiceCall]:
+    """Mock the app's media_seek service."""
+    return async_mock_service(hass, "media_player", "media_seek")
+
+
+@pytest.fixture
+def seek(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    seek_calls: list[ServiceCall],  # noqa: ARG001
+) -> SeekCoalescer:
+    """Return the coalescer, with Jellyfin paused early in an episode."""
+    hass.states.async_set(
+        JELLYFIN,
+        "paused",
+        {"media_position": 5, "media_position_updated_at": dt_util.utcnow()},
+    )
+    return config_entry.runtime_data.seek
+
+
+async def _async_seek(seek: SeekCoalescer, *positions: float) -> None:
+    """Request seeks back to back and wait for the last to be sent."""
+    tasks = [seek.async_request(JELLYFIN, position) for position in positions]
+    await seek.async_wait(tasks[-1])
+
+
+async def test_burst_sends_one_seek(
+    seek: SeekCoalescer, seek_calls: list[ServiceCall]
+) -> None:
+    """A drag across the timeline becomes a single seek to where it ended."""
+    await _async_seek(seek, 10, 20, 30)
+
+    assert [call.data["seek_position"] for call in seek_calls] == [30]
+    assert (seek.stats.requests, seek.stats.sent, seek.stats.superseded) == (3, 1, 2)
+
+
+async def test_later_seek_supersedes_pending_one(
+    seek: SeekCoalescer, seek_calls: list[ServiceCall]
+) -> None:
+    """The newest target is reported at once; the earlier seek is never sent."""
+    first = seek.async_request(JELLYFIN, 10)
+    assert seek.predicted(JELLYFIN)[0] == 10
+    second = seek.async_request(JELLYFIN, 40)
+    assert seek.predicted(JELLYFIN)[0] == 40
+
+    # Waiting on a superseded seek returns quietly
+    await seek.async_wait(first)
+    assert first.cancelled()
+    await seek.async_wait(second)
+    assert [call.data["seek_position"] for call in seek_calls] == [40]
+
+
+async def test_reported_position_reconciles(
+    hass: HomeAssistant, seek: SeekCoalescer
+) -> None:
+    """The prediction holds until the app reports a position after the seek."""
+    sent_before = dt_util.utcnow()
+    await _async_seek(seek, 30)
+
+    # A report from before the seek was sent changes nothing
+    hass.states.async_set(
+        JELLYFIN,
+        "paused",
+        {"media_position": 6, "media_position_updated_at": sent_before},
+    )
+    await hass.async_block_till_done()
+    assert seek.predicted(JELLYFIN)[0] == 30
+    assert hass.states.get(PLAYER).attributes["media_position"] == 30
+
+    hass.states.async_set(
+        JELLYFIN,
+        "paused",
+        {"media_position": 31, "media_position_updated_at": dt_util.utcnow()},
+    )
+    await hass.async_block_till_done()
+    assert seek.predicted(JELLYFIN) is None
+    assert seek.stats.reconciled == 1
+    assert seek.stats.drift_seconds == 1
+    assert hass.states.get(PLAYER).attributes["media_position"] == 31
+
+
+async def test_silent_app_times_out(hass: HomeAssistant, seek: SeekCoalescer) -> None:
+    """A prediction the app never answers is dropped after a while."""
+    await _async_seek(seek, 30)
+    assert seek.predicted(JELLYFIN)[0] == 30
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=RECONCILE_TIMEOUT + 1)
+    )
+    await hass.async_block_till_done()
+
+    assert seek.predicted(JELLYFIN) is None
+    assert seek.stats.timed_out == 1
+    assert hass.states.get(PLAYER).attributes["media_position"] == 5
@@ -0,0 +1,64 @@
+"""Tests for the run_sequence entity service."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+import voluptuous as vol
+from pytest_homeassistant_custom_component.common import async_mock_service
+
+from custom_components.phantom_apparatus.const import DOMAIN
+from custom_components.phantom_apparatus.sequence import SERVICE_RUN_SEQUENCE
+
+from .conftest import PLAYER, TV
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+@pytest.mark.usefixtures("config_entry")
+async def test_run_sequence(hass: HomeAssistant) -> None:
+    """Steps are sent to the TV with their data."""
+    calls = async_mock_service(hass, "media_player", "volume_set")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_RUN_SEQUENCE,
+        {
+            "entity_id": PLAYER,
+            "steps": [{"action": "volume_set", "data": {"volume_level": "0.2"}}],
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response[PLAYER]["success"]
+    assert calls[0].data == {"entity_id": TV, "volume_level": 0.2}
+
+
+@pytest.mark.usefixtures("config_entry")
+@pytest.mark.parametrize(
+    "step",
+    [
+        {"action": "volume_set"},
+        {"action": "volume_set", "data": {"volume_level": 2}},
+        {"action": "select_source", "data": {"volume_level": 0.2}},
+        {"action": "media_pause", "data": {"source": "Jellyfin"}},
+    ],
+)
+async def test_run_sequence_rejects_bad_data(
+    hass: HomeAssistant, step: dict[str, object]
+) -> None:
+    """Step data is validated against its action before anything runs."""
+    calls = async_mock_service(hass, "media_player", step["action"])
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_RUN_SEQUENCE,
+            {"entity_id": PLAYER, "steps": [step]},
+            blocking=True,
+            return_response=True,
+        )
+    assert not calls
@@ -0,0 +1,68 @@
+"""Tests for the viewing-session log."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from custom_components.phantom_apparatus.const import DOMAIN
+
+from .conftest import mock_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+def _session(start: datetime, end: datetime, title: str) -> dict[str, Any]:
+    """Return a stored Jellyfin session."""
+    return {
+        "start": int(start.timestamp()),
+        "end": int(end.timestamp()),
+        "source": "Jellyfin",
+        "content_id": title,
+        "title": title,
+        "watched": int((end - start).total_seconds()),
+    }
+
+
+async def test_query_window_uses_configured_time_zone(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    upstream: None,  # noqa: ARG001
+) -> None:
+    """A naive window from the UI selector is read in Home Assistant's time zone."""
+    await hass.config.async_set_time_zone("America/New_York")
+    entry = mock_entry()
+    key = f"{DOMAIN}.{entry.entry_id}.sessions"
+    hass_storage[key] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": key,
+        "data": [
+            # 11:00-11:30 in New York
+            _session(
+                datetime(2026, 1, 5, 16, 0, tzinfo=UTC),
+                datetime(2026, 1, 5, 16, 30, tzinfo=UTC),
+                "morning",
+            ),
+            # 12:30-13:00 in New York
+            _session(
+                datetime(2026, 1, 5, 17, 30, tzinfo=UTC),
+                datetime(2026, 1, 5, 18, 0, tzinfo=UTC),
+                "afternoon",
+            ),
+        ],
+    }
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_viewing_sessions",
+        {"start": "2026-01-05 12:00:00", "end": "2026-01-05 14:00:00"},
+        blocking=True,
+        return_response=True,
+    )
+    assert [session["title"] for session in response["sessions"]] == ["afternoon"]
+    assert await hass.config_entries.async_unload(entry.entry_id)
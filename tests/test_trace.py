@@ -0,0 +1,126 @@
+"""Tests for trace recording and replay."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.history import get_significant_states
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context
+from homeassistant.exceptions import Unauthorized
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.phantom_apparatus.const import DOMAIN
+from custom_components.phantom_apparatus.trace import trace_path
+
+from .conftest import GHOSTTUBE, JELLYFIN, PLAYER, TV
+
+if TYPE_CHECKING:
+    from homeassistant.auth.models import User
+    from homeassistant.components.recorder import Recorder
+    from homeassistant.core import Event, HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder,
+    enable_custom_integrations: None,
+) -> None:
+    """Start the recorder before Home Assistant, to check what replays record."""
+
+
+async def _async_record(hass: HomeAssistant, entry: MockConfigEntry) -> str:
+    """Record a short trace of the TV starting a film."""
+    response = await hass.services.async_call(
+        DOMAIN, "start_trace", {}, blocking=True, return_response=True
+    )
+    hass.states.async_set(JELLYFIN, "playing", {"media_title": "Film"})
+    hass.states.async_set(JELLYFIN, "paused", {"media_title": "Film"})
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        DOMAIN, "stop_trace", {}, blocking=True, return_response=True
+    )
+    return response[entry.entry_id]["trace"]
+
+
+async def _async_replay(
+    hass: HomeAssistant, entry: MockConfigEntry, trace: str
+) -> dict[str, Any]:
+    """Replay a trace against entry as fast as possible, then delete it."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        "replay_trace",
+        {"config_entry_id": entry.entry_id, "trace": trace, "speed": 0},
+        blocking=True,
+        return_response=True,
+    )
+    await hass.async_add_executor_job(trace_path(hass, trace).unlink)
+    return response
+
+
+async def test_replay_leaves_real_entities_alone(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Replay runs through a private coordinator, never the state machine."""
+    trace = await _async_record(hass, config_entry)
+    real = {TV, JELLYFIN, GHOSTTUBE, PLAYER}
+    before = {entity_id: hass.states.get(entity_id) for entity_id in real}
+    entity_ids = set(hass.states.async_entity_ids())
+    touched: list[str] = []
+
+    def _record(event: Event) -> None:
+        touched.append(event.data["entity_id"])
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _record)
+    response = await _async_replay(hass, config_entry, trace)
+    unsub()
+
+    assert response["events"] == 5
+    assert response["latency_ms"] is not None
+    assert not touched
+    assert all(hass.states.get(entity_id) == before[entity_id] for entity_id in real)
+    assert set(hass.states.async_entity_ids()) == entity_ids
+
+
+async def test_replay_is_not_recorded(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Nothing of a replay reaches the recorder, and so the history or logbook."""
+    started = dt_util.utcnow()
+    trace = await _async_record(hass, config_entry)
+    await _async_replay(hass, config_entry, trace)
+    await async_wait_recording_done(hass)
+
+    replay_entity_ids = [
+        f"media_player.phantom_apparatus_replay_{config_entry.entry_id.lower()}_{role}"
+        for role in ("tv", "jellyfin", "ghosttube", "player")
+    ]
+    states = await get_instance(hass).async_add_executor_job(
+        get_significant_states, hass, started, None, [JELLYFIN, *replay_entity_ids]
+    )
+    assert list(states) == [JELLYFIN]
+
+
+@pytest.mark.usefixtures("config_entry")
+@pytest.mark.parametrize("service", ["start_trace", "stop_trace", "replay_trace"])
+async def test_trace_services_need_admin(
+    hass: HomeAssistant, hass_read_only_user: User, service: str
+) -> None:
+    """Non-admin users cannot record or replay traces."""
+    with pytest.raises(Unauthorized):
+        await hass.services.async_call(
+            DOMAIN,
+            service,
+            {"config_entry_id": "any", "trace": "any"}
+            if service == "replay_trace"
+            else {},
+            blocking=True,
+            context=Context(user_id=hass_read_only_user.id),
+            return_response=True,
+        )
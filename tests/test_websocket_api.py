@@ -0,0 +1,101 @@
+"""Tests for the delta-streaming websocket API."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.phantom_apparatus.const import DOMAIN
+
+from .conftest import JELLYFIN, PLAYER, TV
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockUser
+    from pytest_homeassistant_custom_component.typing import (
+        MockHAClientWebSocket,
+        WebSocketGenerator,
+    )
+
+QUIET_TIMEOUT = 0.2
+
+
+@pytest.fixture
+async def client(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    config_entry: None,  # noqa: ARG001
+) -> MockHAClientWebSocket:
+    """Return an admin websocket client with the apparatus set up."""
+    return await hass_ws_client(hass)
+
+
+async def _async_subscribe(client: MockHAClientWebSocket, entity_id: str) -> dict:
+    """Subscribe to entity_id and return the result message."""
+    await client.send_json_auto_id(
+        {"type": f"{DOMAIN}/subscribe", "entity_id": entity_id}
+    )
+    return await client.receive_json()
+
+
+async def test_subscribe_streams_deltas(
+    hass: HomeAssistant, client: MockHAClientWebSocket
+) -> None:
+    """A snapshot comes first, then only what changed."""
+    result = await _async_subscribe(client, PLAYER)
+    assert result["success"]
+    snapshot = (await client.receive_json())["event"]["snapshot"]
+    assert snapshot["state"] == hass.states.get(PLAYER).state
+
+    hass.states.async_set(JELLYFIN, "playing", {"media_title": "Pilot"})
+    await hass.async_block_till_done()
+
+    delta = (await client.receive_json())["event"]
+    assert delta["state"] == "playing"
+    assert delta["changed"]["media_title"] == "Pilot"
+    assert "friendly_name" not in delta["changed"]
+
+
+async def test_unsubscribe_stops_deltas(
+    hass: HomeAssistant, client: MockHAClientWebSocket
+) -> None:
+    """Nothing more is sent once the subscription is closed."""
+    result = await _async_subscribe(client, PLAYER)
+    await client.receive_json()
+    await client.send_json_auto_id(
+        {"type": "unsubscribe_events", "subscription": result["id"]}
+    )
+    assert (await client.receive_json())["success"]
+
+    hass.states.async_set(JELLYFIN, "playing", {"media_title": "Pilot"})
+    await hass.async_block_till_done()
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(QUIET_TIMEOUT):
+            await client.receive_json()
+
+
+async def test_subscribe_unknown_entity(client: MockHAClientWebSocket) -> None:
+    """Only unified players can be subscribed to."""
+    result = await _async_subscribe(client, TV)
+    assert not result["success"]
+    assert result["error"]["code"] == "not_found"
+
+
+@pytest.mark.usefixtures("config_entry")
+async def test_subscribe_requires_read_permission(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    hass_read_only_user: MockUser,
+    hass_read_only_access_token: str,
+) -> None:
+    """A user who cannot read the player is refused, and told nothing about it."""
+    hass_read_only_user.mock_policy({"entities": {"entity_ids": {TV: True}}})
+    client = await hass_ws_client(hass, hass_read_only_access_token)
+
+    result = await _async_subscribe(client, PLAYER)
+
+    assert not result["success"]
+    assert result["error"]["code"] == "unauthorized"